@@ -1,109 +1,177 @@
+import numpy as np
 import pandas as pd
-import networkx as nx
 import heapq
 import os
 import random
+import time
 
+import instrument
 from config.config import config_algorithm, get_api_keys
-from api_connect import process_edges_parallel
+from api_connect import stream_edges
+from route_store import store_from_config
+from graph import graph_from_edges, read_edge_csv
+from online_stats import TrialStats, candidate_weights
+from tables import build_distance_tables, score_alpha
+from heuristics import get_heuristic, make_potential
+from route_cache import cached_route, route_cache
 
 
 def build_graph(config):
-    df = pd.read_csv(config["csv_path"], dtype={'u': str, 'v': str})
-    df['u'] = df['u'].str.strip()
-    df['v'] = df['v'].str.strip()
-
-    df_u = df[['u', 'u_x', 'u_y']].rename(columns={'u': 'node', 'u_x': 'x', 'u_y': 'y'})
-    df_v = df[['v', 'v_x', 'v_y']].rename(columns={'v': 'node', 'v_x': 'x', 'v_y': 'y'})
-    nodes = pd.concat([df_u, df_v]).drop_duplicates('node')
-    node_pos = dict(zip(nodes['node'], zip(nodes['x'], nodes['y'])))
-
-    G = nx.DiGraph()
-    G.add_nodes_from(node_pos)
-
-    def compute_factor(duration):
-        if duration > 400: return 0.8
-        elif duration > 300: return 0.1
-        elif duration > 200: return 0.2
-        elif duration > 100: return 0.3
-        elif duration > 40: return 0.4
-        return 0.5
-
-    for _, row in df.iterrows():
-        weight = row['duration'] * compute_factor(row['duration'])
-        G.add_edge(row['u'], row['v'], weight=weight)
+    # 컴파일된 바이너리 스냅샷이 있으면 CSV 파싱 없이 mmap 으로 로드 (df 는 None)
+    if config.get("use_graph_snapshot") and os.path.isdir(config.get("graph_snapshot_path") or ""):
+        from snapshot import load_graph_snapshot
+        G = load_graph_snapshot(config["graph_snapshot_path"], config.get("snapshot_departure_time"))
+        return G, None, G.node_pos()
+
+    df = read_edge_csv(config["csv_path"])
+
+    G = graph_from_edges(df)
+    node_pos = G.node_pos()
 
     return G, df, node_pos
 
 
 def reconstruct_path(prev, node):
     path = []
-    while node is not None:
+    while node != -1:
         path.append(node)
         node = prev[node]
     return path[::-1]
 
 
-def bidirectional_dijkstra(G, source, target, max_time_diff=60, weight_factor=0.692):
+# ✅ CSR 배열 위에서 직접 동작하는 양방향 다익스트라 (노드 인덱스 기준)
+# alpha 지정 시 (objective == "score") 탐색 비용 = score_route 의 점수: 정방향은 시간(weight_factor 적용)과
+# 위험도를 따로 누적해 alpha * 시간 + (1 - alpha) * 위험도 순으로 확정, 역방향은 시간만 (위험도는 정방향 경로 기준)
+# 만남 판정은 시간끼리(|정방향 시간 - 역방향 시간| < max_time_diff), 만남 비용 = alpha * max(시간) + (1 - alpha) * 위험도,
+# 종료 조건은 정방향 큐 최솟값 + alpha * 역방향 큐 최솟값 >= 최선 비용 (alpha=None 이면 기존 시간 탐색과 동일)
+# heuristic 지정 시 (opt-in) 양방향 A*: 평균 포텐셜로 큐 순서만 바꾸고 만남 판정(실제 거리, max_time_diff)과
+# 종료 조건(정/역 큐 최솟값 합 >= 최선 비용)은 그대로 — 탐색 순서가 달라 일부 질의는 다른 만남 노드를 고름
+# (heuristics.compare_heuristics 가 불일치율 보고, 기본값 None 은 순서까지 기존과 동일)
+def bidirectional_dijkstra_idx(G, source, target, max_time_diff=60, weight_factor=0.692,
+                               heuristic=None, alpha=None, stats=None):
     if source == target:
         return [source], 0, source, [source], [source]
 
+    fptr, fnbr, fw, rptr, rnbr, rw = G.adjacency()
+    inf = float('inf')
     distF, distB = {source: 0}, {target: 0}
-    prevF, prevB = {source: None}, {target: None}
+    prevF, prevB = {source: -1}, {target: -1}
     pqF, pqB = [(0, source)], [(0, target)]
     processedF, processedB = set(), set()
-    best_cost, meeting_node = float('inf'), None
+    best_cost, meeting_node = inf, None
     forward_turn = True
 
+    score = alpha is not None
+    if score:
+        # 정방향 라벨별 (시간, 위험도) — distF 는 둘을 섞은 점수
+        frisk, beta = G.risk_list(), 1 - alpha
+        timeF, riskF = {source: 0}, {source: 0}
+    b_scale = alpha if score else 1
+
+    # 키 오프셋을 맞춰 kF(v) + b_scale * kB(v) = dF(v) + b_scale * dB(v) 가 되도록 함 (종료 조건 동일하게 유지)
+    heuristic = get_heuristic(G, heuristic)
+    pot = make_potential(heuristic, source, target, weight_factor) if heuristic else None
+    p_source = pot(source) if pot else 0
+    pops, termination = 0, "exhausted"
+
     while pqF and pqB:
-        pq, dist, prev, processed, other_dist, forward = (
-            (pqF, distF, prevF, processedF, distB, True)
-            if forward_turn else
-            (pqB, distB, prevB, processedB, distF, False)
-        )
+        if forward_turn:
+            pq, dist, prev, processed, other_dist = pqF, distF, prevF, processedF, distB
+            ptr, nbr, w, scale, sign = fptr, fnbr, fw, weight_factor, b_scale
+        else:
+            pq, dist, prev, processed, other_dist = pqB, distB, prevB, processedB, distF
+            ptr, nbr, w, scale, sign = rptr, rnbr, rw, 1, -1
         if not pq:
             break
         curr_dist, u = heapq.heappop(pq)
+        pops += 1
         if u in processed:
             continue
         processed.add(u)
 
         if u in other_dist:
-            total_time = max(distF.get(u, float('inf')), distB.get(u, float('inf')))
-            if abs(distF.get(u, 0) - distB.get(u, 0)) < max_time_diff and total_time < best_cost:
-                best_cost, meeting_node = total_time, u
-
-        neighbors = G.successors(u) if forward else G.predecessors(u)
-        for v in neighbors:
-            edge_weight = G[u][v].get('weight', 1) * weight_factor if forward else G[v][u].get('weight', 1)
-            new_dist = dist[u] + edge_weight
-            if new_dist < dist.get(v, float('inf')):
-                dist[v], prev[v] = new_dist, u
-                heapq.heappush(pq, (new_dist, v))
-
-        if best_cost < float('inf'):
-            f_min = pqF[0][0] if pqF else float('inf')
-            b_min = pqB[0][0] if pqB else float('inf')
-            if f_min + b_min >= best_cost:
+            if score:
+                df_u, db_u = timeF[u], distB[u]
+                if abs(df_u - db_u) < max_time_diff:
+                    total = alpha * (df_u if df_u > db_u else db_u) + beta * riskF[u]
+                    if total < best_cost:
+                        best_cost, meeting_node = total, u
+            else:
+                df_u, db_u = distF[u], distB[u]
+                total_time = df_u if df_u > db_u else db_u
+                if abs(df_u - db_u) < max_time_diff and total_time < best_cost:
+                    best_cost, meeting_node = total_time, u
+
+        du = dist[u]
+        if score and forward_turn:
+            tu, ru = timeF[u], riskF[u]
+            for k in range(ptr[u], ptr[u + 1]):
+                v = nbr[k]
+                t_v, r_v = tu + w[k] * scale, ru + frisk[k]
+                new_dist = alpha * t_v + beta * r_v
+                if new_dist < dist.get(v, inf):
+                    dist[v], prev[v], timeF[v], riskF[v] = new_dist, u, t_v, r_v
+                    key = new_dist if pot is None else new_dist + sign * (pot(v) - p_source)
+                    heapq.heappush(pq, (key, v))
+        else:
+            for k in range(ptr[u], ptr[u + 1]):
+                v = nbr[k]
+                new_dist = du + w[k] * scale
+                if new_dist < dist.get(v, inf):
+                    dist[v], prev[v] = new_dist, u
+                    key = new_dist if pot is None else new_dist + sign * (pot(v) - p_source)
+                    heapq.heappush(pq, (key, v))
+
+        if best_cost < inf:
+            f_min = pqF[0][0] if pqF else inf
+            b_min = pqB[0][0] if pqB else inf
+            if f_min + b_scale * b_min >= best_cost:
+                termination = "bound"
                 break
 
         forward_turn = not forward_turn
 
+    if stats is not None or instrument.enabled:
+        settled = len(processedF) + len(processedB)
+        # push 수 = pop 수 + 남은 큐 길이 (루프 안에서 따로 세지 않음)
+        pushes = pops + len(pqF) + len(pqB)
+        if meeting_node is None:
+            termination = "no_meeting"
+        if stats is not None:
+            stats["settled"] = stats.get("settled", 0) + settled
+            stats["heap_pops"] = stats.get("heap_pops", 0) + pops
+            stats["heap_pushes"] = stats.get("heap_pushes", 0) + pushes
+            stats["termination"] = termination
+        if instrument.enabled:
+            instrument.record_search(settled, pops, pushes, termination)
+
     if meeting_node is None:
-        return None, float('inf'), None, [], []
+        return None, inf, None, [], []
 
     f_path = reconstruct_path(prevF, meeting_node)
     b_path = reconstruct_path(prevB, meeting_node)
     return f_path + b_path[1:], best_cost, meeting_node, f_path, b_path
 
 
+# ✅ OSM id 기준 래퍼 (기존 반환 형식 유지: path, cost, meeting, f_path, b_path)
+def bidirectional_dijkstra(G, source, target, max_time_diff=60, weight_factor=0.692,
+                           heuristic=None, alpha=None, stats=None):
+    if source == target:
+        return [source], 0, source, [source], [source]
+
+    path, cost, meeting, f_path, b_path = bidirectional_dijkstra_idx(
+        G, G.index(source), G.index(target), max_time_diff, weight_factor, heuristic, alpha, stats
+    )
+    if meeting is None:
+        return None, cost, None, [], []
+    return G.ids(path), cost, G.node_id(meeting), G.ids(f_path), G.ids(b_path)
+
+
 def load_risk_map(edge_csv_path):
-    edge_df = pd.read_csv(edge_csv_path, dtype={'u': str, 'v': str})
-    edge_df['u'] = edge_df['u'].str.strip()
-    edge_df['v'] = edge_df['v'].str.strip()
+    edge_df = read_edge_csv(edge_csv_path)
     if 'risk' not in edge_df.columns:
         edge_df['risk'] = edge_df['length'] * 0.1
-    return {(row['u'], row['v']): row['risk'] for _, row in edge_df.iterrows()}
+    return dict(zip(zip(edge_df['u'], edge_df['v']), edge_df['risk']))
 
 
 def compute_total_risk_from_path_str(forward_str, edge_risk_map):
@@ -113,64 +181,180 @@ def compute_total_risk_from_path_str(forward_str, edge_risk_map):
                for i in range(len(nodes) - 1))
 
 
+# ✅ 경로 탐색: routing == "table" 이면 사전 기록한 탐색 재생(결과 동일), 아니면 (LRU 캐시를 거친) 양방향 다익스트라
+def find_route(G, name, start, goal, config, tables=None):
+    if tables is not None:
+        return tables.route(name, G.index(goal))
+    args = (G, G.index(start), G.index(goal), config["max_time_diff"], config["weight_factor"], config.get("heuristic"),
+            score_alpha(config))
+    if config.get("route_cache_size", 0) > 0:
+        return cached_route(*args)
+    return bidirectional_dijkstra_idx(*args)
+
+
+# 왼쪽부터 한 개씩 더한 합 (np.cumsum 의 마지막 값)
+# 경로 시간/위험도는 비트 단위까지 재현해야 함: 탐색 루프의 누적(du + w)과 같은 값이어야 만남 비용 = 점수이고,
+# 기존 결과 CSV(파이썬 sum 으로 계산)와도 같아야 함 → np.sum(쌍별 합산)/math.fsum 은 마지막 자리가 달라질 수 있어 쓰지 않음
+def _sequential_sum(values):
+    return float(np.cumsum(values)[-1]) if len(values) else 0.0
+
+
+# ✅ 경로 점수: 엣지 번호 배열로 시간/위험도를 한 번에 gather
+def path_times(G, pf, pb, config):
+    pf_e, pb_e = G.path_edges(pf), G.path_edges(pb)
+    ft = _sequential_sum(G.weight[pf_e] * config["weight_factor"])
+    bt = _sequential_sum(np.where(pb_e >= 0, G.weight[pb_e], 0))
+    return ft, bt, max(ft, bt)
+
+
+def path_risk(G, pf):
+    return _sequential_sum(G.risk[G.path_edges(pf)])
+
+
+def score_route(G, pf, pb, config):
+    ft, bt, total = path_times(G, pf, pb, config)
+    total_risk = path_risk(G, pf)
+    alpha = config.get("alpha", 0.7)
+    return ft, bt, total, total_risk, alpha * total + (1 - alpha) * total_risk
+
+
+# ✅ 시행별 난수 스트림 (seed, trial 로부터 결정 → 병렬 실행 시에도 결과 동일)
+def trial_rng(seed, trial):
+    return random.Random(f"{seed}:{trial}")
+
+
+def run_trial(config, G, node_pos, risk_map, trial, tables=None, goal=None):
+    if goal is None:
+        goal = trial_rng(config["seed"], trial).choice(config["accident_candidates"])
+    trial_res = []
+    timed = instrument.enabled
+    alpha = config.get("alpha", 0.7)
+    columnar = config.get("result_format", "csv") == "columnar"
+
+    for name, start in config["station_nodes"].items():
+        t0 = time.perf_counter() if timed else 0
+        path, cost, meeting, pf, pb = find_route(G, name, start, goal, config, tables)
+        if timed:
+            t1 = time.perf_counter()
+            instrument.add_time("simulate.routing", t1 - t0)
+        if meeting is None:
+            continue
+
+        ft, bt, total = path_times(G, pf, pb, config)
+        if timed:
+            t2 = time.perf_counter()
+            instrument.add_time("simulate.path_weights", t2 - t1)
+        total_risk = path_risk(G, pf)
+        total_score = alpha * total + (1 - alpha) * total_risk
+        if timed:
+            t3 = time.perf_counter()
+            instrument.add_time("simulate.risk", t3 - t2)
+
+        if columnar:
+            # 열 저장소(result_store)가 노드/경로를 정수 번호로 intern → 문자열 경로를 만들지 않음
+            path_length = len(pf) + len(pb) - 1
+            forward_path, backward_path = tuple(pf), tuple(pb)
+        else:
+            pf, pb, meeting = G.ids(pf), G.ids(pb), G.node_id(meeting)
+            path_length = len(pf) + len(pb) - 1
+            forward_path, backward_path = " → ".join(pf), " → ".join(pb)
+
+        result = {
+            'trial': trial, 'station': name, 'u': start, 'v': goal, 'meeting_node': meeting,
+            'u_x': node_pos[start][0], 'u_y': node_pos[start][1],
+            'v_x': node_pos[goal][0], 'v_y': node_pos[goal][1],
+            'forward_time': round(ft, 2), 'backward_time': round(bt, 2),
+            'total_cost': round(total, 2), 'total_risk': round(total_risk, 2),
+            'total_score': round(total_score, 2), 'total_time_min': round(total / 60, 2),
+            'path_length': path_length,
+            'forward_path': forward_path, 'backward_path': backward_path
+        }
+        trial_res.append(result)
+        if timed:
+            instrument.add_time("simulate.result_dict", time.perf_counter() - t3)
+
+    return min(trial_res, key=lambda x: x['total_score']) if trial_res else None
+
+
+# ✅ 시행 모드
+# fixed: num_trials 회 / adaptive: 목표 지표의 신뢰구간 반폭이 목표에 도달하면 중단 (최대 max_trials)
+# exhaustive: 서로 다른 후보를 1회씩 평가하고 추출 확률로 가중 → 정확한 기대값
+# 통계는 누적기로 집계 (keep_results=False 이면 결과 행을 보관하지 않음) → (결과 DataFrame, TrialStats)
 def simulate(config, G, df, node_pos, risk_map):
-    random.seed(config["seed"])
     results = []
-    goals = config["accident_candidates"]
-
-    for trial in range(1, config["num_trials"] + 1):
-        goal = random.choice(goals)
-        trial_res = []
-
-        for name, start in config["station_nodes"].items():
-            path, cost, meeting, pf, pb = bidirectional_dijkstra(
-                G, start, goal, config["max_time_diff"], config["weight_factor"]
-            )
-            if meeting is None:
-                continue
-
-            ft = sum(G[pf[i]][pf[i + 1]]['weight'] * config["weight_factor"] for i in range(len(pf) - 1))
-            bt = sum(G[pb[i]].get(pb[i + 1], {}).get('weight', 0) for i in range(len(pb) - 1))
-            total = max(ft, bt)
-            forward_path_str = " → ".join(pf)
-
-            total_risk = compute_total_risk_from_path_str(forward_path_str, risk_map)
-            alpha = config.get("alpha", 0.7)
-            total_score = alpha * total + (1 - alpha) * total_risk
-
-            result = {
-                'trial': trial, 'station': name, 'u': start, 'v': goal, 'meeting_node': meeting,
-                'u_x': node_pos[start][0], 'u_y': node_pos[start][1],
-                'v_x': node_pos[goal][0], 'v_y': node_pos[goal][1],
-                'forward_time': round(ft, 2), 'backward_time': round(bt, 2),
-                'total_cost': round(total, 2), 'total_risk': round(total_risk, 2),
-                'total_score': round(total_score, 2), 'total_time_min': round(total / 60, 2),
-                'path_length': len(pf) + len(pb) - 1,
-                'forward_path': forward_path_str, 'backward_path': " → ".join(pb)
-            }
-            trial_res.append(result)
-
-        if trial_res:
-            best = min(trial_res, key=lambda x: x['total_score'])
-            results.append(best)
-            print(f"[{trial}] {best['station']} (score: {best['total_score']}, 시간(분): {best['total_time_min']}, 위험도: {best['total_risk']})")
-
-    return pd.DataFrame(results), pd.DataFrame(results)
+    route_cache.resize(config.get("route_cache_size", 0))
+    if risk_map is not None:
+        G.set_risk(risk_map)
+    tables = build_distance_tables(G, config) if config.get("routing") == "table" else None
+
+    mode = config.get("trial_mode", "fixed")
+    keep = config.get("keep_results", True)
+    writer = None
+    if config.get("result_format", "csv") == "columnar":
+        # 결과 행은 청크 단위로 열 저장소에 기록 (메모리에 보관하지 않음)
+        from result_store import ResultWriter
+        writer = ResultWriter(config["result_store_path"], G, config["station_nodes"], mode == "exhaustive",
+                              config.get("result_chunk_rows", 10000))
+        keep = False
+    stats = TrialStats(confidence=config.get("confidence", 0.95), exact=mode == "exhaustive")
+    targets = config.get("stop_ci_width") or {"total_time_min": 0.02}
+    check_every = config.get("check_every", 10)
+
+    if mode == "exhaustive":
+        goals = candidate_weights(config["accident_candidates"])
+        trials = range(1, len(goals) + 1)
+        bests = (run_trial(config, G, node_pos, risk_map, trial, tables, goal)
+                 for trial, (goal, _) in zip(trials, goals))
+    else:
+        trials = range(1, (config.get("max_trials", 100000) if mode == "adaptive" else config["num_trials"]) + 1)
+        if config.get("workers", 1) > 1:
+            from parallel import run_trials_parallel
+            bests = run_trials_parallel(config, G, node_pos, risk_map, trials, tables, config["workers"],
+                                        check_every if mode == "adaptive" else None)
+        else:
+            bests = (run_trial(config, G, node_pos, risk_map, trial, tables) for trial in trials)
+
+    for trial, best in zip(trials, bests):
+        if best:
+            weight = goals[trial - 1][1] if mode == "exhaustive" else 1.0
+            stats.add(best, weight)
+            row = {**best, 'weight': weight} if mode == "exhaustive" else best
+            if writer is not None:
+                writer.append(row)
+            elif keep:
+                results.append(row)
+            if mode != "adaptive":
+                print(f"[{trial}] {best['station']} (score: {best['total_score']}, 시간(분): {best['total_time_min']}, 위험도: {best['total_risk']})")
+
+        if mode == "adaptive" and trial % check_every == 0 and stats.n >= config.get("min_trials", 30):
+            widths = ", ".join(f"{m} {stats.overall[m].mean:.3f}±{stats.ci_halfwidth(m):.3f}" for m in targets)
+            print(f"[{trial}] {widths}")
+            if stats.converged(targets, config.get("stop_relative", True)):
+                print(f"✅ 신뢰구간 목표 도달 → {trial}회에서 중단")
+                break
+    bests.close()
+    if writer is not None:
+        writer.close()
+        print(f"📁 결과 저장소 → {config['result_store_path']} ({writer.num_rows}행, 경로 {len(writer.path_ref)}개)")
 
+    return pd.DataFrame(results), stats
 
 def analyze_saving(df_best, config):
     api_keys = get_api_keys()
     departure_time = config["DEFAULT_DEPARTURE_TIME"]
-
-    success_df, fail_df = process_edges_parallel(
-        df_best, api_keys, mode='future', departure_time=departure_time, max_workers=config["MAX_WORKERS"]
-    )
-    retry_df, _ = process_edges_parallel(
-        fail_df, api_keys, mode='future', departure_time=departure_time, max_workers=config["MAX_WORKERS"]
-    )
-    duration_info = pd.concat([success_df, retry_df], ignore_index=True)
-
-    df_best['duration'] = duration_info['duration']
+    store = store_from_config(config)
+
+    # 도착하는 대로 행 키(인덱스)로 결합, 실패 행은 같은 스트림에서 1회 재요청
+    durations = {}
+    for key, result in stream_edges(df_best, api_keys, 'future', departure_time, config["MAX_WORKERS"],
+                                    store=store, retries=1):
+        if result:
+            durations[key] = result['duration']
+    if store is not None:
+        print(f"[🗄️ 저장소] {store.stats()}")
+        store.close()
+
+    df_best['duration'] = pd.Series(durations, index=df_best.index, dtype=np.float64)
     df_best['duration_bus'] = df_best['duration'] / 60
     df_best['duration_ambulance'] = df_best['duration'] * config["weight_factor"] / 60
 
@@ -182,32 +366,55 @@ def analyze_saving(df_best, config):
     return df_best
 
 
-def save_results(df_best, config):
+def save_results(df_best, config, stats=None):
     os.makedirs(os.path.dirname(config["output_path"]), exist_ok=True)
-    if not df_best.empty:
+    if stats is not None and stats.n:
+        summary = stats.summary()
+        labels = ['Forward Time', 'Backward Time', '총비용', '위험도', '최종스코어', '총시간(분)', '경로노드수']
+        print(f"\n=== 전체 평균 ({stats.n}회, {stats.confidence:.0%} 신뢰구간) ===")
+        for (_, row), label in zip(summary[summary['scope'] == 'all'].iterrows(), labels):
+            print(f"평균 {label}: {row['mean']:.2f} ± {row['ci_halfwidth']:.2f} (p50 {row['p50']:.2f}, p90 {row['p90']:.2f})")
+        shares = summary[(summary['scope'] != 'all') & (summary['metric'] == 'total_time_min')]
+        for _, row in shares.iterrows():
+            print(f"  {row['scope']}: {row['share']:.1%}, 평균 총시간(분) {row['mean']:.2f}")
+        summary.to_csv(config["stats_output_path"], index=False, encoding="utf-8-sig")
+        print(f"📁 통계 저장 → {config['stats_output_path']}")
+    elif not df_best.empty:
         avg = df_best[['forward_time', 'backward_time', 'total_cost', 'total_risk', 'total_score', 'total_time_min', 'path_length']].mean()
         print("\n=== 전체 평균 ===")
         labels = ['Forward Time', 'Backward Time', '총비용', '위험도', '최종스코어', '총시간(분)', '경로노드수']
         for k, label in zip(avg.index, labels):
             print(f"평균 {label}: {avg[k]:.2f}")
 
+    if df_best.empty and stats is not None:
+        return
     df_best.to_csv(config["output_path"], index=False, encoding="utf-8-sig")
     print(f"\n✅ 결과 저장 완료: {config['output_path']}")
 
 
 def main():
     config = config_algorithm()
+    instrument.enable(config.get("instrument", False))
     G, df, node_pos = build_graph(config)
 
-    # ✅ config["risk_csv_path"]로부터 risk_map 생성
-    risk_df = pd.read_csv(config["risk_csv_path"], dtype={'u': str, 'v': str})
-    risk_df['u'] = risk_df['u'].str.strip()
-    risk_df['v'] = risk_df['v'].str.strip()
-    risk_map = dict(zip(zip(risk_df['u'], risk_df['v']), risk_df['risk']))
+    # ✅ config["risk_csv_path"]로부터 risk_map 생성 (스냅샷 그래프는 위험도를 이미 포함)
+    risk_map = None
+    if df is not None:
+        risk_df = pd.read_csv(config["risk_csv_path"], dtype={'u': str, 'v': str})
+        risk_df['u'] = risk_df['u'].str.strip()
+        risk_df['v'] = risk_df['v'].str.strip()
+        risk_map = dict(zip(zip(risk_df['u'], risk_df['v']), risk_df['risk']))
+
+    df_best, stats = simulate(config, G, df, node_pos, risk_map)
+    if config.get("route_cache_size", 0) > 0:
+        print(f"[🗂️ 경로 캐시] {route_cache.stats()}")
+    if not df_best.empty:
+        df_best = analyze_saving(df_best, config)
+    save_results(df_best, config, stats)
 
-    df_best, _ = simulate(config, G, df, node_pos, risk_map)
-    df_best = analyze_saving(df_best, config)
-    save_results(df_best, config)
+    if instrument.enabled:
+        instrument.print_report(instrument.export(config["instrument_report_path"]))
+        print(f"📁 계측 보고서 저장 → {config['instrument_report_path']}")
 
 
 if __name__ == "__main__":
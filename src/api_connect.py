@@ -1,192 +1,446 @@
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
-import random
-from collections import defaultdict
 import argparse
+import instrument
 from config.config import config_api, get_api_keys
+from key_scheduler import scheduler_from_config
+from route_store import route_key, store_from_config
 
 ## 실행 방법
 ## 현재 시간 기준
 #python api_connect.py --mode real
 ## 미래 시간 기준
 #python api_connect.py --mode future --departure_time 202507010800
+## 비동기 클라이언트 (aiohttp, 동시 요청 수백 개)
+#python api_connect.py --mode future --departure_time 202507010800 --async
 
-# 블랙리스트 관리
-blacklisted_keys = set()
-blacklist_timers = defaultdict(float)
+REQUEST_TIMEOUT = 10
+BASE_URL = config_api().get("KAKAO_BASE_URL", "https://apis-navi.kakaomobility.com")
 
-API_RETRY_COOLDOWN = 120
-MIN_SLEEP = 0.05
-MAX_SLEEP = 0.3
+# 키 스케줄러 (프로세스 공유, 같은 키 목록이면 재사용)
+_scheduler = None
+
+
+def get_scheduler(api_keys):
+    global _scheduler
+    if _scheduler is None or _scheduler.api_keys != list(api_keys):
+        _scheduler = scheduler_from_config(api_keys, config_api())
+    return _scheduler
+
+
+# 스레드 공유 keep-alive 세션 (요청마다 TCP/TLS 핸드셰이크 반복 방지)
+_session = None
+_pool_size = 0
+_session_lock = threading.Lock()
+
+
+# 더 큰 풀이 요청되면 어댑터를 새로 마운트 (작업자 수가 풀보다 많으면 연결이 버려지고 다시 맺어짐)
+def get_session(pool_size=10):
+    global _session, _pool_size
+    with _session_lock:
+        if _session is None:
+            _session, _pool_size = requests.Session(), 0
+        if pool_size > _pool_size:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _pool_size = pool_size
+    return _session
+
+
+# ✅ 요청 URL / 헤더 / 파라미터 (동기·비동기 공용)
+def route_request(mode, origin, destination, api_key, departure_time=None):
+    params = {
+        "origin": f"{origin[0]},{origin[1]},angle=270",
+        "destination": f"{destination[0]},{destination[1]}",
+        "summary": "true",
+        "priority": "TIME",
+        "car_fuel": "GASOLINE",
+        "car_hipass": "false",
+        "alternatives": "false",
+        "road_details": "false",
+    }
+    headers = {"Authorization": f"KakaoAK {api_key}"}
+    if mode == 'real':
+        params["road_event"] = "2"
+        return f"{BASE_URL}/v1/directions", headers, params
+    headers["Content-Type"] = "application/json"
+    params["departure_time"] = departure_time
+    params["roadevent"] = "2"
+    return f"{BASE_URL}/v1/future/directions", headers, params
 
-# ✅ 현재 경로 요청
-def get_route_info_with_rotation(origin, destination, api_keys, key_index, u, v):
-    attempts = 0
-    total_keys = len(api_keys)
-
-    while attempts < total_keys:
-        key_idx = (key_index + attempts) % total_keys
-
-        if key_idx in blacklisted_keys:
-            now = time.time()
-            if now < blacklist_timers[key_idx]:
-                attempts += 1
-                continue
-            else:
-                blacklisted_keys.remove(key_idx)
-
-        api_key = api_keys[key_idx]
-        url = "https://apis-navi.kakaomobility.com/v1/directions"
-        headers = {"Authorization": f"KakaoAK {api_key}"}
-        params = {
-            "origin": f"{origin[0]},{origin[1]},angle=270",
-            "destination": f"{destination[0]},{destination[1]}",
-            "summary": "true",
-            "priority": "TIME",
-            "car_fuel": "GASOLINE",
-            "car_hipass": "false",
-            "alternatives": "false",
-            "road_details": "false",
-            "road_event": "2"
-        }
 
+def parse_duration(data):
+    if 'routes' in data and data['routes'] and 'sections' in data['routes'][0]:
+        return data['routes'][0]['sections'][0]['duration']
+    return None
+
+
+def edge_result(u, v, origin, destination, duration):
+    return {
+        'u': u, 'v': v,
+        'u_x': origin[0], 'u_y': origin[1],
+        'v_x': destination[0], 'v_y': destination[1],
+        'duration': duration
+    }
+
+LABELS = {'real': "현재", 'future': "미래"}
+
+
+# ✅ 경로 요청 (스케줄러가 남은 예산이 가장 많은 키를 배정, 최대 키 개수만큼 시도)
+def fetch_route(mode, origin, destination, api_keys, key_index, u, v, departure_time=None, scheduler=None):
+    scheduler = scheduler or get_scheduler(api_keys)
+    session = get_session()
+
+    for _ in range(len(api_keys)):
+        key_idx = scheduler.acquire(prefer=key_index)
+        if key_idx is None:
+            print(f"[🚫 Daily quota exhausted] {origin} → {destination}")
+            return None
+        url, headers, params = route_request(mode, origin, destination, api_keys[key_idx], departure_time)
+
+        # 200 응답의 본문이 JSON 이 아니어도 (점검 페이지 등) 예외로 처리하고 다음 키로 재시도
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if 'routes' in data and data['routes'] and 'sections' in data['routes'][0]:
-                    section = data['routes'][0]['sections'][0]
-                    duration = section['duration']
-                    print(f"[✅ 현재 성공] {origin} → {destination} | {duration:.1f} sec | API-{key_idx+1}")
-                    return {
-                        'u': u, 'v': v,
-                        'u_x': origin[0], 'u_y': origin[1],
-                        'v_x': destination[0], 'v_y': destination[1],
-                        'duration': duration
-                    }
-            else:
-                print(f"[❌ HTTP {response.status_code}] {origin} → {destination} | API-{key_idx+1}")
-                if response.status_code == 429:
-                    print(f"[🚫 Rate Limited] API-{key_idx+1}")
-                    blacklisted_keys.add(key_idx)
-                    blacklist_timers[key_idx] = time.time() + API_RETRY_COOLDOWN
+            response = session.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+            status, retry_after = response.status_code, response.headers.get("Retry-After")
+            duration = parse_duration(response.json()) if status == 200 else None
         except Exception as e:
+            scheduler.report(key_idx, None)
             print(f"[❗ Exception] {origin} → {destination} | API-{key_idx+1} | {e}")
+            continue
 
-        attempts += 1
-        time.sleep(random.uniform(MIN_SLEEP, MAX_SLEEP))
+        # 200 이지만 경로가 없는 응답은 실패로 기록
+        scheduler.report(key_idx, status if duration is not None or status != 200 else None, retry_after)
+        if duration is not None:
+            print(f"[✅ {LABELS[mode]} 성공] {origin} → {destination} | {duration:.1f} sec | API-{key_idx+1}")
+            return edge_result(u, v, origin, destination, duration)
+        print(f"[❌ HTTP {status}] {origin} → {destination} | API-{key_idx+1}")
+        if status == 429:
+            print(f"[🚫 Rate Limited] API-{key_idx+1}")
 
     print(f"[❌ All APIs failed] {origin} → {destination}")
     return None
 
+
+# ✅ 현재 경로 요청
+def get_route_info_with_rotation(origin, destination, api_keys, key_index, u, v):
+    return fetch_route('real', origin, destination, api_keys, key_index, u, v)
+
+
 # ✅ 미래 경로 요청
 def get_future_route_info_with_rotation(origin, destination, api_keys, key_index, u, v, departure_time):
-    attempts = 0
-    total_keys = len(api_keys)
-
-    while attempts < total_keys:
-        key_idx = (key_index + attempts) % total_keys
-
-        if key_idx in blacklisted_keys:
-            now = time.time()
-            if now < blacklist_timers[key_idx]:
-                attempts += 1
-                continue
-            else:
-                blacklisted_keys.remove(key_idx)
-
-        api_key = api_keys[key_idx]
-        url = "https://apis-navi.kakaomobility.com/v1/future/directions"
-        headers = {
-            "Authorization": f"KakaoAK {api_key}",
-            "Content-Type": "application/json"
-        }
-        params = {
-            "origin": f"{origin[0]},{origin[1]},angle=270",
-            "destination": f"{destination[0]},{destination[1]}",
-            "departure_time": departure_time,
-            "summary": "true",
-            "priority": "TIME",
-            "car_fuel": "GASOLINE",
-            "car_hipass": "false",
-            "alternatives": "false",
-            "road_details": "false",
-            "roadevent": "2"
-        }
+    return fetch_route('future', origin, destination, api_keys, key_index, u, v, departure_time)
+
+
+# ✅ 저장소에 이미 있는 구간은 {행 키: 결과} 로 바로 사용, 나머지만 요청 대상으로 반환
+def split_cached(edges_df, mode, departure_time, store):
+    if store is None or edges_df.empty:
+        return {}, edges_df
+    cols = [edges_df[c].tolist() for c in ('u', 'v', 'u_x', 'u_y', 'v_x', 'v_y')]
+    times = edges_df['departure_time'].tolist() if departure_time is None and mode != 'real' \
+        else [departure_time] * len(edges_df)
+    keys = [route_key(mode, (ux, uy), (vx, vy), t) for (_, _, ux, uy, vx, vy), t in zip(zip(*cols), times)]
+    found = store.get_many(keys)
+    cached = {}
+    for idx, (u, v, ux, uy, vx, vy), key in zip(edges_df.index, zip(*cols), keys):
+        duration = found.get(key)
+        if duration is not None:
+            cached[idx] = edge_result(u, v, (ux, uy), (vx, vy), duration)
+    if cached:
+        print(f"[🗄️ 저장소] {len(cached)} / {len(edges_df)} 구간 재사용")
+    return cached, edges_df[~edges_df.index.isin(list(cached))]
+
+
+def store_result(store, mode, departure_time, result):
+    if store is not None and result:
+        key = route_key(mode, (result['u_x'], result['u_y']), (result['v_x'], result['v_y']), departure_time)
+        store.put(key, result['duration'])
+
+
+# 완료 순서로 들어오는 (키, 결과) 를 입력 순서로 재배열 (앞선 행이 모두 끝나는 즉시 방출)
+def in_input_order(items, keys):
+    pending = {}
+    order = iter(keys)
+    nxt = next(order, None)
+    for key, result in items:
+        pending[key] = result
+        while nxt is not None and nxt in pending:
+            yield nxt, pending.pop(nxt)
+            nxt = next(order, None)
+
+
+async def in_input_order_async(items, keys):
+    pending = {}
+    order = iter(keys)
+    nxt = next(order, None)
+    async for key, result in items:
+        pending[key] = result
+        while nxt is not None and nxt in pending:
+            yield nxt, pending.pop(nxt)
+            nxt = next(order, None)
+
+
+# 첫 키 선호 순서: 행 번호 기준 순환, 재시도마다 다음 키부터
+def _prefer(idx, attempt):
+    return hash(idx) + attempt
+
+
+# 출발 시각: 인자로 주어지지 않으면 행의 departure_time 열 사용 (여러 시각을 한 스트림으로 요청할 때)
+def _row_time(row, departure_time):
+    return departure_time if departure_time is not None else row.get('departure_time')
+
+
+# ✅ 스트리밍 요청: 끝나는 대로 (행 인덱스, 결과 dict 또는 None) 방출, 실패 행은 같은 풀에서 retries 회 재요청
+# ordered=True 이면 입력 순서대로 방출 (행 인덱스는 유일해야 함), 동시에 제출하는 작업은 max_workers * 4 개로 제한
+def stream_edges(edges_df, api_keys, mode, departure_time=None, max_workers=10, store=None, retries=1,
+                 ordered=False):
+    items = _stream_edges(edges_df, api_keys, mode, departure_time, max_workers, store, retries)
+    return in_input_order(items, edges_df.index) if ordered else items
+
+
+def _stream_edges(edges_df, api_keys, mode, departure_time, max_workers, store, retries):
+    cached, pending = split_cached(edges_df, mode, departure_time, store)
+    get_session(max_workers)
+
+    def task(idx, row, attempt):
+        origin = (row['u_x'], row['u_y'])
+        destination = (row['v_x'], row['v_y'])
+        when = _row_time(row, departure_time)
+        t0 = time.perf_counter() if instrument.enabled else 0
+        result = fetch_route(mode, origin, destination, api_keys, _prefer(idx, attempt), row['u'], row['v'], when)
+        store_result(store, mode, when, result)
+        if instrument.enabled:
+            instrument.observe(f"api.{mode}.{'success' if result else 'failure'}", time.perf_counter() - t0)
+        return result
+
+    yield from cached.items()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    backlog = pending.iterrows()
+    futures = {}
+
+    def top_up():
+        for idx, row in backlog:
+            futures[executor.submit(task, idx, row, 0)] = (idx, row, 0)
+            if len(futures) >= max_workers * 4:
+                break
+
+    try:
+        top_up()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx, row, attempt = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[❗ Future Exception] {e}")
+                    result = None
+                if result is None and attempt < retries:
+                    futures[executor.submit(task, idx, row, attempt + 1)] = (idx, row, attempt + 1)
+                    continue
+                yield idx, result
+            top_up()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if store is not None:
+            store.flush()
+
+
+# 스트림 → (success_df, fail_df), 성공/실패 모두 입력 행 인덱스를 그대로 유지 (입력 순서)
+def collect(edges_df, items):
+    results = dict(items)
+    ok = [k for k in edges_df.index if results.get(k)]
+    success_df = pd.DataFrame([results[k] for k in ok], index=ok)
+    fail_df = edges_df.loc[[k for k in edges_df.index if not results.get(k)]]
+    return success_df, fail_df
+
+
+def process_edges_parallel(edges_df, api_keys, mode, departure_time=None, max_workers=10, store=None, retries=0):
+    return collect(edges_df, stream_edges(edges_df, api_keys, mode, departure_time, max_workers, store, retries))
+
+
+# ✅ 비동기 경로 요청 (aiohttp 세션 공유, 키 배정은 동기 버전과 같은 스케줄러 사용)
+async def fetch_route_async(session, mode, origin, destination, api_keys, key_index, u, v, departure_time=None,
+                            scheduler=None):
+    scheduler = scheduler or get_scheduler(api_keys)
+
+    for _ in range(len(api_keys)):
+        key_idx = await scheduler.acquire_async(prefer=key_index)
+        if key_idx is None:
+            print(f"[🚫 Daily quota exhausted] {origin} → {destination}")
+            return None
+        url, headers, params = route_request(mode, origin, destination, api_keys[key_idx], departure_time)
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if 'routes' in data and data['routes'] and 'sections' in data['routes'][0]:
-                    section = data['routes'][0]['sections'][0]
-                    duration = section['duration']
-                    print(f"[✅ 미래 성공] {origin} → {destination} | {duration:.1f} sec | API-{key_idx+1}")
-                    return {
-                        'u': u, 'v': v,
-                        'u_x': origin[0], 'u_y': origin[1],
-                        'v_x': destination[0], 'v_y': destination[1],
-                        'duration': duration,
-                    }
+            async with session.get(url, headers=headers, params=params) as response:
+                status, retry_after = response.status, response.headers.get("Retry-After")
+                duration = parse_duration(await response.json(content_type=None)) if status == 200 else None
         except Exception as e:
-            print(f"[❗ Exception] {origin} → {destination} | API-{key_idx+1} | {e}")
+            scheduler.report(key_idx, None)
+            print(f"[❗ Exception] {origin} → {destination} | API-{key_idx+1} | {e!r}")
+            continue
 
-        attempts += 1
-        time.sleep(random.uniform(MIN_SLEEP, MAX_SLEEP))
+        scheduler.report(key_idx, status if duration is not None or status != 200 else None, retry_after)
+        if duration is not None:
+            print(f"[✅ {LABELS[mode]} 성공] {origin} → {destination} | {duration:.1f} sec | API-{key_idx+1}")
+            return edge_result(u, v, origin, destination, duration)
+        print(f"[❌ HTTP {status}] {origin} → {destination} | API-{key_idx+1}")
+        if status == 429:
+            print(f"[🚫 Rate Limited] API-{key_idx+1}")
 
     print(f"[❌ All APIs failed] {origin} → {destination}")
     return None
 
-def process_edges_parallel(edges_df, api_keys, mode, departure_time=None, max_workers=10):
-    results, failures = [], []
 
-    def task(row_index_row):
-        idx, row = row_index_row
-        origin = (row['u_x'], row['u_y'])
-        destination = (row['v_x'], row['v_y'])
-        if mode == 'real':
-            return get_route_info_with_rotation(origin, destination, api_keys, idx, row['u'], row['v']) or row
-        else:
-            return get_future_route_info_with_rotation(origin, destination, api_keys, idx, row['u'], row['v'], departure_time) or row
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(task, item) for item in edges_df.iterrows()]
-        for future in as_completed(futures):
-            try:
-                result = future.result()
-                if isinstance(result, dict):
-                    results.append(result)
-                else:
-                    failures.append(result)
-            except Exception as e:
-                print(f"[❗ Future Exception] {e}")
-
-    return pd.DataFrame(results), pd.DataFrame(failures)
+# ✅ 비동기 스트리밍 요청 (stream_edges 와 같은 규칙, async for 로 소비)
+async def stream_edges_async(edges_df, api_keys, mode, departure_time=None, concurrency=200, store=None,
+                             retries=1, ordered=False):
+    items = _stream_edges_async(edges_df, api_keys, mode, departure_time, concurrency, store, retries)
+    if ordered:
+        items = in_input_order_async(items, edges_df.index)
+    async for item in items:
+        yield item
+
+
+async def _stream_edges_async(edges_df, api_keys, mode, departure_time, concurrency, store, retries):
+    import aiohttp
+
+    cached, pending = split_cached(edges_df, mode, departure_time, store)
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    for item in cached.items():
+        yield item
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def task(idx, row, attempt):
+            origin = (row['u_x'], row['u_y'])
+            destination = (row['v_x'], row['v_y'])
+            when = _row_time(row, departure_time)
+            async with semaphore:
+                t0 = time.perf_counter() if instrument.enabled else 0
+                result = await fetch_route_async(session, mode, origin, destination, api_keys,
+                                                 _prefer(idx, attempt), row['u'], row['v'], when)
+            store_result(store, mode, when, result)
+            if instrument.enabled:
+                instrument.observe(f"api.{mode}.{'success' if result else 'failure'}", time.perf_counter() - t0)
+            return result
+
+        backlog = pending.iterrows()
+        tasks = {}
+
+        def top_up():
+            for idx, row in backlog:
+                tasks[asyncio.ensure_future(task(idx, row, 0))] = (idx, row, 0)
+                if len(tasks) >= concurrency * 2:
+                    break
+
+        try:
+            top_up()
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    idx, row, attempt = tasks.pop(t)
+                    try:
+                        result = t.result()
+                    except Exception as e:
+                        print(f"[❗ Task Exception] {e!r}")
+                        result = None
+                    if result is None and attempt < retries:
+                        tasks[asyncio.ensure_future(task(idx, row, attempt + 1))] = (idx, row, attempt + 1)
+                        continue
+                    yield idx, result
+                top_up()
+        finally:
+            for t in tasks:
+                t.cancel()
+            if store is not None:
+                store.flush()
+
+
+async def _collect_async(stream):
+    return [item async for item in stream]
+
+
+# ✅ 비동기 모드: 커넥션 풀 + 동시 요청 수 제한 (반환 형식은 process_edges_parallel 과 동일)
+def process_edges_async(edges_df, api_keys, mode, departure_time=None, concurrency=200, store=None, retries=0):
+    items = asyncio.run(_collect_async(
+        stream_edges_async(edges_df, api_keys, mode, departure_time, concurrency, store, retries)))
+    return collect(edges_df, items)
+
+
+# ✅ 결과를 도착하는 대로 CSV 에 이어 쓰기 (중단돼도 앞부분은 사용 가능)
+class CsvAppender:
+    def __init__(self, path, flush_every=500):
+        self.path, self.flush_every = path, flush_every
+        self.rows, self.written = [], 0
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        first = self.written == 0
+        pd.DataFrame(self.rows).to_csv(self.path, mode='w' if first else 'a', header=first, index=False,
+                                       encoding="utf-8-sig" if first else "utf-8")
+        self.written += len(self.rows)
+        self.rows = []
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--mode', type=str, choices=['real', 'future'], help='기본값: real')
     parser.add_argument('--departure_time', type=str, help='미래 출발 시간 지정 (예: 202507010800)')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='aiohttp 비동기 클라이언트 사용')
     args = parser.parse_args()
 
     cfg = config_api()  
     api_keys = get_api_keys() 
+    instrument.enable(cfg.get("INSTRUMENT", False))
     
     mode = args.mode if args.mode else cfg.get("DEFAULT_MODE", "real")
     departure_time = args.departure_time if args.departure_time else cfg["DEFAULT_DEPARTURE_TIME"]
 
     df = pd.read_csv(cfg["INPUT_CSV_PATH"])
+    store = store_from_config(cfg)
 
-    success_df, fail_df = process_edges_parallel(df, api_keys, mode, departure_time, max_workers=cfg["MAX_WORKERS"])
-    retry_df, _ = process_edges_parallel(fail_df, api_keys, mode, departure_time, max_workers=cfg["MAX_WORKERS"])
+    output_path = cfg["OUTPUT_CSV_PATH_FUTURE"] if mode == "future" else cfg["OUTPUT_CSV_PATH_REAL"]
+    writer = CsvAppender(output_path)
 
-    final_df = pd.concat([success_df, retry_df], ignore_index=True)
-    print(f"✅ 최종 성공: {len(final_df)} / {len(df)}")
+    # 입력 순서대로 도착하는 즉시 CSV 에 이어 씀 (실패 행은 같은 실행 안에서 1회 재요청)
+    if args.use_async or cfg.get("ASYNC", False):
+        async def run():
+            async for _, result in stream_edges_async(df, api_keys, mode, departure_time, cfg["ASYNC_CONCURRENCY"],
+                                                      store, retries=1, ordered=True):
+                if result:
+                    writer.add(result)
+        asyncio.run(run())
+    else:
+        for _, result in stream_edges(df, api_keys, mode, departure_time, cfg["MAX_WORKERS"], store, retries=1,
+                                      ordered=True):
+            if result:
+                writer.add(result)
+    writer.flush()
 
-    output_path = cfg["OUTPUT_CSV_PATH_FUTURE"] if mode == "future" else cfg["OUTPUT_CSV_PATH_REAL"]
-    final_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    print(f"✅ 최종 성공: {writer.written} / {len(df)}")
     print(f"📁 저장 완료 → {output_path}")
+    if store is not None:
+        print(f"[🗄️ 저장소] {store.stats()} → {store.path}")
+        store.close()
+
+    key_stats = pd.DataFrame(get_scheduler(api_keys).stats())
+    key_stats.to_csv(cfg["KEY_STATS_PATH"], index=False, encoding="utf-8-sig")
+    print(f"🔑 키별 사용량: 요청 {key_stats['requests'].sum()}, 429 {key_stats['rate_limited'].sum()} "
+          f"→ {cfg['KEY_STATS_PATH']}")
+
+    if instrument.enabled:
+        instrument.print_report(instrument.export(cfg["INSTRUMENT_REPORT_PATH"]))
 
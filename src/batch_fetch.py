@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+import instrument
+from api_connect import get_scheduler, stream_edges, stream_edges_async
+from config.config import config_api, get_api_keys
+from graph import graph_from_edges
+from route_store import store_from_config
+from timedep import TimeDependentGraph, format_slot, minute_of_day, slot_range
+
+## 실행 방법 (여러 출발 시각을 한 번에 요청 → 엣지 × 슬롯 소요시간 테이블)
+#python batch_fetch.py --date 20250528 --step 15 --async
+#python batch_fetch.py --departure_times 202505280230 202505280800 202505281900
+
+FORMAT = "isecd-duration-table"
+FORMAT_VERSION = 1
+EDGE_COLUMNS = ['u', 'v', 'u_x', 'u_y', 'v_x', 'v_y']
+
+
+def departure_times_for(date, step_minutes=15):
+    return [f"{date}{format_slot(m)}" for m in slot_range(step_minutes)]
+
+
+# 엣지 × 출발 시각 작업 목록 (인덱스: (슬롯 번호, 엣지 번호))
+def _jobs(edges, departure_times):
+    return pd.concat([edges.assign(departure_time=t) for t in departure_times],
+                     keys=range(len(departure_times)), names=['slot', 'edge'])
+
+
+# ✅ 모든 (엣지, 출발 시각) 요청을 하나의 풀/키 스케줄러로 처리 → (엣지 테이블, m × S float32 소요시간, NaN = 실패)
+def fetch_duration_table(edges_df, api_keys, departure_times, store=None, use_async=False, max_workers=10,
+                         concurrency=200, retries=1):
+    edges = edges_df[EDGE_COLUMNS].drop_duplicates(['u', 'v'], keep='last').reset_index(drop=True)
+    durations = np.full((len(edges), len(departure_times)), np.nan, dtype=np.float32)
+    jobs = _jobs(edges, departure_times)
+    done = 0
+
+    def record(key, result):
+        nonlocal done
+        done += 1
+        if result:
+            slot, edge = key
+            durations[edge, slot] = result['duration']
+        if done % 1000 == 0:
+            print(f"[📦 진행] {done} / {len(jobs)}")
+
+    if use_async:
+        async def run():
+            async for key, result in stream_edges_async(jobs, api_keys, 'future', None, concurrency, store, retries):
+                record(key, result)
+        asyncio.run(run())
+    else:
+        for key, result in stream_edges(jobs, api_keys, 'future', None, max_workers, store, retries):
+            record(key, result)
+    return edges, durations
+
+
+# ✅ 저장: 디렉터리 = header.json + edges.csv (좌표 1회) + durations.npy (m × S) + slot_minutes.npy
+def write_duration_table(path, edges, departure_times, durations):
+    header = {
+        "format": FORMAT, "version": FORMAT_VERSION, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "num_edges": len(edges), "departure_times": [str(t) for t in departure_times],
+        "missing": int(np.isnan(durations).sum()),
+    }
+    tmp = f"{path}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    edges.to_csv(os.path.join(tmp, "edges.csv"), index=False, encoding="utf-8-sig")
+    np.save(os.path.join(tmp, "durations.npy"), np.ascontiguousarray(durations, dtype=np.float32))
+    np.save(os.path.join(tmp, "slot_minutes.npy"),
+            np.array([minute_of_day(t) for t in departure_times], dtype=np.int32))
+    with open(os.path.join(tmp, "header.json"), "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return header
+
+
+def read_duration_table(path):
+    with open(os.path.join(path, "header.json"), encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 소요시간 테이블 형식: {path}")
+    edges = pd.read_csv(os.path.join(path, "edges.csv"), dtype={'u': str, 'v': str})
+    durations = np.load(os.path.join(path, "durations.npy"), mmap_mode='r')
+    slot_minutes = np.load(os.path.join(path, "slot_minutes.npy"))
+    return header, edges, durations, slot_minutes
+
+
+# ✅ 테이블 → TimeDependentGraph (누락 값은 같은 엣지의 다른 슬롯 평균, 모두 누락된 엣지는 제외)
+def time_dependent_graph(path):
+    _, edges, durations, slot_minutes = read_duration_table(path)
+    durations = np.asarray(durations, dtype=np.float64)
+    observed = ~np.isnan(durations).all(axis=1)
+    edges, durations = edges[observed], durations[observed]
+    row_mean = np.nanmean(durations, axis=1, keepdims=True)
+    durations = np.where(np.isnan(durations), row_mean, durations)
+
+    G = graph_from_edges(edges.assign(duration=row_mean[:, 0]))
+    keys = pd.MultiIndex.from_arrays([G.node_ids[G.src], G.node_ids[G.dst]])
+    rows = pd.MultiIndex.from_arrays([edges['u'], edges['v']]).get_indexer(keys)
+    return TimeDependentGraph(G, slot_minutes, durations[rows])
+
+
+if __name__ == "__main__":
+    cfg = config_api()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--date', type=str, help='날짜 (예: 20250528), --step 간격으로 하루 전체 슬롯 생성')
+    parser.add_argument('--step', type=int, default=15, help='슬롯 간격(분), 기본 15 → 96 슬롯')
+    parser.add_argument('--departure_times', nargs='+', help='출발 시각 목록 (예: 202505280800)')
+    parser.add_argument('--output', type=str, default=cfg["DURATION_TABLE_PATH"])
+    parser.add_argument('--async', dest='use_async', action='store_true', help='aiohttp 비동기 클라이언트 사용')
+    args = parser.parse_args()
+
+    if not args.departure_times and not args.date:
+        parser.error("--date 또는 --departure_times 가 필요합니다")
+    departure_times = args.departure_times or departure_times_for(args.date, args.step)
+
+    api_keys = get_api_keys()
+    instrument.enable(cfg.get("INSTRUMENT", False))
+    store = store_from_config(cfg)
+    edges_df = pd.read_csv(cfg["INPUT_CSV_PATH"])
+
+    edges, durations = fetch_duration_table(
+        edges_df, api_keys, departure_times, store, args.use_async or cfg.get("ASYNC", False),
+        cfg["MAX_WORKERS"], cfg["ASYNC_CONCURRENCY"])
+    header = write_duration_table(args.output, edges, departure_times, durations)
+    print(f"✅ 저장 완료 → {args.output} / 엣지 {header['num_edges']} × 슬롯 {len(departure_times)}, "
+          f"누락 {header['missing']}")
+
+    if store is not None:
+        print(f"[🗄️ 저장소] {store.stats()}")
+        store.close()
+    key_stats = pd.DataFrame(get_scheduler(api_keys).stats())
+    key_stats.to_csv(cfg["KEY_STATS_PATH"], index=False, encoding="utf-8-sig")
+    if instrument.enabled:
+        instrument.print_report(instrument.export(cfg["INSTRUMENT_REPORT_PATH"]))
@@ -0,0 +1,267 @@
+import argparse
+import contextlib
+import gc
+import glob
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import algorithm
+from config.config import config_algorithm
+from heuristics import compare_heuristics
+
+## 실행 방법 (오프라인, API 키 불필요)
+#python benchmark.py --output bench.json
+#python benchmark.py --sizes 1000 10000 --baseline bench.json --tolerance 1.2
+
+SEOUL_CENTER = (126.95, 37.555)
+DEG_PER_M_LAT = 1 / 111_320
+
+
+# ✅ 합성 격자 도로망 (양방향, 엣지 수 ≈ 4 * side * (side - 1))
+def grid_network(num_edges, seed=0):
+    rng = np.random.default_rng(seed)
+    side = max(2, int(round((1 + (1 + num_edges) ** 0.5) / 2)))
+    ids = np.arange(side * side).reshape(side, side)
+    spacing = 100 * DEG_PER_M_LAT
+    xs = SEOUL_CENTER[0] + (ids % side) * spacing / np.cos(np.radians(SEOUL_CENTER[1]))
+    ys = SEOUL_CENTER[1] + (ids // side) * spacing
+
+    h = np.stack([ids[:, :-1].ravel(), ids[:, 1:].ravel()], axis=1)
+    v = np.stack([ids[:-1, :].ravel(), ids[1:, :].ravel()], axis=1)
+    pairs = np.concatenate([h, v])
+    pairs = np.concatenate([pairs, pairs[:, ::-1]])
+    return _edge_frame(pairs, xs.ravel(), ys.ravel(), rng)
+
+
+# ✅ 합성 랜덤 기하 도로망 (반경 내 점끼리 양방향 연결, 평균 차수 ≈ 6)
+def geometric_network(num_edges, seed=0):
+    rng = np.random.default_rng(seed)
+    n = max(8, num_edges // 6)
+    side_m = 100 * n ** 0.5
+    px, py = rng.uniform(0, side_m, n), rng.uniform(0, side_m, n)
+    radius = side_m * (6 / (np.pi * n)) ** 0.5
+
+    cells = pd.DataFrame({'node': np.arange(n), 'cx': (px // radius).astype(int), 'cy': (py // radius).astype(int)})
+    parts = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            shifted = cells.assign(cx=cells['cx'] + dx, cy=cells['cy'] + dy)
+            parts.append(cells.merge(shifted, on=['cx', 'cy'], suffixes=('_a', '_b')))
+    cand = pd.concat(parts)
+    a, b = cand['node_a'].to_numpy(), cand['node_b'].to_numpy()
+    keep = (a != b) & (np.hypot(px[a] - px[b], py[a] - py[b]) < radius)
+    pairs = np.stack([a[keep], b[keep]], axis=1)
+
+    xs = SEOUL_CENTER[0] + px * DEG_PER_M_LAT / np.cos(np.radians(SEOUL_CENTER[1]))
+    ys = SEOUL_CENTER[1] + py * DEG_PER_M_LAT
+    return _edge_frame(pairs, xs, ys, rng)
+
+
+def _edge_frame(pairs, xs, ys, rng):
+    u, v = pairs[:, 0], pairs[:, 1]
+    length = np.hypot((xs[u] - xs[v]) * np.cos(np.radians(SEOUL_CENTER[1])), ys[u] - ys[v]) / DEG_PER_M_LAT
+    return pd.DataFrame({
+        'u': u.astype(str), 'v': v.astype(str),
+        'u_x': xs[u], 'u_y': ys[u], 'v_x': xs[v], 'v_y': ys[v],
+        'duration': np.round(length / rng.uniform(3, 15, len(u)) * rng.uniform(1, 4, len(u))),
+        'departure_time': 202505280800,
+        'length': length, 'risk': length * 0.1 * rng.uniform(0.5, 1.5, len(u)),
+        'oneway': rng.random(len(u)) < 0.3,
+    })
+
+
+SYNTHETIC = {"grid": grid_network, "geometric": geometric_network}
+
+
+# ✅ 측정: 시간은 tracemalloc 없이, 피크 메모리는 별도 실행에서 측정
+def measure(fn, repeat=1, memory=True):
+    gc.collect()
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            value = fn()
+            times.append(time.perf_counter() - t0)
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return min(times), peak_mb, value
+
+
+def sim_config(G, rng, trials, candidates, routing):
+    config = config_algorithm()
+    nodes = G.node_ids.tolist()
+    config.update({
+        "num_trials": trials, "routing": routing, "route_cache_size": 0, "workers": 1,
+        "station_nodes": {f"station{i}": n for i, n in enumerate(rng.sample(nodes, 4))},
+        "accident_candidates": rng.sample(nodes, min(candidates, len(nodes))),
+    })
+    return config
+
+
+# ✅ 네트워크 하나에 대한 전체 워크로드
+def run_network(name, csv_path, args, risk_path=None):
+    rows = []
+    rng = random.Random(args.seed)
+
+    def record(workload, seconds, peak_mb, ops=1, **extra):
+        row = {"network": name, "workload": workload, "edges": G.num_edges, "nodes": G.num_nodes,
+               "seconds": round(seconds, 6), "ops": ops, "ops_per_sec": round(ops / seconds, 3) if seconds else None,
+               "peak_mb": round(peak_mb, 3) if peak_mb is not None else None, **extra}
+        rows.append(row)
+        print(f"  {workload:<28} {seconds:9.4f}s  {row['ops_per_sec'] or 0:>12.1f} ops/s  "
+              f"{row['peak_mb'] if row['peak_mb'] is not None else '-':>9} MB")
+
+    config = {"csv_path": csv_path}
+    seconds, peak, (G, df, node_pos) = measure(lambda: algorithm.build_graph(config), args.repeat, args.memory)
+    record("build_graph", seconds, peak)
+
+    seconds, peak, risk_map = measure(lambda: algorithm.load_risk_map(risk_path or csv_path), args.repeat,
+                                       args.memory)
+    record("load_risk_map", seconds, peak)
+
+    n = G.num_nodes
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(args.queries)]
+    seconds, peak, _ = measure(
+        lambda: [algorithm.bidirectional_dijkstra_idx(G, s, t) for s, t in pairs], args.repeat, args.memory)
+    record("bidirectional_dijkstra", seconds, peak, ops=len(pairs))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        settled = compare_heuristics(G, pairs[:args.heuristic_queries])
+    base = settled["dijkstra"]["settled_per_query"] or 1
+    for mode, r in settled.items():
+        rows.append({"network": name, "workload": f"settled_{mode}", "edges": G.num_edges, "nodes": n,
+                     "settled_per_query": round(r["settled_per_query"], 2),
+                     "settled_ratio": round(r["settled_per_query"] / base, 4),
+                     "ms_per_query": round(r["ms_per_query"], 4),
+                     "cost_mismatch_rate": round(r["cost_mismatch_rate"], 4),
+                     "meeting_mismatch_rate": round(r["meeting_mismatch_rate"], 4),
+                     "path_mismatch_rate": round(r["path_mismatch_rate"], 4),
+                     "cost_ratio": round(r["cost_ratio"], 4)})
+        print(f"  settled_{mode:<20} {r['settled_per_query']:9.1f}/query ({r['settled_per_query'] / base:.1%})  "
+              f"불일치 비용 {r['cost_mismatch_rate']:.1%} / 만남 노드 {r['meeting_mismatch_rate']:.1%} / "
+              f"경로 {r['path_mismatch_rate']:.1%}, 비용 비율 {r['cost_ratio']:.3f}")
+
+    for routing in ("bidirectional", "table"):
+        sc = sim_config(G, rng, args.trials, args.candidates, routing)
+        seconds, peak, _ = measure(lambda: algorithm.simulate(sc, G, df, node_pos, risk_map), 1, args.memory)
+        record(f"simulate_{routing}", seconds, peak, ops=args.trials)
+
+    try:
+        from datapreprocess import duplicate_bidirectional_edges
+    except ImportError as e:
+        rows.append({"network": name, "workload": "duplicate_bidirectional_edges", "skipped": str(e)})
+        print(f"  duplicate_bidirectional_edges 건너뜀: {e}")
+    else:
+        edges = pd.read_csv(csv_path)
+        if 'oneway' in edges.columns:
+            for col in ('u_point', 'v_point'):
+                if col not in edges.columns:
+                    edges[col] = None
+            seconds, peak, _ = measure(lambda: duplicate_bidirectional_edges(edges.copy()), args.repeat, args.memory)
+            record("duplicate_bidirectional_edges", seconds, peak, ops=len(edges))
+
+    return rows
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ✅ 기준 결과와 비교 (seconds / peak_mb 가 tolerance 배 이상 늘면 회귀, min_seconds 미만 측정은 노이즈로 보고 제외)
+def compare(results, baseline, tolerance, min_seconds=0.05):
+    base = {(r["network"], r["workload"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        b = base.get((r["network"], r["workload"]))
+        if not b:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if metric == "seconds" and (b.get(metric) or 0) < min_seconds:
+                continue
+            if r.get(metric) and b.get(metric) and r[metric] > b[metric] * tolerance:
+                regressions.append(f"{r['network']}/{r['workload']} {metric}: {b[metric]} → {r[metric]} "
+                                   f"(x{r[metric] / b[metric]:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1e3, 1e4, 1e5, 1e6], help='합성 네트워크 엣지 수')
+    parser.add_argument('--synthetic', nargs='+', default=list(SYNTHETIC), choices=list(SYNTHETIC))
+    parser.add_argument('--real', nargs='*', default=None, help='기본값: ../data/*_assigned_edges_future.csv')
+    parser.add_argument('--risk_csv', type=str, default=config_algorithm()["risk_csv_path"], help='실제 네트워크 위험도 CSV')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--heuristic_queries', type=int, default=50)
+    parser.add_argument('--trials', type=int, default=20)
+    parser.add_argument('--candidates', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no_memory', dest='memory', action='store_false')
+    parser.add_argument('--output', type=str, default='benchmark_results.json')
+    parser.add_argument('--baseline', type=str, help='비교할 이전 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=1.2)
+    parser.add_argument('--min_seconds', type=float, default=0.05)
+    args = parser.parse_args()
+
+    real = args.real if args.real is not None else sorted(glob.glob("../data/*_assigned_edges_future.csv"))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in args.synthetic:
+            for size in args.sizes:
+                name = f"{kind}_{int(size)}"
+                path = os.path.join(tmp, f"{name}.csv")
+                SYNTHETIC[kind](int(size), seed=args.seed).to_csv(path, index=False)
+                print(f"\n=== {name} ===")
+                results += run_network(name, path, args)
+
+    for path in real:
+        name = os.path.basename(path).replace("_assigned_edges_future.csv", "")
+        print(f"\n=== {name} ===")
+        results += run_network(name, path, args, risk_path=args.risk_csv)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": git_commit(),
+            "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "platform": platform.platform(), "cpu_count": os.cpu_count(), "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📁 저장 완료 → {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_seconds)
+        for line in regressions:
+            print(f"[⚠️ 회귀] {line}")
+        if regressions:
+            sys.exit(1)
+        print("✅ 기준 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
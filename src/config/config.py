@@ -62,7 +62,20 @@ def config_api():
         "OUTPUT_CSV_PATH_FUTURE": "../data/assigned_edges_future.csv",
         "DEFAULT_MODE": "real",
         "DEFAULT_DEPARTURE_TIME": "202507010800",
-        "MAX_WORKERS": 10
+        "MAX_WORKERS": 10,
+        "KAKAO_BASE_URL": "https://apis-navi.kakaomobility.com",   # 로컬 테스트: mock_server.py 주소
+        "ASYNC": False,              # True 이면 aiohttp 비동기 클라이언트 사용 (pip install aiohttp)
+        "ASYNC_CONCURRENCY": 200,    # 비동기 모드 동시 요청 수 (커넥션 풀 크기)
+        "KEY_RATE_PER_SEC": 5.0,     # 키당 토큰 버킷 충전 속도 (초당 요청 수)
+        "KEY_BURST": 5.0,            # 키당 버킷 크기
+        "KEY_DAILY_QUOTA": 10000,    # 키당 일일 할당량 (소진된 키는 자정까지 제외)
+        "KEY_STATS_PATH": "../data/api_key_stats.csv",
+        "ROUTE_STORE_PATH": "../data/route_store.sqlite",   # None 이면 저장소 사용 안 함
+        "ROUTE_STORE_TTL": None,     # 미래(future) 소요시간 유효기간(초), None 이면 만료 없음
+        "ROUTE_STORE_TTL_REAL": 600, # 현재(real) 소요시간 유효기간(초)
+        "DURATION_TABLE_PATH": "../data/duration_table",   # batch_fetch.py 출력 (엣지 × 슬롯)
+        "INSTRUMENT": False,
+        "INSTRUMENT_REPORT_PATH": "../data/api_instrument_report.json"
     }
 
     return config
@@ -71,13 +84,51 @@ def config_api():
 def config_algorithm():
     return {
         "csv_path": "../data/05280800_assigned_edges_future.csv",
+        "snapshot_paths": [
+            "../data/05280230_assigned_edges_future.csv",
+            "../data/05280800_assigned_edges_future.csv",
+            "../data/05281900_assigned_edges_future.csv",
+            ],
+        "slot_step_minutes": None,   # 예: 15 → 15분 간격 슬롯을 스냅샷 보간으로 생성
+        "slots_output_path": "../data/50times_slots_bestonly.csv",
+        "graph_snapshot_path": "../data/graph_snapshot",   # python snapshot.py 로 컴파일
+        "use_graph_snapshot": False,
+        "snapshot_departure_time": "0800",
+        "tiles_path": "../data/tiles",               # python tiles.py 로 컴파일 (공간 타일 + 경계 오버레이)
         "output_path": "../data/50times_gowork_bestonly.csv",
+        "sweep_output_path": "../data/sweep_results.csv",   # python sweep.py (weight_factor/alpha/... 격자)
+        "dispatch_output_path": "../data/dispatch_incidents.csv",   # python dispatch.py (다중 사고 사건 시뮬레이션)
+        "dispatch_days": 365,
+        "dispatch_incidents_per_day": 24.0,   # 포아송 발생률
+        "dispatch_on_scene_minutes": 20.0,    # 현장 활동 평균 (지수분포)
         "risk_csv_path": "../data/edges.csv", 
         "num_trials": 50,
+        "trial_mode": "fixed",       # "fixed" (num_trials 회) | "adaptive" (신뢰구간 목표 도달 시 중단) | "exhaustive" (후보별 1회, 추출 확률 가중)
+        "max_trials": 100000,        # adaptive 최대 시행 수
+        "min_trials": 30,
+        "check_every": 10,           # adaptive 수렴 확인 간격 (병렬 실행 시 청크 크기)
+        "stop_ci_width": {"total_time_min": 0.02},   # 지표별 목표 신뢰구간 반폭
+        "stop_relative": True,       # True 이면 목표 반폭을 평균 대비 비율로 해석
+        "confidence": 0.95,
+        "keep_results": True,        # False 이면 결과 행을 보관하지 않고 통계만 집계 (analyze_saving/CSV 생략)
+        "stats_output_path": "../data/50times_gowork_stats.csv",
+        "result_format": "csv",      # "csv" | "columnar" (청크 단위 열 저장소, CSV 는 python result_store.py 로 내보내기)
+        "result_store_path": "../data/results",
+        "result_chunk_rows": 10000,
+        "server_host": "127.0.0.1",  # python route_server.py (그래프를 올려둔 채 질의 응답)
+        "server_port": 8765,
+        "server_reload_interval": 5,  # 스냅샷/CSV 변경 감시 간격(초), 0 이면 감시 안 함
         "max_time_diff": 60,
         "weight_factor": 0.692,
         "alpha": 0.7,
         "seed": 42,
+        "routing": "table",          # "table" (소방서/후보 탐색 기록 사전계산 후 재생) | "bidirectional" (질의마다 탐색), 결과 동일
+        "heuristic": None,           # None | "geo" | "alt" (opt-in 양방향 A*, routing="bidirectional" 전용, 일부 만남 노드가 달라질 수 있음)
+        "objective": "time",         # "time" | "score" (정방향 alpha * 시간 + (1 - alpha) * 위험도, 역방향/max_time_diff 는 시간 → 만남 비용 = 점수)
+        "route_cache_size": 4096,    # 경로 탐색 LRU 캐시 크기 (0 이면 사용 안 함)
+        "instrument": False,         # 탐색/시뮬레이션 계측 (카운터, 단계별 시간)
+        "instrument_report_path": "../data/instrument_report.json",
+        "workers": 1,                # > 1 이면 ProcessPoolExecutor 로 시행 병렬 실행
         "station_nodes": {
             "서대문소방서 북아현119안전센터": "7257925078",
             "마포소방서 119구조대": "8477574118",
@@ -105,6 +156,8 @@ def config_algorithm():
             ],
          "DEFAULT_DEPARTURE_TIME": "202507010800",  
             "MAX_WORKERS": 10,                        
+            "ROUTE_STORE_PATH": "../data/route_store.sqlite",
+            "ROUTE_STORE_TTL": None,
     }
 
 
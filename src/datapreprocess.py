@@ -1,9 +1,10 @@
 import osmnx as ox
+import numpy as np
 import pandas as pd
-from shapely.geometry import Point
-from shapely.ops import transform
 import pyproj
 
+UTM_CRS = "EPSG:32652"
+
 
 # 1. 도로망 불러오기 및 노드 병합
 def load_graph_with_coords(place_name="Seoul, South Korea"):
@@ -17,27 +18,34 @@ def load_graph_with_coords(place_name="Seoul, South Korea"):
     edges = edges.merge(u_coords, left_on='u', right_index=True, how='left')
     edges = edges.merge(v_coords, left_on='v', right_index=True, how='left')
 
-    edges['u_point'] = edges.apply(lambda r: Point(r['u_x'], r['u_y']), axis=1)
-    edges['v_point'] = edges.apply(lambda r: Point(r['v_x'], r['v_y']), axis=1)
-
     return edges
 
 
 # 2. 버퍼 필터링
-def filter_by_buffer(edges, station_coords, radius_m=2130):
-    to_utm = pyproj.Transformer.from_crs("EPSG:4326", "EPSG:32652", always_xy=True).transform
-    to_wgs = pyproj.Transformer.from_crs("EPSG:32652", "EPSG:4326", always_xy=True).transform
+# 엣지별 "가장 가까운 소방서/정류장까지 거리" (u, v 중 먼 쪽, UTM 미터) — 반경 스윕은 이 값과 비교만 하면 됨
+def station_distance(edges, station_coords):
+    to_utm = pyproj.Transformer.from_crs("EPSG:4326", UTM_CRS, always_xy=True)
+    ux, uy = to_utm.transform(edges['u_x'].to_numpy(), edges['u_y'].to_numpy())
+    vx, vy = to_utm.transform(edges['v_x'].to_numpy(), edges['v_y'].to_numpy())
+    lat, lon = np.asarray(list(station_coords.values()), dtype=np.float64).T
+    sx, sy = to_utm.transform(lon, lat)
+
+    du = np.full(len(edges), np.inf)
+    dv = np.full(len(edges), np.inf)
+    for x, y in zip(np.atleast_1d(sx), np.atleast_1d(sy)):
+        np.minimum(du, np.hypot(ux - x, uy - y), out=du)
+        np.minimum(dv, np.hypot(vx - x, vy - y), out=dv)
+    return np.maximum(du, dv)
 
-    buffers = []
-    for lat, lon in station_coords.values():
-        buffer = transform(to_utm, Point(lon, lat)).buffer(radius_m)
-        buffers.append(transform(to_wgs, buffer))
 
-    def in_all_buffers(row):
-        return any(b.contains(row['u_point']) for b in buffers) and \
-               any(b.contains(row['v_point']) for b in buffers)
+def filter_by_buffer(edges, station_coords, radius_m=2130):
+    return edges[station_distance(edges, station_coords) < radius_m].copy()
+
 
-    return edges[edges.apply(in_all_buffers, axis=1)].copy()
+# 여러 반경을 한 번에: {반경: 필터링된 엣지}
+def sweep_buffers(edges, station_coords, radii_m):
+    dist = station_distance(edges, station_coords)
+    return {r: edges[dist < r].copy() for r in radii_m}
 
 
 # 3. 사각형 필터링
@@ -58,7 +66,8 @@ def duplicate_bidirectional_edges(edges):
     bidir = edges[edges['oneway'] == False].copy()
 
     for col1, col2 in [('u', 'v'), ('u_x', 'v_x'), ('u_y', 'v_y'), ('u_point', 'v_point')]:
-        bidir[col1], bidir[col2] = bidir[col2], bidir[col1]
+        if col1 in bidir.columns and col2 in bidir.columns:
+            bidir[col1], bidir[col2] = bidir[col2], bidir[col1]
 
     bidir['ID'] = range(edges['ID'].max() + 1, edges['ID'].max() + 1 + len(bidir))
     bidir['key'] = 0  # 필요시 고정값 사용
@@ -0,0 +1,207 @@
+import argparse
+import heapq
+import os
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from algorithm import find_route, load_risk_map, path_risk, path_times
+from config.config import config_algorithm
+from tables import build_distance_tables, routing_rule
+from timedep import DAY_MINUTES, build_time_dependent_graph, format_slot, slot_range
+
+## 실행 방법 (다중 사고 이산 사건 시뮬레이션: 포아송 발생, 소방서 출동 중 대기, 차순위 소방서 대체)
+#python dispatch.py --days 365 --incidents_per_day 24 --on_scene 20
+#python dispatch.py --days 30 --incidents_per_day 120 --step 60 --units 2 1 1 1
+
+ARRIVAL, FREE = 0, 1
+
+
+# ✅ 시간대별 출동 테이블: 슬롯마다 (소방서 × 후보) 이동시간(분) / 점수 / 점수 순 소방서 순위
+# 슬롯 그래프에서 테이블 1회 계산 → 사건 1건 처리는 테이블 조회 O(소방서 수)
+# 경로는 simulate 와 같은 find_route (config["routing"], heuristic, objective 그대로) → 같은 만남 노드/점수
+class DispatchTables:
+    def __init__(self, tdg, config, slot_minutes=None):
+        self.stations = list(config["station_nodes"])
+        self.candidates = list(dict.fromkeys(config["accident_candidates"]))
+        self.slot_minutes = np.asarray(tdg.slot_minutes if slot_minutes is None else slot_minutes, dtype=np.int32)
+        self.routing = routing_rule(config)
+        alpha = config.get("alpha", 0.7)
+        # (슬롯, 소방서, 후보) 마다 한 번씩만 탐색 → 경로 LRU 캐시는 거치지 않음
+        config = {**config, "route_cache_size": 0}
+
+        S, C, K = len(self.stations), len(self.candidates), len(self.slot_minutes)
+        self.travel = np.full((K, S, C), np.inf)
+        self.score = np.full((K, S, C), np.inf)
+        for k, minute in enumerate(self.slot_minutes.tolist()):
+            G = tdg.at(int(minute))
+            tables = build_distance_tables(G, config) if self.routing == "table" else None
+            for i, (name, start) in enumerate(config["station_nodes"].items()):
+                for j, c in enumerate(self.candidates):
+                    path, _, meeting, pf, pb = find_route(G, name, start, c, config, tables)
+                    if meeting is None:
+                        continue
+                    _, _, total = path_times(G, pf, pb, config)
+                    self.travel[k, i, j] = total / 60
+                    self.score[k, i, j] = round(alpha * total + (1 - alpha) * path_risk(G, pf), 2)
+        # 동점이면 앞 소방서 (run_trial 의 min 과 같은 순서), 경로 없는 소방서는 순위에서 제외
+        self.order = np.argsort(self.score, axis=1, kind='stable')
+        self.reachable = np.isfinite(np.take_along_axis(self.score, self.order, axis=1))
+
+    # 하루 중 분 → 직전 슬롯 번호 (자정 이전 구간은 마지막 슬롯)
+    def slot_of(self, minute):
+        return int(np.searchsorted(self.slot_minutes, minute % DAY_MINUTES, side='right') - 1) % len(self.slot_minutes)
+
+
+# ✅ 포아송 발생 사건 (분 단위 시각, 후보 번호) → 미리 한 번에 생성
+def poisson_incidents(rng, days, incidents_per_day, num_candidates):
+    horizon = days * DAY_MINUTES
+    expected = incidents_per_day * days
+    gaps = rng.exponential(DAY_MINUTES / incidents_per_day, int(expected + 10 * np.sqrt(expected) + 10))
+    times = np.cumsum(gaps)
+    while times[-1] < horizon:
+        times = np.concatenate([times, times[-1] + np.cumsum(rng.exponential(DAY_MINUTES / incidents_per_day, 1000))])
+    times = times[times < horizon]
+    return times, rng.integers(num_candidates, size=len(times))
+
+
+# ✅ 이산 사건 엔진: 우선순위 큐 시계 (도착 / 출동 복귀), 소방서별 가용 대수, 전원 출동 중이면 FIFO 대기
+def run_dispatch(tables, times, cands, on_scene_minutes, units=None, rng=None, on_scene="exponential"):
+    S = len(tables.stations)
+    free = np.ones(S, dtype=np.int64) if units is None else np.asarray(units, dtype=np.int64).copy()
+    busy_minutes = np.zeros(S)
+    n = len(times)
+    rng = rng or np.random.default_rng()
+    scene = rng.exponential(on_scene_minutes, n) if on_scene == "exponential" else np.full(n, float(on_scene_minutes))
+
+    out = {
+        'station': np.full(n, -1, dtype=np.int64), 'choice_rank': np.full(n, -1, dtype=np.int64),
+        'dispatch_time': np.full(n, np.nan), 'travel_min': np.full(n, np.nan),
+    }
+    slots = np.array([tables.slot_of(int(t)) for t in times], dtype=np.int64)
+    events = [(float(t), ARRIVAL, idx) for idx, t in enumerate(times)]
+    heapq.heapify(events)
+    waiting = deque()
+
+    # 사건 idx 에 현재 가용한 최선 소방서 배정 (없으면 False)
+    def assign(idx, now):
+        k, c = slots[idx], cands[idx]
+        for rank in range(S):
+            if not tables.reachable[k, rank, c]:
+                break
+            i = tables.order[k, rank, c]
+            if free[i] > 0:
+                free[i] -= 1
+                travel = tables.travel[k, i, c]
+                busy = travel + scene[idx]
+                busy_minutes[i] += busy
+                out['station'][idx], out['choice_rank'][idx] = i, rank
+                out['dispatch_time'][idx], out['travel_min'][idx] = now, travel
+                heapq.heappush(events, (now + busy, FREE, i))
+                return True
+        return False
+
+    while events:
+        now, kind, x = heapq.heappop(events)
+        if kind == ARRIVAL:
+            if tables.reachable[slots[x], 0, cands[x]] and not assign(x, now):
+                waiting.append(x)
+        else:
+            free[x] += 1
+            # 복귀한 소방서로 대기 사건을 도착 순서대로 배정 (이 소방서에 닿지 못하는 사건은 계속 대기)
+            still = deque()
+            while waiting and free.any():
+                idx = waiting.popleft()
+                if not assign(idx, now):
+                    still.append(idx)
+            still.extend(waiting)
+            waiting = still
+
+    wait = out['dispatch_time'] - times
+    names = np.array(tables.stations + ['-'], dtype=object)
+    return pd.DataFrame({
+        'incident': np.arange(1, n + 1), 'time_min': np.round(times, 2),
+        'day': (times // DAY_MINUTES).astype(np.int64) + 1,
+        'slot': [format_slot(int(tables.slot_minutes[k])) for k in slots],
+        'candidate': np.asarray(tables.candidates, dtype=object)[cands],
+        'station': names[out['station']], 'choice_rank': out['choice_rank'],
+        'wait_min': np.round(wait, 2), 'travel_min': np.round(out['travel_min'], 2),
+        'response_min': np.round(wait + out['travel_min'], 2), 'on_scene_min': np.round(scene, 2),
+    }), busy_minutes
+
+
+def summarize(df, tables, busy_minutes, horizon_minutes, units=None):
+    served = df[df['choice_rank'] >= 0]
+    units = np.ones(len(tables.stations)) if units is None else np.asarray(units, dtype=np.float64)
+    summary = {
+        'incidents': len(df), 'served': len(served), 'unreachable': int((df['choice_rank'] < 0).sum()),
+        'mean_response_min': served['response_min'].mean(),
+        'p90_response_min': served['response_min'].quantile(0.9),
+        'max_response_min': served['response_min'].max(),
+        'queued_share': (served['wait_min'] > 0).mean(),
+        'fallback_share': (served['choice_rank'] > 0).mean(),
+    }
+    stations = pd.DataFrame({
+        'station': tables.stations, 'units': units.astype(int),
+        'dispatches': served['station'].value_counts().reindex(tables.stations, fill_value=0).to_numpy(),
+        'utilization': np.round(busy_minutes / (units * horizon_minutes), 4),
+    })
+    return summary, stations
+
+
+# 슬롯 그래프 원본: 컴파일된 스냅샷 (위험도 포함) 또는 스냅샷 CSV 묶음
+def load_time_dependent(config):
+    if config.get("use_graph_snapshot") and os.path.isdir(config.get("graph_snapshot_path") or ""):
+        from snapshot import open_time_dependent
+        return open_time_dependent(config["graph_snapshot_path"])
+    tdg = build_time_dependent_graph(config["snapshot_paths"])
+    tdg.G.set_risk(load_risk_map(config["risk_csv_path"]))
+    return tdg
+
+
+def main():
+    config = config_algorithm()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=float, default=config["dispatch_days"])
+    parser.add_argument('--incidents_per_day', type=float, default=config["dispatch_incidents_per_day"])
+    parser.add_argument('--on_scene', type=float, default=config["dispatch_on_scene_minutes"], help='현장 활동 평균(분)')
+    parser.add_argument('--fixed_on_scene', action='store_true', help='현장 활동 시간을 지수분포 대신 고정값으로')
+    parser.add_argument('--units', type=int, nargs='+', help='소방서별 출동 가능 대수 (config station_nodes 순서)')
+    parser.add_argument('--step', type=int, default=config.get("slot_step_minutes"),
+                        help='슬롯 간격(분), 지정 시 스냅샷 보간 슬롯 사용 (기본: 스냅샷 시각)')
+    parser.add_argument('--seed', type=int, default=config["seed"])
+    parser.add_argument('--output', type=str, default=config["dispatch_output_path"])
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    tdg = load_time_dependent(config)
+    tables = DispatchTables(tdg, config, slot_range(args.step) if args.step else None)
+    t1 = time.perf_counter()
+    print(f"[🗺️ 테이블] 슬롯 {[format_slot(int(m)) for m in tables.slot_minutes]} "
+          f"× 소방서 {len(tables.stations)} × 후보 {len(tables.candidates)}, routing={tables.routing} ({t1 - t0:.1f}s)")
+
+    rng = np.random.default_rng(args.seed)
+    times, cands = poisson_incidents(rng, args.days, args.incidents_per_day, len(tables.candidates))
+    df, busy = run_dispatch(tables, times, cands, args.on_scene, args.units, rng,
+                            "fixed" if args.fixed_on_scene else "exponential")
+    t2 = time.perf_counter()
+
+    summary, stations = summarize(df, tables, busy, args.days * DAY_MINUTES, args.units)
+    print(f"\n=== {args.days:g}일, 사건 {summary['incidents']}건 ({t2 - t1:.2f}s) ===")
+    print(f"평균/90%/최대 대응시간(분): {summary['mean_response_min']:.2f} / {summary['p90_response_min']:.2f} / "
+          f"{summary['max_response_min']:.2f}")
+    print(f"대기 발생 비율: {summary['queued_share']:.2%}, 차순위 소방서 출동 비율: {summary['fallback_share']:.2%}, "
+          f"경로 없음: {summary['unreachable']}건")
+    print(stations.to_string(index=False))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
+    stations_path = os.path.splitext(args.output)[0] + "_stations.csv"
+    stations.to_csv(stations_path, index=False, encoding="utf-8-sig")
+    print(f"\n✅ 결과 저장 완료: {args.output} / {stations_path}")
+
+
+if __name__ == "__main__":
+    main()
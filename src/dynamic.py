@@ -0,0 +1,125 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+
+# ✅ 갱신 목록 → (엣지 번호, 새 소요시간) / DataFrame(u, v, duration) 또는 (u, v, duration) 튜플 목록
+def resolve_updates(G, updates):
+    if not isinstance(updates, pd.DataFrame):
+        updates = pd.DataFrame(list(updates), columns=['u', 'v', 'duration'])
+    u = updates['u'].astype(str).str.strip().map(G.node_index)
+    v = updates['v'].astype(str).str.strip().map(G.node_index)
+    known = u.notna() & v.notna()
+    eids = G.edge_ids(u[known].astype(np.int64), v[known].astype(np.int64))
+    durations = updates.loc[known, 'duration'].to_numpy(dtype=np.float64)
+    hit = eids >= 0
+    return eids[hit], durations[hit]
+
+
+# ✅ 도로 통제: 소요시간 inf 로 갱신
+def closures(edges):
+    return [(u, v, float('inf')) for u, v in edges]
+
+
+def _children(pred):
+    has_parent = np.flatnonzero(pred >= 0)
+    order = has_parent[np.argsort(pred[has_parent], kind='stable')]
+    ptr = np.zeros(len(pred) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pred[has_parent], minlength=len(pred)), out=ptr[1:])
+    return ptr, order
+
+
+# ✅ 최단경로 트리 동적 복구 (증가: 영향 서브트리 재계산 / 감소: 개선 노드부터 전파)
+def repair_tree(G, dist, pred, eids, old_weight, reverse=False, weight_factor=1.0):
+    fptr, fnbr, fw, rptr, rnbr, rw = G.adjacency()
+    # 트리 방향 기준 (tail → head) 와 진입/진출 인접 리스트
+    if reverse:
+        tails, heads, scale = G.dst[eids], G.src[eids], 1.0
+        out_ptr, out_nbr, out_w, in_ptr, in_nbr, in_w = rptr, rnbr, rw, fptr, fnbr, fw
+    else:
+        tails, heads, scale = G.src[eids], G.dst[eids], weight_factor
+        out_ptr, out_nbr, out_w, in_ptr, in_nbr, in_w = fptr, fnbr, fw, rptr, rnbr, rw
+
+    new_weight = G.weight[eids]
+    with np.errstate(invalid='ignore'):
+        grew = (new_weight > old_weight) & (pred[heads] == tails)
+        improved = dist[tails] + new_weight * scale < dist[heads]
+    if not grew.any() and not improved.any():
+        return 0
+
+    # 루프는 파이썬 리스트 위에서 수행 후 배열에 되씀
+    inf = float('inf')
+    dl, pl = dist.tolist(), pred.tolist()
+    pq = []
+
+    # 1. 가중치가 증가한 트리 엣지의 하위 트리를 무효화
+    if grew.any():
+        ptr, order = _children(pred)
+        ptr, order = ptr.tolist(), order.tolist()
+        stack = heads[grew].tolist()
+        affected = []
+        seen = set(stack)
+        while stack:
+            node = stack.pop()
+            affected.append(node)
+            for child in order[ptr[node]:ptr[node + 1]]:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        for v in affected:
+            dl[v], pl[v] = inf, -1
+
+        # 영향받지 않은 진입 이웃으로부터 임시 거리 계산
+        for v in affected:
+            best, best_u = inf, -1
+            for k in range(in_ptr[v], in_ptr[v + 1]):
+                d = dl[in_nbr[k]] + in_w[k] * scale
+                if d < best:
+                    best, best_u = d, in_nbr[k]
+            if best < inf:
+                dl[v], pl[v] = best, best_u
+                heapq.heappush(pq, (best, v))
+
+    # 2. 가중치가 감소한 엣지는 head 를 직접 개선
+    for u, v, w in zip(tails.tolist(), heads.tolist(), (new_weight * scale).tolist()):
+        d = dl[u] + w
+        if d < dl[v]:
+            dl[v], pl[v] = d, u
+            heapq.heappush(pq, (d, v))
+
+    # 3. 개선된 노드부터 다익스트라 방식으로 전파
+    changed = 0
+    while pq:
+        du, u = heapq.heappop(pq)
+        if du > dl[u]:
+            continue
+        changed += 1
+        for k in range(out_ptr[u], out_ptr[u + 1]):
+            v = out_nbr[k]
+            d = du + out_w[k] * scale
+            if d < dl[v]:
+                dl[v], pl[v] = d, u
+                heapq.heappush(pq, (d, v))
+
+    dist[:] = dl
+    pred[:] = pl
+    return changed
+
+
+# ✅ 실시간 소요시간 반영: 그래프 가중치 제자리 갱신 + 캐시된 거리 테이블 탐색 기록 복구
+# tables 는 같은 그래프 G 위에서 만들어지고 지금까지의 갱신을 모두 반영한 상태여야 함 (아니면 ValueError)
+def apply_duration_updates(G, updates, tables=None, verbose=False):
+    if tables is not None:
+        if tables.G is not G:
+            raise ValueError("tables 가 다른 그래프(또는 가중치 뷰)에서 만들어짐 → 같은 G 로 다시 생성 필요")
+        if tables.version != G.version:
+            raise ValueError(f"tables(version {tables.version}) 가 그래프(version {G.version}) 의 "
+                             f"이전 변경을 반영하지 않음 → 다시 생성 필요")
+    eids, durations = resolve_updates(G, updates)
+    if len(eids) == 0:
+        return eids
+    G.update_durations(eids, durations)
+    rerecorded = tables.repair(eids) if tables is not None else 0
+    if verbose:
+        print(f"[🔄 가중치 갱신] 엣지 {len(eids)}개 (version {G.version}, 다시 기록한 탐색 {rerecorded}개)")
+    return eids
@@ -0,0 +1,264 @@
+import copy
+import itertools
+import numpy as np
+import pandas as pd
+
+# 소요시간 구간별 가중 계수 (duration > 하한 이면 계수 적용, 해당 없으면 기본값)
+DURATION_BANDS = ((400, 0.8), (300, 0.1), (200, 0.2), (100, 0.3), (40, 0.4))
+DEFAULT_FACTOR = 0.5
+
+# 가중치 버전 스탬프 (그래프/뷰 전체에서 유일 → 캐시 키로 사용 가능)
+_versions = itertools.count(1)
+
+
+# ✅ compute_factor 벡터화 버전 (스칼라/배열 모두 지원)
+def compute_factor(duration, bands=DURATION_BANDS, default=DEFAULT_FACTOR):
+    duration = np.asarray(duration, dtype=np.float64)
+    conds = [duration > lower for lower, _ in bands]
+    factors = [factor for _, factor in bands]
+    return np.select(conds, factors, default)
+
+
+def compute_weight(duration, bands=DURATION_BANDS, default=DEFAULT_FACTOR):
+    duration = np.asarray(duration, dtype=np.float64)
+    return duration * compute_factor(duration, bands, default)
+
+
+def _csr(keys, n):
+    order = np.argsort(keys, kind='stable').astype(np.int32)
+    counts = np.bincount(keys, minlength=n)
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=ptr[1:])
+    return ptr, order
+
+
+# ✅ 배열 기반 그래프 (노드: int32 인덱스, 정/역방향 CSR 인접 배열)
+class CSRGraph:
+    def __init__(self, node_ids, x, y, src, dst, duration):
+        src = np.asarray(src, dtype=np.int32)
+        dst = np.asarray(dst, dtype=np.int32)
+        n = len(node_ids)
+        # 정방향: src 기준 정렬 / 역방향: dst 기준 정렬 (eid 는 원본 엣지 번호)
+        fwd_ptr, fwd_eid = _csr(src, n)
+        rev_ptr, rev_eid = _csr(dst, n)
+        self._init_arrays(np.asarray(node_ids, dtype=object), x, y, src, dst, duration,
+                          fwd_ptr, fwd_eid, dst[fwd_eid], rev_ptr, rev_eid, src[rev_eid])
+
+    def _init_arrays(self, node_ids, x, y, src, dst, duration,
+                     fwd_ptr, fwd_eid, fwd_nbr, rev_ptr, rev_eid, rev_nbr, risk=None):
+        self.node_ids = node_ids
+        self._node_index = None
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.src, self.dst = src, dst
+        self.duration = np.asarray(duration, dtype=np.float64)
+        self.weight = compute_weight(self.duration)
+        self.fwd_ptr, self.fwd_eid, self.fwd_nbr = fwd_ptr, fwd_eid, fwd_nbr
+        self.rev_ptr, self.rev_eid, self.rev_nbr = rev_ptr, rev_eid, rev_nbr
+
+        self.risk = np.zeros(len(src), dtype=np.float64) if risk is None else risk
+        self.version = next(_versions)
+        self.heuristics = {}
+        self.snapshot_ref = None
+        self._lists = None
+        self._topology = None
+        self._risk_list = None
+        self._edge_keys = None
+        self._edge_pos = None
+
+    # ✅ 이미 계산된 CSR 배열로 바로 생성 (스냅샷 로더용, 재정렬/파싱 없음)
+    @classmethod
+    def from_arrays(cls, node_ids, x, y, src, dst, duration, fwd_ptr, fwd_eid, fwd_nbr,
+                    rev_ptr, rev_eid, rev_nbr, risk=None):
+        G = cls.__new__(cls)
+        G._init_arrays(node_ids, x, y, src, dst, duration, fwd_ptr, fwd_eid, fwd_nbr,
+                       rev_ptr, rev_eid, rev_nbr, risk)
+        return G
+
+    # OSM id → 인덱스 dict 는 처음 조회할 때 생성
+    @property
+    def node_index(self):
+        if self._node_index is None:
+            self._node_index = {str(nid): i for i, nid in enumerate(self.node_ids.tolist())}
+        return self._node_index
+
+    # 워커 프로세스 전달 시 탐색용 리스트 캐시는 제외 (수신 측에서 재생성)
+    # 스냅샷에서 읽은 그대로인 그래프는 (경로, 슬롯)과 버전만 보내고 수신 측에서 mmap 으로 다시 엶
+    # (버전을 유지해야 함께 보낸 DistanceTables 의 버전 검사가 통과)
+    def __getstate__(self):
+        if self.snapshot_ref is not None:
+            return {'snapshot_ref': self.snapshot_ref, 'version': self.version}
+        state = self.__dict__.copy()
+        state['_lists'] = None
+        state['_topology'] = None
+        state['_risk_list'] = None
+        return state
+
+    def __setstate__(self, state):
+        if set(state) == {'snapshot_ref', 'version'}:
+            from snapshot import load_graph_snapshot
+            path, slot = state['snapshot_ref']
+            state = {**load_graph_snapshot(path, slot).__dict__, 'version': state['version']}
+        self.__dict__.update(state)
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    def __contains__(self, node):
+        return node in self.node_index
+
+    def __len__(self):
+        return self.num_nodes
+
+    def index(self, node):
+        return self.node_index[node]
+
+    def node_id(self, i):
+        return str(self.node_ids[i])
+
+    def ids(self, idx_path):
+        node_ids = self.node_ids
+        return [str(node_ids[i]) for i in idx_path]
+
+    def successors(self, i):
+        return self.fwd_nbr[self.fwd_ptr[i]:self.fwd_ptr[i + 1]]
+
+    def predecessors(self, i):
+        return self.rev_nbr[self.rev_ptr[i]:self.rev_ptr[i + 1]]
+
+    def edge_id(self, u, v):
+        lo, hi = self.fwd_ptr[u], self.fwd_ptr[u + 1]
+        hits = np.flatnonzero(self.fwd_nbr[lo:hi] == v)
+        return int(self.fwd_eid[lo + hits[0]]) if len(hits) else -1
+
+    def edge_weight(self, u, v, default=None):
+        eid = self.edge_id(u, v)
+        return default if eid < 0 else float(self.weight[eid])
+
+    # ✅ (u, v) 배열 → 엣지 번호 배열 (없는 엣지는 -1), 정렬된 u*n+v 키에 대한 이진 탐색
+    def edge_ids(self, u, v):
+        keys, order = self.edge_keys()
+        q = np.asarray(u, dtype=np.int64) * self.num_nodes + np.asarray(v, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(keys, q), len(keys) - 1)
+        return np.where(keys[pos] == q, order[pos], -1)
+
+    def edge_keys(self):
+        if self._edge_keys is None:
+            keys = self.src.astype(np.int64) * self.num_nodes + self.dst
+            order = np.argsort(keys, kind='stable')
+            self._edge_keys = (keys[order], order)
+        return self._edge_keys
+
+    def path_edges(self, path):
+        path = np.asarray(path, dtype=np.int64)
+        return self.edge_ids(path[:-1], path[1:])
+
+    # 엣지별 위험도: (u, v) 우선, 없으면 (v, u), 둘 다 없으면 0 (dict 또는 (u, v) MultiIndex Series)
+    # 위험도는 score 탐색 비용에 들어가므로 가중치와 같이 버전을 올림
+    def set_risk(self, risk_map):
+        risk = pd.Series(risk_map, dtype=np.float64) if isinstance(risk_map, dict) else risk_map
+        if len(risk) == 0:
+            self.risk = np.zeros(self.num_edges, dtype=np.float64)
+        else:
+            u, v = self.node_ids[self.src], self.node_ids[self.dst]
+            fwd = risk.reindex(pd.MultiIndex.from_arrays([u, v])).to_numpy(dtype=np.float64)
+            rev = risk.reindex(pd.MultiIndex.from_arrays([v, u])).to_numpy(dtype=np.float64)
+            self.risk = np.where(np.isnan(fwd), np.nan_to_num(rev), fwd)
+        self.version = next(_versions)
+        self.snapshot_ref = None
+        self._risk_list = None
+
+    def set_weights(self, weight):
+        self.weight = np.asarray(weight, dtype=np.float64)
+        self.version = next(_versions)
+        self.snapshot_ref = None
+        self._lists = None
+
+    # ✅ 일부 엣지 소요시간만 갱신 (가중치/탐색 리스트를 제자리 수정, 이전 가중치 반환)
+    def update_durations(self, eids, durations):
+        eids = np.asarray(eids, dtype=np.int64)
+        durations = np.asarray(durations, dtype=np.float64)
+        old = self.weight[eids].copy()
+        new = compute_weight(durations)
+        if not self.duration.flags.writeable:
+            self.duration = self.duration.copy()
+        self.duration[eids] = durations
+        self.weight[eids] = new
+
+        if self._lists is not None:
+            if self._edge_pos is None:
+                self._edge_pos = (np.argsort(self.fwd_eid), np.argsort(self.rev_eid))
+            fwd_pos, rev_pos = self._edge_pos
+            fw, rw = self._lists[2], self._lists[5]
+            for e, w in zip(eids.tolist(), new.tolist()):
+                fw[fwd_pos[e]] = w
+                rw[rev_pos[e]] = w
+
+        self.version = next(_versions)
+        self.snapshot_ref = None
+        return old
+
+    # 위상(CSR 배열)은 공유하고 가중치만 다른 뷰
+    # 위상에서 파생된 캐시(탐색 리스트의 ptr/nbr, 엣지 키)는 원본에서 1회 만들어 모든 뷰가 공유
+    def with_weights(self, weight, duration=None):
+        self.topology_lists()
+        self.edge_keys()
+        view = copy.copy(self)
+        view.heuristics = {}
+        view.duration = self.duration.copy() if duration is None else duration
+        view.set_weights(weight)
+        return view
+
+    # 탐색 루프용 파이썬 리스트 캐시 (numpy 스칼라 인덱싱 비용 회피, 가중치 변경 시 재생성)
+    def adjacency(self):
+        if self._lists is None:
+            fwd_ptr, fwd_nbr, rev_ptr, rev_nbr = self.topology_lists()
+            self._lists = (
+                fwd_ptr, fwd_nbr, self.weight[self.fwd_eid].tolist(),
+                rev_ptr, rev_nbr, self.weight[self.rev_eid].tolist(),
+            )
+        return self._lists
+
+    # 정방향 CSR 순서의 엣지 위험도 리스트 (score 탐색용)
+    def risk_list(self):
+        if self._risk_list is None:
+            self._risk_list = self.risk[self.fwd_eid].tolist()
+        return self._risk_list
+
+    # 가중치와 무관한 ptr/nbr 리스트 (읽기 전용으로만 사용 → 뷰 간 공유)
+    def topology_lists(self):
+        if self._topology is None:
+            self._topology = (self.fwd_ptr.tolist(), self.fwd_nbr.tolist(),
+                              self.rev_ptr.tolist(), self.rev_nbr.tolist())
+        return self._topology
+
+    def node_pos(self):
+        return dict(zip(self.node_ids, zip(self.x.tolist(), self.y.tolist())))
+
+
+def read_edge_csv(path):
+    df = pd.read_csv(path, dtype={'u': str, 'v': str})
+    df['u'] = df['u'].str.strip()
+    df['v'] = df['v'].str.strip()
+    return df
+
+
+# ✅ 엣지 DataFrame → CSRGraph (노드 순서: u 먼저, 이후 v / 중복 (u, v) 는 마지막 행 사용)
+def graph_from_edges(df):
+    df_u = df[['u', 'u_x', 'u_y']].rename(columns={'u': 'node', 'u_x': 'x', 'u_y': 'y'})
+    df_v = df[['v', 'v_x', 'v_y']].rename(columns={'v': 'node', 'v_x': 'x', 'v_y': 'y'})
+    nodes = pd.concat([df_u, df_v]).drop_duplicates('node')
+
+    node_ids = nodes['node'].to_numpy()
+    lookup = pd.Index(node_ids)
+    edges = df.drop_duplicates(['u', 'v'], keep='last')
+    src = lookup.get_indexer(edges['u'])
+    dst = lookup.get_indexer(edges['v'])
+
+    return CSRGraph(node_ids, nodes['x'].to_numpy(), nodes['y'].to_numpy(),
+                    src, dst, edges['duration'].to_numpy())
@@ -0,0 +1,186 @@
+import math
+import random
+import time
+import numpy as np
+
+from tables import dijkstra_tree
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def haversine(x1, y1, x2, y2):
+    la1, la2 = np.radians(y1), np.radians(y2)
+    dlat, dlon = la2 - la1, np.radians(np.asarray(x2) - np.asarray(x1))
+    h = np.sin(dlat / 2) ** 2 + np.cos(la1) * np.cos(la2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(h))
+
+
+# ✅ 좌표 기반 하한: 직선거리 / 최대속도 (최대속도 = 엣지별 직선거리/가중치 최댓값)
+# 가중치 0 엣지(소요시간 0 응답, 0800 기준 134개)는 속도가 무한대라 보정에서 제외
+# → 그 엣지를 지나는 경로에서는 하한이 엣지 길이/최대속도 만큼 과대할 수 있음 (compare_heuristics 불일치율로 확인)
+class GeoHeuristic:
+    name = "geo"
+
+    def __init__(self, G, max_speed=None):
+        if max_speed is None:
+            length = haversine(G.x[G.src], G.y[G.src], G.x[G.dst], G.y[G.dst])
+            pos = (G.weight > 0) & np.isfinite(G.weight)
+            max_speed = float(np.max(length[pos] / G.weight[pos])) if pos.any() else math.inf
+        self.max_speed = max_speed * (1 + 1e-9)
+        self.lat = np.radians(G.y).tolist()
+        self.lon = np.radians(G.x).tolist()
+        self.coslat = np.cos(np.radians(G.y)).tolist()
+        self.version = G.version
+
+    def bound(self, a, b):
+        lat, lon, coslat = self.lat, self.lon, self.coslat
+        h = math.sin((lat[b] - lat[a]) / 2) ** 2 + coslat[a] * coslat[b] * math.sin((lon[b] - lon[a]) / 2) ** 2
+        return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h))) / self.max_speed
+
+    def bounds(self, source, target):
+        return (lambda v: self.bound(v, target)), (lambda v: self.bound(source, v))
+
+
+# ✅ ALT 랜드마크 하한 (삼각부등식): d(a,b) >= d(L,b) - d(L,a), d(a,L) - d(b,L)
+class LandmarkHeuristic:
+    name = "alt"
+
+    def __init__(self, G, num_landmarks=8, seed=0):
+        self.landmarks, dist_from, dist_to = select_landmarks(G, num_landmarks, seed)
+        self.dist_from = np.stack(dist_from)
+        self.dist_to = np.stack(dist_to)
+        # 노드별 (랜드마크 수) 튜플로 전치해 두어 탐색 중 조회 비용을 줄임
+        self._from_T = [tuple(r) for r in self.dist_from.T.tolist()]
+        self._to_T = [tuple(r) for r in self.dist_to.T.tolist()]
+        self.version = G.version
+
+    def bounds(self, source, target):
+        fT, tT = self._from_T, self._to_T
+        # 끝점에서 유한한 랜드마크만 사용 (inf - inf 방지)
+        lt_from = [(i, fT[target][i]) for i in range(len(self.landmarks)) if math.isfinite(fT[target][i])]
+        lt_to = [(i, tT[target][i]) for i in range(len(self.landmarks)) if math.isfinite(tT[target][i])]
+        ls_from = [(i, fT[source][i]) for i in range(len(self.landmarks)) if math.isfinite(fT[source][i])]
+        ls_to = [(i, tT[source][i]) for i in range(len(self.landmarks)) if math.isfinite(tT[source][i])]
+
+        def to_target(v):
+            fv, tv = fT[v], tT[v]
+            best = 0.0
+            for i, d in lt_from:
+                if d - fv[i] > best: best = d - fv[i]
+            for i, d in lt_to:
+                if tv[i] - d > best: best = tv[i] - d
+            return best
+
+        def from_source(v):
+            fv, tv = fT[v], tT[v]
+            best = 0.0
+            for i, d in ls_from:
+                if fv[i] - d > best: best = fv[i] - d
+            for i, d in ls_to:
+                if d - tv[i] > best: best = d - tv[i]
+            return best
+
+        return to_target, from_source
+
+
+# ✅ 최원점(farthest) 방식 랜드마크 선택 (정/역방향 트리를 함께 반환)
+def select_landmarks(G, num_landmarks=8, seed=0):
+    start = random.Random(seed).randrange(G.num_nodes)
+    f, _ = dijkstra_tree(G, start)
+    b, _ = dijkstra_tree(G, start, reverse=True)
+    closeness = f + b
+
+    landmarks, dist_from, dist_to = [], [], []
+    while len(landmarks) < num_landmarks:
+        candidate = np.where(np.isfinite(closeness), closeness, -1)
+        if landmarks:
+            candidate[landmarks] = -1
+        lm = int(np.argmax(candidate))
+        if candidate[lm] < 0:
+            break
+        f, _ = dijkstra_tree(G, lm)
+        b, _ = dijkstra_tree(G, lm, reverse=True)
+        landmarks.append(lm)
+        dist_from.append(f)
+        dist_to.append(b)
+        closeness = f + b if len(landmarks) == 1 else np.minimum(closeness, f + b)
+
+    return landmarks, dist_from, dist_to
+
+
+HEURISTICS = {"geo": GeoHeuristic, "alt": LandmarkHeuristic}
+
+
+# ✅ 그래프에 휴리스틱 보관 (가중치 버전이 바뀌면 재계산)
+def get_heuristic(G, heuristic):
+    if heuristic is None or not isinstance(heuristic, str):
+        return heuristic
+    cache = G.heuristics
+    h = cache.get(heuristic)
+    if h is None or h.version != G.version:
+        h = cache[heuristic] = HEURISTICS[heuristic](G)
+    return h
+
+
+# ✅ 양방향 A* 평균 포텐셜 p(v) = c·(h_t(v) - h_s(v)) / 2, c = min(weight_factor, 1)
+# 정방향(가중치 × weight_factor)/역방향(가중치) 모두에서 일관적 → 정방향 키 +p, 역방향 키 -p 로 대칭 사용
+def make_potential(heuristic, source, target, weight_factor):
+    to_target, from_source = heuristic.bounds(source, target)
+    scale = min(weight_factor, 1.0) / 2
+    memo = {}
+
+    def potential(v):
+        p = memo.get(v)
+        if p is None:
+            p = memo[v] = scale * (to_target(v) - from_source(v))
+        return p
+
+    return potential
+
+
+# ✅ 휴리스틱별 질의당 확정 노드 수 / 질의 시간 / 결과 불일치율 (기준: heuristic=None 양방향 탐색)
+# 만남 노드는 탐색 순서에 따라 정해지므로 목표지향 탐색은 일부 질의에서 다른 만남 노드/비용을 고를 수 있음
+def compare_heuristics(G, pairs, max_time_diff=60, weight_factor=0.692, modes=(None, "geo", "alt")):
+    from algorithm import bidirectional_dijkstra_idx
+
+    report, base = {}, None
+    for mode in modes:
+        h = get_heuristic(G, mode)
+        stats = {"settled": 0}
+        t0 = time.perf_counter()
+        results = [bidirectional_dijkstra_idx(G, s, t, max_time_diff, weight_factor, heuristic=h, stats=stats)
+                   for s, t in pairs]
+        elapsed = time.perf_counter() - t0
+        if base is None:
+            base = results
+        n = max(len(pairs), 1)
+        ratios = [r[1] / b[1] for r, b in zip(results, base)
+                  if math.isfinite(r[1]) and math.isfinite(b[1]) and b[1] > 0]
+        report[mode or "dijkstra"] = {
+            "settled_per_query": stats["settled"] / n,
+            "ms_per_query": elapsed * 1000 / n,
+            "cost_mismatch_rate": sum(r[1] != b[1] for r, b in zip(results, base)) / n,
+            "meeting_mismatch_rate": sum(r[2] != b[2] for r, b in zip(results, base)) / n,
+            "path_mismatch_rate": sum(r[0] != b[0] for r, b in zip(results, base)) / n,
+            # 기준 대비 평균 비용 비율 (< 1 이면 더 싼 만남 노드를 고른 쪽이 많음)
+            "cost_ratio": sum(ratios) / len(ratios) if ratios else math.nan,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    from algorithm import build_graph
+    from config.config import config_algorithm
+
+    config = config_algorithm()
+    G, _, _ = build_graph(config)
+    rng = random.Random(config["seed"])
+    pairs = [(rng.randrange(G.num_nodes), rng.randrange(G.num_nodes)) for _ in range(500)]
+
+    report = compare_heuristics(G, pairs, config["max_time_diff"], config["weight_factor"])
+    base = report["dijkstra"]["settled_per_query"]
+    for mode, r in report.items():
+        print(f"{mode:>8}: 확정 노드 {r['settled_per_query']:.1f}/질의 "
+              f"({r['settled_per_query'] / base * 100:.1f}%), {r['ms_per_query']:.3f} ms/질의, "
+              f"비용 불일치 {r['cost_mismatch_rate']:.1%}, 만남 노드 불일치 {r['meeting_mismatch_rate']:.1%}, "
+              f"경로 불일치 {r['path_mismatch_rate']:.1%}, 평균 비용 비율 {r['cost_ratio']:.3f}")
@@ -0,0 +1,131 @@
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+
+# 계측 스위치 (꺼져 있으면 호출 측에서 시간 측정/기록 자체를 건너뜀)
+enabled = False
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_timers = defaultdict(lambda: [0, 0.0])
+_histograms = defaultdict(lambda: defaultdict(int))
+
+
+def enable(on=True):
+    global enabled
+    enabled = bool(on)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+        _histograms.clear()
+
+
+def count(name, value=1):
+    with _lock:
+        _counters[name] += value
+
+
+def add_time(name, seconds):
+    with _lock:
+        t = _timers[name]
+        t[0] += 1
+        t[1] += seconds
+
+
+# 지연시간 히스토그램: log2(ms) 구간 (..., 1ms, 2ms, 4ms, ...)
+def _bucket(seconds):
+    ms = seconds * 1000
+    return math.ceil(math.log2(ms)) if ms > 0 else -20
+
+
+def observe(name, seconds):
+    with _lock:
+        _histograms[name][_bucket(seconds)] += 1
+
+
+# ✅ 양방향 탐색 1회 결과 기록
+def record_search(settled, pops, pushes, termination):
+    with _lock:
+        _counters["dijkstra.queries"] += 1
+        _counters["dijkstra.settled"] += settled
+        _counters["dijkstra.heap_pops"] += pops
+        _counters["dijkstra.heap_pushes"] += pushes
+        _counters["dijkstra.stale_pops"] += pops - settled
+        _counters[f"dijkstra.termination.{termination}"] += 1
+
+
+# ✅ 워커 프로세스 간 전달용 스냅샷 / 병합
+def snapshot():
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "timers": {k: list(v) for k, v in _timers.items()},
+            "histograms": {k: dict(v) for k, v in _histograms.items()},
+        }
+
+
+def merge(snap):
+    with _lock:
+        for k, v in snap["counters"].items():
+            _counters[k] += v
+        for k, (n, total) in snap["timers"].items():
+            _timers[k][0] += n
+            _timers[k][1] += total
+        for k, buckets in snap["histograms"].items():
+            for b, n in buckets.items():
+                _histograms[k][b] += n
+
+
+def _quantile(buckets, q):
+    total = sum(buckets.values())
+    acc = 0
+    for b in sorted(buckets):
+        acc += buckets[b]
+        if acc >= q * total:
+            return 2.0 ** b
+    return None
+
+
+# ✅ 구조화된 계측 보고서
+def report():
+    snap = snapshot()
+    timers = {
+        k: {"count": n, "total_s": round(total, 6), "mean_ms": round(total / n * 1000, 4) if n else None}
+        for k, (n, total) in sorted(snap["timers"].items())
+    }
+    histograms = {}
+    for k, buckets in sorted(snap["histograms"].items()):
+        histograms[k] = {
+            "count": sum(buckets.values()),
+            "buckets_ms": {f"<={2.0 ** b:g}": n for b, n in sorted(buckets.items())},
+            "p50_ms": _quantile(buckets, 0.5), "p90_ms": _quantile(buckets, 0.9), "p99_ms": _quantile(buckets, 0.99),
+        }
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "counters": dict(sorted(snap["counters"].items())),
+        "timers": timers,
+        "histograms": histograms,
+    }
+
+
+def export(path):
+    data = report()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return data
+
+
+def print_report(data=None):
+    data = data or report()
+    print("\n=== 계측 보고서 ===")
+    for k, v in data["timers"].items():
+        print(f"[⏱️ {k}] {v['count']}회, 합계 {v['total_s']:.3f}s, 평균 {v['mean_ms']} ms")
+    for k, v in data["counters"].items():
+        print(f"[🔢 {k}] {v:g}")
+    for k, v in data["histograms"].items():
+        print(f"[📊 {k}] {v['count']}회, p50≤{v['p50_ms']}ms, p90≤{v['p90_ms']}ms, p99≤{v['p99_ms']}ms")
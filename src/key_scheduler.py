@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# 기본값: 키당 초당 요청 수 / 버스트 / 일일 할당량 / 429 백오프 (Retry-After 없을 때)
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 5.0
+DEFAULT_DAILY_QUOTA = 10000
+BACKOFF_MIN = 5.0
+BACKOFF_MAX = 300.0
+
+
+def parse_retry_after(value, now=None):
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - (now or time.time()))
+    except (TypeError, ValueError):
+        return None
+
+
+class _KeyState:
+    __slots__ = ("tokens", "updated", "day", "used_today", "blocked_until", "backoff",
+                 "requests", "successes", "failures", "rate_limited", "waited")
+
+    def __init__(self, burst, now):
+        self.tokens = burst
+        self.updated = now
+        self.day = time.strftime("%Y-%m-%d")
+        self.used_today = 0
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self.requests = self.successes = self.failures = self.rate_limited = 0
+        self.waited = 0.0
+
+
+# ✅ 키별 토큰 버킷 스케줄러 (스레드/asyncio 공용, 일일 할당량 인지, 429/Retry-After 적응형 백오프)
+class KeyScheduler:
+    def __init__(self, api_keys, rate=DEFAULT_RATE, burst=DEFAULT_BURST, daily_quota=DEFAULT_DAILY_QUOTA,
+                 backoff_min=BACKOFF_MIN, backoff_max=BACKOFF_MAX):
+        self.api_keys = list(api_keys)
+        self.rate, self.burst, self.daily_quota = rate, burst, daily_quota
+        self.backoff_min, self.backoff_max = backoff_min, backoff_max
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._keys = [_KeyState(burst, now) for _ in self.api_keys]
+
+    def __len__(self):
+        return len(self.api_keys)
+
+    def _refill(self, k, now):
+        k.tokens = min(self.burst, k.tokens + (now - k.updated) * self.rate)
+        k.updated = now
+        today = time.strftime("%Y-%m-%d")
+        if k.day != today:
+            k.day, k.used_today = today, 0
+
+    # 사용 가능한 키 (인덱스, 0) 또는 (None, 대기 초), 모든 키가 일일 할당량을 소진하면 (None, None)
+    def _try_acquire(self, prefer=0):
+        now = time.monotonic()
+        n = len(self._keys)
+        best, best_rank, wait = None, None, None
+        with self._lock:
+            for i, k in enumerate(self._keys):
+                self._refill(k, now)
+                remaining = self.daily_quota - k.used_today
+                if remaining <= 0:
+                    continue
+                ready = max(k.blocked_until - now, (1 - k.tokens) / self.rate if k.tokens < 1 else 0.0)
+                if ready > 0:
+                    wait = ready if wait is None else min(wait, ready)
+                    continue
+                # 남은 예산이 가장 많은 키, 동률이면 prefer 부터 순환 순서
+                rank = (k.tokens, remaining, -((i - prefer) % n))
+                if best_rank is None or rank > best_rank:
+                    best, best_rank = i, rank
+            if best is None:
+                return None, wait
+            k = self._keys[best]
+            k.tokens -= 1
+            k.used_today += 1
+            k.requests += 1
+            return best, 0.0
+
+    def acquire(self, prefer=0):
+        t0 = time.monotonic()
+        while True:
+            idx, wait = self._try_acquire(prefer)
+            if idx is not None:
+                self._add_wait(idx, time.monotonic() - t0)
+                return idx
+            if wait is None:
+                return None
+            time.sleep(wait)
+
+    async def acquire_async(self, prefer=0):
+        t0 = time.monotonic()
+        while True:
+            idx, wait = self._try_acquire(prefer)
+            if idx is not None:
+                self._add_wait(idx, time.monotonic() - t0)
+                return idx
+            if wait is None:
+                return None
+            await asyncio.sleep(wait)
+
+    def _add_wait(self, idx, seconds):
+        with self._lock:
+            self._keys[idx].waited += seconds
+
+    # ✅ 응답 결과 반영: 성공 시 백오프 초기화, 429 시 Retry-After 또는 지수 백오프만큼 차단
+    def report(self, idx, status, retry_after=None):
+        with self._lock:
+            k = self._keys[idx]
+            if status == 200:
+                k.successes += 1
+                k.backoff = 0.0
+                return None
+            k.failures += 1
+            if status != 429:
+                return None
+            k.rate_limited += 1
+            k.backoff = min(self.backoff_max, max(self.backoff_min, k.backoff * 2))
+            delay = parse_retry_after(retry_after)
+            delay = k.backoff if delay is None else delay
+            k.blocked_until = time.monotonic() + delay
+            k.tokens = 0.0
+            return delay
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "key": f"API-{i + 1}", "requests": k.requests, "successes": k.successes,
+                "failures": k.failures, "rate_limited": k.rate_limited,
+                "used_today": k.used_today, "remaining_today": max(0, self.daily_quota - k.used_today),
+                "blocked_s": round(max(0.0, k.blocked_until - now), 3), "waited_s": round(k.waited, 3),
+            } for i, k in enumerate(self._keys)]
+
+
+def scheduler_from_config(api_keys, cfg):
+    return KeyScheduler(api_keys, rate=cfg.get("KEY_RATE_PER_SEC", DEFAULT_RATE),
+                        burst=cfg.get("KEY_BURST", DEFAULT_BURST),
+                        daily_quota=cfg.get("KEY_DAILY_QUOTA", DEFAULT_DAILY_QUOTA))
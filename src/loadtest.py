@@ -0,0 +1,118 @@
+import argparse
+import contextlib
+import io
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+import api_connect
+import instrument
+from key_scheduler import KeyScheduler
+from mock_server import add_server_args, server_from_args
+
+## 실행 방법 (로컬 카카오 서버 대상 처리량 측정, 실제 키/할당량 사용 안 함)
+#python loadtest.py --edges 2000 --workers 5 10 20 50 --keys 5 --rate_limit 10
+#python loadtest.py --edges_csv ../data/edges.csv --workers 10 50 --async --error_rate 0.02
+
+SEOUL_CENTER = (126.95, 37.555)
+
+
+def synthetic_edges(n, seed=0):
+    rng = np.random.default_rng(seed)
+    u_x = SEOUL_CENTER[0] + rng.uniform(-0.05, 0.05, n)
+    u_y = SEOUL_CENTER[1] + rng.uniform(-0.04, 0.04, n)
+    return pd.DataFrame({
+        'u': np.arange(n).astype(str), 'v': np.arange(1, n + 1).astype(str),
+        'u_x': u_x, 'u_y': u_y,
+        'v_x': u_x + rng.uniform(-0.002, 0.002, n), 'v_y': u_y + rng.uniform(-0.002, 0.002, n),
+    })
+
+
+def _quantile_ms(values, q):
+    return round(float(np.quantile(values, q)) * 1000, 2) if len(values) else None
+
+
+# ✅ 작업자 수 1개 설정에 대한 측정 (HTTP 요청별 지연은 requests 세션 응답 훅 → 스레드 모드만,
+# 엣지별 지연(재시도/키 대기 포함)은 계측 히스토그램 log2 구간)
+def run_once(server, edges, api_keys, workers, args):
+    server.reset_stats()
+    server.reset_limits()
+    instrument.reset()
+    api_connect._scheduler = KeyScheduler(api_keys, rate=args.key_rate, burst=args.key_burst,
+                                          daily_quota=args.key_quota)
+    api_connect._session = None
+    session = api_connect.get_session(workers)
+    latencies = []
+    session.hooks['response'].append(lambda r, *a, **k: latencies.append(r.elapsed.total_seconds()))
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if args.use_async:
+            success, fail = api_connect.process_edges_async(edges, api_keys, 'future', args.departure_time,
+                                                            concurrency=workers, retries=args.retries)
+        else:
+            success, fail = api_connect.process_edges_parallel(edges, api_keys, 'future', args.departure_time,
+                                                               max_workers=workers, retries=args.retries)
+    elapsed = time.perf_counter() - t0
+
+    served = server.snapshot()
+    requests_sent = sum(sum(v.values()) for v in served.values())
+    rate_limited = sum(v.get("429", 0) for v in served.values())
+    key_stats = api_connect._scheduler.stats()
+    capacity = server.rate_limit * len(api_keys) * elapsed
+    edge_hist = instrument.report()["histograms"].get("api.future.success", {})
+    return {
+        "mode": "async" if args.use_async else "threads", "workers": workers, "edges": len(edges),
+        "succeeded": len(success), "failed": len(fail), "seconds": round(elapsed, 3),
+        "edges_per_sec": round(len(success) / elapsed, 2), "requests": requests_sent,
+        "requests_per_sec": round(requests_sent / elapsed, 2), "rate_limited": rate_limited,
+        "http_p50_ms": _quantile_ms(latencies, 0.5), "http_p99_ms": _quantile_ms(latencies, 0.99),
+        "edge_p50_ms": edge_hist.get("p50_ms"), "edge_p99_ms": edge_hist.get("p99_ms"),
+        # 할당량 활용률: 서버 허용량(키 수 × 키당 초당 한도 × 경과 시간) 대비 실제 수락 요청 (초기 버스트로 1 초과 가능)
+        "quota_utilization": round((requests_sent - rate_limited) / capacity, 4) if capacity else None,
+        "client_wait_s": round(sum(k["waited_s"] for k in key_stats), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--edges', type=int, default=1000, help='합성 엣지 수')
+    parser.add_argument('--edges_csv', type=str, help='실제 엣지 CSV (u, v, u_x, u_y, v_x, v_y)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[5, 10, 20, 50])
+    parser.add_argument('--keys', type=int, default=5)
+    parser.add_argument('--key_rate', type=float, default=10.0, help='클라이언트 스케줄러 키당 초당 요청 수')
+    parser.add_argument('--key_burst', type=float, default=10.0)
+    parser.add_argument('--key_quota', type=int, default=10 ** 9)
+    parser.add_argument('--retries', type=int, default=1)
+    parser.add_argument('--departure_time', type=str, default="202505280800")
+    parser.add_argument('--async', dest='use_async', action='store_true')
+    parser.add_argument('--output', type=str, help='결과 JSON 경로')
+    add_server_args(parser)
+    args = parser.parse_args()
+
+    edges = pd.read_csv(args.edges_csv).iloc[:args.edges] if args.edges_csv else synthetic_edges(args.edges)
+    api_keys = [f"mock-key-{i}" for i in range(args.keys)]
+    instrument.enable()
+
+    rows = []
+    with server_from_args(args) as server:
+        api_connect.BASE_URL = server.url
+        print(f"로컬 서버 {server.url} / 엣지 {len(edges)}, 키 {len(api_keys)}개, 키당 {args.rate_limit} req/s")
+        for workers in args.workers:
+            row = run_once(server, edges, api_keys, workers, args)
+            rows.append(row)
+            print(f"  workers={workers:<4} {row['requests_per_sec']:>8.1f} req/s  {row['edges_per_sec']:>8.1f} edges/s  "
+                  f"HTTP p50/p99 {row['http_p50_ms'] or '-'}/{row['http_p99_ms'] or '-'} ms  "
+                  f"엣지 p50/p99 ≤{row['edge_p50_ms']}/{row['edge_p99_ms']} ms  429 {row['rate_limited']}  "
+                  f"실패 {row['failed']}  할당량 {row['quota_utilization']:.0%}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": rows}, f, ensure_ascii=False, indent=2)
+        print(f"📁 저장 완료 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+## 실행 방법 (카카오 길찾기 API 로컬 대체 서버, API 키/네트워크 불필요)
+#python mock_server.py --port 8080 --latency_ms 80 --rate_limit 10 --error_rate 0.01
+## api_connect 를 로컬 서버로: config_api()["KAKAO_BASE_URL"] = "http://127.0.0.1:8080"
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def _distance_m(x1, y1, x2, y2):
+    la1, la2 = math.radians(y1), math.radians(y2)
+    h = math.sin((la2 - la1) / 2) ** 2 + math.cos(la1) * math.cos(la2) * math.sin(math.radians(x2 - x1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
+
+
+# 출퇴근 시간대 혼잡 계수 (출발 시각이 없으면 1.0)
+def _congestion(departure_time):
+    if not departure_time:
+        return 1.0
+    hour = int(str(departure_time)[-4:-2])
+    return 1.6 if hour in (7, 8, 9, 17, 18, 19) else 0.8 if hour < 6 else 1.0
+
+
+# ✅ 좌표/출발 시각으로 결정되는 소요시간 (같은 요청이면 항상 같은 값)
+def mock_duration(origin, destination, departure_time=None, speed_mps=8.0):
+    digest = hashlib.blake2b(f"{origin}|{destination}|{departure_time}".encode(), digest_size=4).digest()
+    jitter = 0.85 + 0.3 * int.from_bytes(digest, "big") / 0xFFFFFFFF
+    dist = _distance_m(*origin, *destination)
+    return max(1, round(dist / speed_mps * _congestion(departure_time) * jitter))
+
+
+def _coords(value):
+    parts = value.split(",")
+    return float(parts[0]), float(parts[1])
+
+
+class _Limiter:
+    def __init__(self, rate, burst, daily_quota):
+        self.rate, self.burst, self.daily_quota = rate, burst, daily_quota
+        self.tokens, self.updated, self.used = burst, time.monotonic(), 0
+
+    # 허용이면 None, 거부면 Retry-After 초
+    def check(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.daily_quota is not None and self.used >= self.daily_quota:
+            return 3600
+        if self.tokens < 1:
+            return max(1, math.ceil((1 - self.tokens) / self.rate))
+        self.tokens -= 1
+        self.used += 1
+        return None
+
+
+# ✅ 로컬 카카오 길찾기 서버 (/v1/directions, /v1/future/directions)
+# 지연: 로그정규분포 (중앙값 latency_ms, 분산 latency_sigma), 키별 토큰 버킷 429, 오류 주입
+class MockKakaoServer:
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=50.0, latency_sigma=0.5, rate_limit=10.0,
+                 burst=None, daily_quota=None, error_rate=0.0, empty_rate=0.0, seed=0):
+        self.latency_ms, self.latency_sigma = latency_ms, latency_sigma
+        self.rate_limit, self.burst, self.daily_quota = rate_limit, burst or rate_limit, daily_quota
+        self.error_rate, self.empty_rate = error_rate, empty_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._limiters = {}
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = defaultdict(lambda: defaultdict(int))
+
+    def reset_limits(self):
+        with self._lock:
+            self._limiters = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {k: dict(v) for k, v in self.stats.items()}
+
+    def _decide(self, key):
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = _Limiter(self.rate_limit, self.burst, self.daily_quota)
+            retry_after = limiter.check()
+            roll = self._rng.random()
+            delay = self._rng.lognormvariate(math.log(max(self.latency_ms, 1e-3) / 1000), self.latency_sigma) \
+                if self.latency_ms > 0 else 0.0
+        if retry_after is not None:
+            return 429, retry_after, 0.0
+        if roll < self.error_rate:
+            return 500, None, delay
+        if roll < self.error_rate + self.empty_rate:
+            return "empty", None, delay
+        return 200, None, delay
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=None, headers=()):
+                data = json.dumps(body or {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in headers:
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == "/stats":
+                    return self._send(200, server.snapshot())
+                if parsed.path not in ("/v1/directions", "/v1/future/directions"):
+                    return self._send(404, {"msg": "not found"})
+
+                auth = self.headers.get("Authorization", "")
+                if not auth.startswith("KakaoAK "):
+                    return self._send(401, {"msg": "unauthorized"})
+                key = auth[len("KakaoAK "):]
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                future = parsed.path == "/v1/future/directions"
+                if future and "departure_time" not in query:
+                    return self._send(400, {"msg": "departure_time required"})
+
+                status, retry_after, delay = server._decide(key)
+                with server._lock:
+                    server.stats[key][str(status)] += 1
+                time.sleep(delay)
+                if status == 429:
+                    return self._send(429, {"msg": "rate limited"}, [("Retry-After", str(retry_after))])
+                if status == 500:
+                    return self._send(500, {"msg": "injected error"})
+                if status == "empty":
+                    return self._send(200, {"routes": [{"result_code": 104, "result_msg": "no route"}]})
+
+                origin, destination = _coords(query["origin"]), _coords(query["destination"])
+                duration = mock_duration(origin, destination, query.get("departure_time") if future else None)
+                self._send(200, {"routes": [{"result_code": 0, "summary": {"duration": duration},
+                                             "sections": [{"duration": duration}]}]})
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_server_args(parser):
+    parser.add_argument('--latency_ms', type=float, default=50.0, help='응답 지연 중앙값(ms)')
+    parser.add_argument('--latency_sigma', type=float, default=0.5, help='로그정규 지연 분산')
+    parser.add_argument('--rate_limit', type=float, default=10.0, help='키당 초당 허용 요청 수')
+    parser.add_argument('--burst', type=float, default=None)
+    parser.add_argument('--daily_quota', type=int, default=None)
+    parser.add_argument('--error_rate', type=float, default=0.0, help='500 응답 비율')
+    parser.add_argument('--empty_rate', type=float, default=0.0, help='경로 없음 응답 비율')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def server_from_args(args, host="127.0.0.1", port=0):
+    return MockKakaoServer(host, port, args.latency_ms, args.latency_sigma, args.rate_limit, args.burst,
+                           args.daily_quota, args.error_rate, args.empty_rate, args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', type=str, default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8080)
+    add_server_args(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.host, args.port)
+    print(f"✅ 로컬 카카오 서버 실행 중 → {server.url} (통계: {server.url}/stats)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,147 @@
+import math
+from collections import defaultdict
+
+import pandas as pd
+
+METRICS = ['forward_time', 'backward_time', 'total_cost', 'total_risk', 'total_score', 'total_time_min', 'path_length']
+Z_SCORES = {0.9: 1.6449, 0.95: 1.96, 0.99: 2.5758}
+
+# 분위수 근사용 로그 구간 (구간 폭 2% → 상대 오차 ≈ 1%), 0 이하 값은 한 구간
+BIN_RATIO = 1.02
+_LOG_RATIO = math.log(BIN_RATIO)
+_ZERO_BIN = -(10 ** 9)
+
+
+def _bin(x):
+    return math.floor(math.log(x) / _LOG_RATIO) if x > 0 else _ZERO_BIN
+
+
+# ✅ 가중 Welford 누적기 (평균/분산/최소/최대) + 로그 구간 히스토그램 분위수, 행을 보관하지 않음
+class RunningStats:
+    __slots__ = ('n', 'weight', 'mean', 'm2', 'min', 'max', 'bins')
+
+    def __init__(self):
+        self.n, self.weight, self.mean, self.m2 = 0, 0.0, 0.0, 0.0
+        self.min, self.max = math.inf, -math.inf
+        self.bins = defaultdict(float)
+
+    def add(self, x, w=1.0):
+        x = float(x)
+        self.n += 1
+        self.weight += w
+        delta = x - self.mean
+        self.mean += delta * w / self.weight
+        self.m2 += w * delta * (x - self.mean)
+        self.min, self.max = min(self.min, x), max(self.max, x)
+        self.bins[_bin(x)] += w
+
+    # 병렬 워커 결과 병합 (Chan 결합식)
+    def merge(self, other):
+        if other.weight == 0:
+            return self
+        total = self.weight + other.weight
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.weight * other.weight / total
+        self.mean += delta * other.weight / total
+        self.n += other.n
+        self.weight = total
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        for b, w in other.bins.items():
+            self.bins[b] += w
+        return self
+
+    # ddof=1: 표본 분산 (가중치 1 이면 m2 / (n - 1)), ddof=0: 가중 모분산
+    def variance(self, ddof=1):
+        if self.n <= ddof or self.weight == 0:
+            return math.nan
+        return self.m2 / self.weight * self.n / (self.n - ddof)
+
+    def std(self, ddof=1):
+        return math.sqrt(self.variance(ddof))
+
+    # 평균의 신뢰구간 반폭 (정규 근사)
+    def ci_halfwidth(self, confidence=0.95):
+        if self.n < 2:
+            return math.inf
+        return Z_SCORES.get(confidence, 1.96) * math.sqrt(self.variance() / self.n)
+
+    def quantile(self, q):
+        if self.weight == 0:
+            return math.nan
+        acc, target = 0.0, q * self.weight
+        for b in sorted(self.bins):
+            acc += self.bins[b]
+            if acc >= target - 1e-12:
+                value = 0.0 if b == _ZERO_BIN else BIN_RATIO ** (b + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+# ✅ 시행 결과 누적: 지표별 전체 통계 + 선택된 소방서별 통계/비율
+# exact=True 이면 (후보 전수 평가, 가중치 = 추출 확률) 평균이 정확한 기대값 → 신뢰구간 0
+class TrialStats:
+    def __init__(self, metrics=METRICS, confidence=0.95, exact=False):
+        self.metrics = list(metrics)
+        self.confidence = confidence
+        self.exact = exact
+        self.overall = {m: RunningStats() for m in self.metrics}
+        self.stations = defaultdict(lambda: {m: RunningStats() for m in self.metrics})
+
+    @property
+    def n(self):
+        return self.overall[self.metrics[0]].n
+
+    def add(self, result, weight=1.0):
+        by_station = self.stations[result['station']]
+        for m in self.metrics:
+            self.overall[m].add(result[m], weight)
+            by_station[m].add(result[m], weight)
+
+    def merge(self, other):
+        for m in self.metrics:
+            self.overall[m].merge(other.overall[m])
+        for name, stats in other.stations.items():
+            for m in self.metrics:
+                self.stations[name][m].merge(stats[m])
+        return self
+
+    def ci_halfwidth(self, metric):
+        return 0.0 if self.exact else self.overall[metric].ci_halfwidth(self.confidence)
+
+    # 목표 지표 모두 신뢰구간 반폭 ≤ 목표 (relative=True 이면 평균 대비 비율)
+    def converged(self, targets, relative=True):
+        for metric, target in targets.items():
+            stats = self.overall[metric]
+            limit = target * abs(stats.mean) if relative else target
+            if not self.ci_halfwidth(metric) <= limit:
+                return False
+        return True
+
+    def _rows(self, scope, stats, share):
+        ddof = 0 if self.exact else 1
+        for m in self.metrics:
+            s = stats[m]
+            yield {
+                'scope': scope, 'metric': m, 'n': s.n, 'share': round(share, 4),
+                'mean': s.mean, 'std': s.std(ddof) if s.n > ddof else math.nan,
+                'ci_halfwidth': self.ci_halfwidth(m) if scope == 'all' else
+                (0.0 if self.exact else s.ci_halfwidth(self.confidence)),
+                'p50': s.quantile(0.5), 'p90': s.quantile(0.9), 'min': s.min, 'max': s.max,
+            }
+
+    # 요약 테이블: scope = 'all' 또는 소방서 이름, 지표별 1행
+    def summary(self):
+        total = self.overall[self.metrics[0]].weight
+        rows = list(self._rows('all', self.overall, 1.0))
+        for name in sorted(self.stations, key=lambda k: -self.stations[k][self.metrics[0]].weight):
+            stats = self.stations[name]
+            rows += self._rows(name, stats, stats[self.metrics[0]].weight / total if total else 0.0)
+        return pd.DataFrame(rows)
+
+
+# ✅ 전수 모드: 후보 목록에서 균등 추출할 때의 후보별 확률 (중복 후보는 합산)
+def candidate_weights(candidates):
+    counts = defaultdict(int)
+    for c in candidates:
+        counts[c] += 1
+    return [(c, n / len(candidates)) for c, n in counts.items()]
@@ -0,0 +1,55 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import instrument
+from algorithm import run_trial
+
+# 워커별 공유 상태 (initializer 에서 프로세스당 한 번만 전달)
+_worker = {}
+
+
+def _init_worker(config, G, node_pos, risk_map, tables):
+    _worker.update(config=config, G=G, node_pos=node_pos, risk_map=risk_map, tables=tables)
+    instrument.enable(config.get("instrument", False))
+
+
+# 청크 결과와 함께 워커 계측값을 넘기고 초기화 (부모에서 병합)
+def _run_chunk(trials):
+    w = _worker
+    results = [run_trial(w["config"], w["G"], w["node_pos"], w["risk_map"], t, w["tables"])
+               for t in trials]
+    snap = None
+    if instrument.enabled:
+        snap = instrument.snapshot()
+        instrument.reset()
+    return results, snap
+
+
+def _chunks(trials, size):
+    it = iter(trials)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+# ✅ 시행을 청크 단위로 나눠 병렬 실행 (결과는 시행 순서대로 반환)
+# 제출은 워커 수 × 2 청크까지만 앞서 나감 → 호출 측이 중간에 멈추면(close) 남은 청크는 취소
+def run_trials_parallel(config, G, node_pos, risk_map, trials, tables=None, workers=None, chunk_size=None):
+    workers = workers or os.cpu_count()
+    chunk_size = chunk_size or max(1, len(trials) // (workers * 4))
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(config, G, node_pos, risk_map, tables))
+    try:
+        chunks = _chunks(trials, chunk_size)
+        pending = deque(executor.submit(_run_chunk, c) for c in itertools.islice(chunks, workers * 2))
+        while pending:
+            chunk, snap = pending.popleft().result()
+            for c in itertools.islice(chunks, 1):
+                pending.append(executor.submit(_run_chunk, c))
+            if snap:
+                instrument.merge(snap)
+            yield from chunk
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,209 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+## 실행 방법 (열 단위 결과 저장소 → 기존 CSV 형식으로 내보내기)
+#python result_store.py --input ../data/results --output ../data/50times_gowork_bestonly.csv
+
+FORMAT = "isecd-results"
+FORMAT_VERSION = 1
+PATH_SEP = " → "
+
+# run_trial 결과 열 순서 (CSV 내보내기도 같은 순서)
+COLUMNS = ['trial', 'station', 'u', 'v', 'meeting_node', 'u_x', 'u_y', 'v_x', 'v_y',
+           'forward_time', 'backward_time', 'total_cost', 'total_risk', 'total_score', 'total_time_min',
+           'path_length', 'forward_path', 'backward_path']
+FLOAT_COLUMNS = ['u_x', 'u_y', 'v_x', 'v_y', 'forward_time', 'backward_time', 'total_cost', 'total_risk',
+                 'total_score', 'total_time_min']
+NODE_COLUMNS = ['u', 'v', 'meeting_node']
+PATH_COLUMNS = ['forward_path', 'backward_path']
+
+
+# ✅ 청크 단위 열 저장소: 디렉터리 = header.json + chunk_*.npz (열별 배열) + nodes_*.npy + paths_*.npz
+# 노드는 처음 등장 순서로 정수 번호를 붙이고(intern), 경로는 노드 번호 배열을 경로 테이블에 1회만 저장 후 번호로 참조
+# 청크/테이블 추가분은 flush 마다 새 파일로 기록 → 메모리 = 현재 청크 + 고유 노드/경로 사전
+class ResultWriter:
+    def __init__(self, path, G, stations, weighted=False, chunk_rows=10000):
+        self.path, self.G = path, G
+        self.stations = list(stations)
+        self.station_code = {name: i for i, name in enumerate(self.stations)}
+        self.weighted = weighted
+        self.chunk_rows = chunk_rows
+        self.node_ref, self.path_ref = {}, {}
+        self.new_nodes, self.new_paths = [], []
+        self.rows = defaultdict(list)
+        self.num_rows, self.num_chunks = 0, 0
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+    def _node(self, i):
+        ref = self.node_ref.get(i)
+        if ref is None:
+            ref = self.node_ref[i] = len(self.node_ref)
+            self.new_nodes.append(self.G.node_id(i))
+        return ref
+
+    def _path(self, path):
+        key = tuple(path)
+        ref = self.path_ref.get(key)
+        if ref is None:
+            ref = self.path_ref[key] = len(self.path_ref)
+            self.new_paths.append([self._node(i) for i in key])
+        return ref
+
+    # result: config["result_format"] == "columnar" 일 때의 run_trial 결과 (만남 노드/경로가 그래프 인덱스, u/v 는 노드 ID)
+    def append(self, result):
+        rows = self.rows
+        rows['trial'].append(result['trial'])
+        rows['station'].append(self.station_code[result['station']])
+        rows['u'].append(self._node(self.G.index(result['u'])))
+        rows['v'].append(self._node(self.G.index(result['v'])))
+        rows['meeting_node'].append(self._node(result['meeting_node']))
+        for c in FLOAT_COLUMNS:
+            rows[c].append(result[c])
+        rows['path_length'].append(result['path_length'])
+        for c in PATH_COLUMNS:
+            rows[c].append(self._path(result[c]))
+        if self.weighted:
+            rows['weight'].append(result.get('weight', 1.0))
+        if len(rows['trial']) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        n = len(self.rows['trial'])
+        if n == 0 and not self.new_nodes and not self.new_paths:
+            return
+        k = self.num_chunks
+        arrays = {
+            'trial': np.asarray(self.rows['trial'], dtype=np.int64),
+            'station': np.asarray(self.rows['station'], dtype=np.int16),
+            'path_length': np.asarray(self.rows['path_length'], dtype=np.int32),
+            **{c: np.asarray(self.rows[c], dtype=np.int32) for c in NODE_COLUMNS + PATH_COLUMNS},
+            **{c: np.asarray(self.rows[c], dtype=np.float64) for c in FLOAT_COLUMNS},
+        }
+        if self.weighted:
+            arrays['weight'] = np.asarray(self.rows['weight'], dtype=np.float64)
+        np.savez_compressed(os.path.join(self.path, f"chunk_{k:05d}.npz"), **arrays)
+
+        np.save(os.path.join(self.path, f"nodes_{k:05d}.npy"), np.asarray(self.new_nodes, dtype=str))
+        lengths = np.fromiter((len(p) for p in self.new_paths), dtype=np.int64, count=len(self.new_paths))
+        flat = np.fromiter((i for p in self.new_paths for i in p), dtype=np.int32, count=int(lengths.sum()))
+        np.savez_compressed(os.path.join(self.path, f"paths_{k:05d}.npz"),
+                            offsets=np.concatenate([[0], np.cumsum(lengths)]), nodes=flat)
+
+        self.num_rows += n
+        self.num_chunks += 1
+        self.rows = defaultdict(list)
+        self.new_nodes, self.new_paths = [], []
+        self._write_header()
+
+    def _write_header(self):
+        header = {
+            "format": FORMAT, "version": FORMAT_VERSION, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "num_rows": self.num_rows, "num_chunks": self.num_chunks, "stations": self.stations,
+            "num_nodes": len(self.node_ref), "num_paths": len(self.path_ref), "weighted": self.weighted,
+        }
+        tmp = os.path.join(self.path, "header.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(header, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, os.path.join(self.path, "header.json"))
+
+    def close(self):
+        self.flush()
+        self._write_header()
+
+
+# ✅ 저장소 읽기: 청크 단위 DataFrame (경로는 번호 그대로 또는 기존 "a → b → c" 문자열로 복원)
+class ResultReader:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "header.json"), encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("format") != FORMAT or self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 결과 저장소 형식: {path}")
+        self.stations = np.asarray(self.header["stations"], dtype=object)
+        self._nodes = self._offsets = self._path_nodes = None
+        self._path_str = {}
+
+    def __len__(self):
+        return self.header["num_rows"]
+
+    def _files(self, prefix):
+        return sorted(glob.glob(os.path.join(self.path, f"{prefix}_*")))[:self.header["num_chunks"]]
+
+    def _tables(self):
+        if self._nodes is None:
+            self._nodes = np.concatenate([np.load(f) for f in self._files("nodes")] or [np.array([], dtype=str)])
+            offsets, nodes, base = [np.zeros(1, dtype=np.int64)], [], 0
+            for f in self._files("paths"):
+                with np.load(f) as a:
+                    offsets.append(a['offsets'][1:] + base)
+                    nodes.append(a['nodes'])
+                    base += len(a['nodes'])
+            self._offsets = np.concatenate(offsets)
+            self._path_nodes = np.concatenate(nodes) if nodes else np.zeros(0, dtype=np.int32)
+        return self._nodes, self._offsets, self._path_nodes
+
+    # 경로 번호 → 노드 번호 배열
+    def path_nodes(self, ref):
+        _, offsets, nodes = self._tables()
+        return nodes[offsets[ref]:offsets[ref + 1]]
+
+    def _path_strings(self, refs):
+        node_ids = self._tables()[0]
+        cache = self._path_str
+        for ref in np.unique(refs).tolist():
+            if ref not in cache:
+                cache[ref] = PATH_SEP.join(node_ids[self.path_nodes(ref)].tolist())
+        return [cache[r] for r in refs.tolist()]
+
+    def chunks(self, decode=True):
+        node_ids = self._tables()[0]
+        for f in self._files("chunk"):
+            with np.load(f) as a:
+                df = pd.DataFrame({c: a[c] for c in a.files})
+            df['station'] = self.stations[df['station'].to_numpy()]
+            if decode:
+                for c in NODE_COLUMNS:
+                    df[c] = node_ids[df[c].to_numpy()]
+                for c in PATH_COLUMNS:
+                    df[c] = self._path_strings(df[c].to_numpy())
+            yield df[COLUMNS + (['weight'] if 'weight' in df else [])]
+
+    def read(self, decode=False):
+        frames = list(self.chunks(decode))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+
+    # ✅ 기존 CSV 형식 내보내기 (청크별로 이어 쓰기, BOM 은 파일 앞에 1회)
+    def export_csv(self, output):
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8-sig", newline="") as f:
+            written = False
+            for df in self.chunks(decode=True):
+                df.to_csv(f, index=False, header=not written)
+                written = True
+            if not written:
+                pd.DataFrame(columns=COLUMNS).to_csv(f, index=False)
+        return output
+
+
+if __name__ == "__main__":
+    from config.config import config_algorithm
+
+    config = config_algorithm()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', type=str, default=config["result_store_path"])
+    parser.add_argument('--output', type=str, default=config["output_path"])
+    args = parser.parse_args()
+
+    reader = ResultReader(args.input)
+    reader.export_csv(args.output)
+    print(f"✅ {len(reader)}행 내보내기 완료 → {args.output} "
+          f"(노드 {reader.header['num_nodes']}개, 경로 {reader.header['num_paths']}개)")
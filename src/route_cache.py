@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+
+# ✅ 경로 탐색 결과 LRU 캐시 (키에 그래프 가중치 버전 포함 → 가중치 갱신 시 자동 무효화)
+class RouteCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data), "maxsize": self.maxsize,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# 프로세스 단위 기본 캐시
+route_cache = RouteCache()
+
+
+def route_key(G, source, target, max_time_diff, weight_factor, heuristic=None, alpha=None):
+    name = heuristic if heuristic is None or isinstance(heuristic, str) else getattr(heuristic, "name", id(heuristic))
+    return G.version, source, target, max_time_diff, weight_factor, name, alpha
+
+
+# ✅ 캐시를 거치는 경로 탐색 (반환값은 공유되므로 호출 측에서 수정하지 말 것)
+def cached_route(G, source, target, max_time_diff=60, weight_factor=0.692, heuristic=None, alpha=None, cache=None):
+    from algorithm import bidirectional_dijkstra_idx
+
+    cache = route_cache if cache is None else cache
+    key = route_key(G, source, target, max_time_diff, weight_factor, heuristic, alpha)
+    result = cache.get(key)
+    if result is None:
+        result = bidirectional_dijkstra_idx(G, source, target, max_time_diff, weight_factor, heuristic, alpha)
+        cache.put(key, result)
+    return result
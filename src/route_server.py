@@ -0,0 +1,368 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+## 실행 방법 (그래프/위험도/탐색 상태(routing 규칙별)를 한 번 올려두고 질의에 응답하는 로컬 서버)
+#python route_server.py --port 8765
+#python route_server.py --socket /tmp/isecd.sock --departure_time 1900
+## 질의 예
+#curl "http://127.0.0.1:8765/best?goal=5863307791"
+#curl "http://127.0.0.1:8765/best?x=126.9567&y=37.5571"
+#curl "http://127.0.0.1:8765/route?station=공덕119안전센터&goal=5863307791&paths=1"
+#curl -X POST http://127.0.0.1:8765/batch -d '{"queries": [{"goal": "5863307791"}, {"x": 126.95, "y": 37.55}]}'
+#curl -X POST http://127.0.0.1:8765/reload -d '{"departure_time": "0800"}'
+
+# 무거운 모듈(numpy/pandas/algorithm...)은 RoutingState 생성 시점에 import → 서버는 즉시 listen, 로딩은 백그라운드
+
+class QueryError(ValueError):
+    pass
+
+
+# 감시 대상 파일의 최신 수정 시각 (스냅샷이면 header.json, 아니면 엣지/위험도 CSV)
+def source_mtime(config):
+    if config.get("use_graph_snapshot") and os.path.isdir(config.get("graph_snapshot_path") or ""):
+        paths = [os.path.join(config["graph_snapshot_path"], "header.json")]
+    else:
+        paths = [config["csv_path"], config["risk_csv_path"], *config.get("snapshot_paths", [])]
+    return max((os.path.getmtime(p) for p in paths if os.path.exists(p)), default=0.0)
+
+
+# ✅ 한 시점의 라우팅 상태: 그래프 + (config["routing"] 에 따라) 탐색 상태 (두 방식 모두 simulate 와 같은 결과)
+# routing == "table" 이면 소방서/후보 탐색 기록 + 임의 목적지 역방향 탐색 기록 LRU 를 재생,
+# 아니면 양방향 다익스트라 + (소방서, 목적지) 경로 LRU (RouteCache)
+# 교체는 통째로 (요청은 시작 시 잡은 상태 객체만 사용 → 재적재 중에도 일관된 응답)
+class RoutingState:
+    def __init__(self, config, departure_time=None, tree_cache_size=256):
+        from algorithm import build_graph, load_risk_map
+        from route_cache import RouteCache
+        from tables import build_distance_tables, routing_rule, score_alpha
+
+        t0 = time.perf_counter()
+        self.config = config
+        self.mtime = source_mtime(config)
+        if config.get("use_graph_snapshot") and os.path.isdir(config.get("graph_snapshot_path") or ""):
+            from snapshot import load_graph_snapshot
+            G = load_graph_snapshot(config["graph_snapshot_path"],
+                                    departure_time or config.get("snapshot_departure_time"))
+        elif departure_time is not None:
+            # 스냅샷 CSV 묶음에서 해당 시각 그래프 (슬롯 사이는 보간)
+            from dispatch import load_time_dependent
+            G = load_time_dependent(config).at(departure_time)
+        else:
+            G, _, _ = build_graph(config)
+            G.set_risk(load_risk_map(config["risk_csv_path"]))
+        self.G = G
+        self.departure_time = departure_time or config.get("snapshot_departure_time")
+        self.score_alpha = score_alpha(config)
+        self.routing = routing_rule(config)
+        self.tables = build_distance_tables(G, config) if self.routing == "table" else None
+        self.station_idx = {name: G.index(node) for name, node in config["station_nodes"].items()}
+        self.station_row = {name: i for i, name in enumerate(self.station_idx)}
+        self.stations = list(self.station_idx)
+        self.alpha = config.get("alpha", 0.7)
+        self._trees = OrderedDict()
+        self._tree_cache_size = tree_cache_size
+        self._routes = RouteCache(tree_cache_size * len(self.stations))
+        self._lock = threading.Lock()
+        self.loaded_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.load_seconds = round(time.perf_counter() - t0, 3)
+
+    # 목적지 → 역방향 탐색 기록 (사고 후보는 테이블, 그 외는 1회 기록 후 LRU)
+    def _trace(self, goal):
+        from tables import SearchTrace
+
+        t = self.tables
+        j = t.candidate_row.get(goal)
+        if j is not None:
+            return t.bwd[j]
+        with self._lock:
+            tree = self._trees.get(goal)
+            if tree is not None:
+                self._trees.move_to_end(goal)
+                return tree
+        tree = SearchTrace(self.G, goal, reverse=True)
+        with self._lock:
+            self._trees[goal] = tree
+            while len(self._trees) > self._tree_cache_size:
+                self._trees.popitem(last=False)
+        return tree
+
+    def resolve_goal(self, params):
+        G = self.G
+        if params.get("goal") is not None:
+            goal = str(params["goal"])
+            if goal not in G:
+                raise QueryError(f"unknown node: {goal}")
+            return G.index(goal)
+        if params.get("x") is not None and params.get("y") is not None:
+            return self.nearest(float(params["x"]), float(params["y"]))
+        raise QueryError("goal or x/y required")
+
+    # 좌표 → 가장 가까운 노드 (위도 보정 평면 거리)
+    def nearest(self, x, y):
+        import numpy as np
+
+        G = self.G
+        dx = (G.x - x) * np.cos(np.radians(y))
+        return int(np.argmin(dx * dx + (G.y - y) ** 2))
+
+    # table 방식: 소방서별 (만남 노드, 정방향 경로, 역방향 경로) 를 기록 재생으로, 만남 없으면 None
+    def _table_meetings(self, goal):
+        from tables import replay_meeting
+
+        tb = self._trace(goal)
+        for tf in self.tables.fwd:
+            _, m, done_f, done_b = replay_meeting(tf, tb, self.config["max_time_diff"])
+            yield None if m is None else (m, tf.path_at(m, done_f), tb.path_at(m, done_b))
+
+    # 양방향 규칙: find_route 와 같은 탐색, 결과는 (소방서, 목적지) LRU (탐색은 잠금 밖에서)
+    def _bidirectional_meetings(self, goal):
+        from algorithm import bidirectional_dijkstra_idx
+        from route_cache import route_key
+
+        G, mtd, wf = self.G, self.config["max_time_diff"], self.config["weight_factor"]
+        heuristic, alpha = self.config.get("heuristic"), self.score_alpha
+        for start in self.station_idx.values():
+            key = route_key(G, start, goal, mtd, wf, heuristic, alpha)
+            with self._lock:
+                result = self._routes.get(key)
+            if result is None:
+                result = bidirectional_dijkstra_idx(G, start, goal, mtd, wf, heuristic, alpha)
+                with self._lock:
+                    self._routes.put(key, result)
+            _, _, m, pf, pb = result
+            yield None if m is None else (m, pf, pb)
+
+    # ✅ 모든 소방서 → 목적지 (run_trial 과 같은 만남 노드 규칙/점수), 만남 없는 소방서는 None
+    def routes(self, goal, paths=False):
+        from algorithm import path_risk, path_times
+
+        G = self.G
+        meetings = self._table_meetings(goal) if self.tables is not None else self._bidirectional_meetings(goal)
+        out = []
+        for name, found in zip(self.stations, meetings):
+            if found is None:
+                out.append(None)
+                continue
+            m, pf, pb = found
+            ft, bt, total = path_times(G, pf, pb, self.config)
+            risk = path_risk(G, pf)
+            result = {
+                'station': name, 'u': G.node_id(self.station_idx[name]), 'v': G.node_id(goal),
+                'meeting_node': G.node_id(m),
+                'forward_time': round(ft, 2), 'backward_time': round(bt, 2), 'total_cost': round(total, 2),
+                'total_risk': round(risk, 2), 'total_score': round(self.alpha * total + (1 - self.alpha) * risk, 2),
+                'total_time_min': round(total / 60, 2), 'path_length': len(pf) + len(pb) - 1,
+            }
+            if paths:
+                result['forward_path'], result['backward_path'] = G.ids(pf), G.ids(pb)
+            out.append(result)
+        return out
+
+    def route(self, params):
+        station = params.get("station")
+        if station not in self.station_row:
+            raise QueryError(f"unknown station: {station}")
+        goal = self.resolve_goal(params)
+        result = self.routes(goal, _flag(params.get("paths")))[self.station_row[station]]
+        return result or {'station': station, 'v': self.G.node_id(goal), 'meeting_node': None}
+
+    # 최선 소방서 (점수 최소, 동점이면 앞 소방서) + 전체 순위
+    def best(self, params):
+        goal = self.resolve_goal(params)
+        found = [r for r in self.routes(goal, _flag(params.get("paths"))) if r is not None]
+        ranked = sorted(found, key=lambda r: r['total_score'])
+        return {
+            'goal': self.G.node_id(goal), 'best': ranked[0] if ranked else None,
+            'ranking': [{k: r[k] for k in ('station', 'total_score', 'total_time_min', 'total_risk')} for r in ranked],
+        }
+
+    def info(self):
+        return {
+            "routing": self.routing,
+            "nodes": self.G.num_nodes, "edges": self.G.num_edges, "departure_time": self.departure_time,
+            "stations": self.stations,
+            "candidates": len(self.tables.candidates) if self.tables is not None else None,
+            "loaded_at": self.loaded_at, "load_seconds": self.load_seconds, "cached_trees": len(self._trees),
+            "cached_routes": len(self._routes),
+        }
+
+
+def _flag(value):
+    return str(value).lower() in ("1", "true", "yes") if value is not None else False
+
+
+# ✅ 로컬 라우팅 서버 (HTTP 또는 Unix 소켓), 상태 교체는 참조 1개 대입
+class RoutingServer:
+    def __init__(self, config, host="127.0.0.1", port=8765, socket_path=None, reload_interval=None,
+                 departure_time=None):
+        self.config = config
+        self.departure_time = departure_time
+        self.reload_interval = reload_interval
+        self.state, self.error, self.reloads = None, None, 0
+        self._reload_lock = threading.Lock()
+        handler = self._handler()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.httpd = socketserver.ThreadingUnixStreamServer(socket_path, handler)
+            self.address = f"unix:{socket_path}"
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), handler)
+            self.address = "http://%s:%d" % self.httpd.server_address[:2]
+        self.httpd.daemon_threads = True
+        self.socket_path = socket_path
+
+    # 새 상태를 완전히 만든 뒤 교체 (실패 시 이전 상태 유지)
+    def reload(self, departure_time=None):
+        with self._reload_lock:
+            if departure_time is not None:
+                self.departure_time = departure_time
+            try:
+                state = RoutingState(self.config, self.departure_time)
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"❌ 적재 실패: {self.error}")
+                raise
+            self.state, self.error = state, None
+            self.reloads += 1
+            print(f"✅ 라우팅 상태 적재 ({state.load_seconds}s, routing={state.routing}, "
+                  f"출발 시각 {state.departure_time}, 노드 {state.G.num_nodes})")
+            return state
+
+    def _watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            state = self.state
+            if state is not None and source_mtime(self.config) > state.mtime:
+                print("🔄 소요시간 스냅샷 변경 감지 → 재적재")
+                try:
+                    self.reload()
+                except Exception:
+                    pass
+
+    def handle(self, method, path, params):
+        if path == "/health":
+            state = self.state
+            return 200, {"status": "ready" if state else ("error" if self.error else "loading"),
+                         "error": self.error, "reloads": self.reloads, **(state.info() if state else {})}
+        if path == "/reload" and method == "POST":
+            state = self.reload(params.get("departure_time"))
+            return 200, state.info()
+
+        state = self.state
+        if state is None:
+            return 503, {"error": self.error or "loading"}
+        if path == "/route":
+            return 200, state.route(params)
+        if path in ("/best", "/nearest_station"):
+            return 200, state.best(params)
+        if path == "/nearest":
+            i = state.nearest(float(params["x"]), float(params["y"]))
+            return 200, {"node": state.G.node_id(i), "x": float(state.G.x[i]), "y": float(state.G.y[i])}
+        if path == "/batch" and method == "POST":
+            out = []
+            for q in params.get("queries", []):
+                try:
+                    out.append(state.route(q) if q.get("station") else state.best(q))
+                except QueryError as e:
+                    out.append({"error": str(e)})
+            return 200, {"results": out}
+        return 404, {"error": f"not found: {path}"}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            # 헤더/본문이 따로 나가므로 Nagle 지연(수십 ms) 방지
+            def setup(self):
+                super().setup()
+                if not server.socket_path:
+                    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def _send(self, status, body):
+                data = json.dumps(body, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self, method, params):
+                parsed = urlparse(self.path)
+                params = {**{k: v[0] for k, v in parse_qs(parsed.query).items()}, **params}
+                try:
+                    self._send(*server.handle(method, parsed.path, params))
+                except (QueryError, KeyError, ValueError) as e:
+                    self._send(400, {"error": str(e)})
+                except Exception as e:
+                    self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+            def do_GET(self):
+                self._dispatch("GET", {})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                except json.JSONDecodeError as e:
+                    return self._send(400, {"error": f"invalid JSON: {e}"})
+                self._dispatch("POST", body)
+
+        return Handler
+
+    # listen 먼저, 적재는 백그라운드 (적재 전 질의는 503)
+    def start(self, block=True):
+        threading.Thread(target=self._load_initial, daemon=True).start()
+        if self.reload_interval:
+            threading.Thread(target=self._watch, daemon=True).start()
+        if not block:
+            threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+            return self
+        self.httpd.serve_forever()
+
+    def _load_initial(self):
+        try:
+            self.reload()
+        except Exception:
+            pass
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+if __name__ == "__main__":
+    from config.config import config_algorithm
+
+    config = config_algorithm()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', type=str, default=config["server_host"])
+    parser.add_argument('--port', type=int, default=config["server_port"])
+    parser.add_argument('--socket', type=str, help='Unix 소켓 경로 (지정 시 TCP 대신 사용)')
+    parser.add_argument('--departure_time', type=str, help='스냅샷 출발 시각 (예: 0800)')
+    parser.add_argument('--reload_interval', type=float, default=config["server_reload_interval"],
+                        help='스냅샷 변경 감시 간격(초), 0 이면 감시 안 함')
+    args = parser.parse_args()
+
+    server = RoutingServer(config, args.host, args.port, args.socket, args.reload_interval or None,
+                           args.departure_time)
+    print(f"✅ 라우팅 서버 실행 중 → {server.address} (상태: /health)")
+    try:
+        server.start()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+import time
+
+# 키: (출발 좌표, 도착 좌표, 출발 시각, 엔드포인트) / 현재(real) 소요시간은 교통 상황에 따라 바뀌므로 TTL 을 따로 둠
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    departure_time TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    duration REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (origin, destination, departure_time, endpoint)
+) WITHOUT ROWID
+"""
+
+
+def route_key(mode, origin, destination, departure_time=None):
+    return (f"{origin[0]},{origin[1]}", f"{destination[0]},{destination[1]}",
+            "" if mode == 'real' else str(departure_time), mode)
+
+
+# ✅ 경로 소요시간 영구 저장소 (SQLite, 배치 쓰기, 중단 후 재실행 시 이미 받은 구간은 재요청하지 않음)
+class RouteStore:
+    def __init__(self, path, ttl=None, ttl_real=600, batch_size=200):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl, self.ttl_real = ttl, ttl_real
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._pending = []
+        self.hits = self.misses = self.writes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _min_fetched_at(self, endpoint, now):
+        ttl = self.ttl_real if endpoint == 'real' else self.ttl
+        return now - ttl if ttl is not None else float('-inf')
+
+    # 키 목록 → {키: duration} (TTL 이내 값만)
+    def get_many(self, keys):
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        now = time.time()
+        with self._lock:
+            self._flush_locked()
+            cur = self._conn.cursor()
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS lookup "
+                        "(origin TEXT, destination TEXT, departure_time TEXT, endpoint TEXT)")
+            cur.execute("DELETE FROM lookup")
+            cur.executemany("INSERT INTO lookup VALUES (?, ?, ?, ?)", keys)
+            rows = cur.execute(
+                "SELECT r.origin, r.destination, r.departure_time, r.endpoint, r.duration, r.fetched_at "
+                "FROM lookup l JOIN routes r USING (origin, destination, departure_time, endpoint)").fetchall()
+            found = {row[:4]: row[4] for row in rows if row[5] >= self._min_fetched_at(row[3], now)}
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put(self, key, duration):
+        with self._lock:
+            self._pending.append((*key, float(duration), time.time()))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        self._conn.executemany("INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+        self._conn.commit()
+        self.writes += len(self._pending)
+        self._pending = []
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes,
+                "hit_rate": round(self.hits / total, 4) if total else None}
+
+
+def store_from_config(cfg):
+    path = cfg.get("ROUTE_STORE_PATH")
+    if not path:
+        return None
+    return RouteStore(path, ttl=cfg.get("ROUTE_STORE_TTL"), ttl_real=cfg.get("ROUTE_STORE_TTL_REAL", 600))
@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from graph import CSRGraph
+from timedep import TimeDependentGraph, build_time_dependent_graph, format_slot, minute_of_day
+
+## 실행 방법 (CSV → 바이너리 스냅샷 컴파일)
+#python snapshot.py --output ../data/graph_snapshot
+
+FORMAT = "isecd-graph"
+FORMAT_VERSION = 1
+
+ARRAYS = ("node_ids", "x", "y", "src", "dst", "fwd_ptr", "fwd_eid", "fwd_nbr",
+          "rev_ptr", "rev_eid", "rev_nbr", "risk", "durations", "slot_minutes")
+
+
+# ✅ 스냅샷 저장: 디렉터리 = header.json + 배열별 .npy (mmap 가능한 고정폭 dtype)
+def write_snapshot(path, tdg, sources=()):
+    G = tdg.G
+    arrays = {
+        "node_ids": np.asarray(G.node_ids.tolist(), dtype=str),
+        "x": G.x, "y": G.y, "src": G.src, "dst": G.dst,
+        "fwd_ptr": G.fwd_ptr, "fwd_eid": G.fwd_eid, "fwd_nbr": G.fwd_nbr,
+        "rev_ptr": G.rev_ptr, "rev_eid": G.rev_eid, "rev_nbr": G.rev_nbr,
+        "risk": G.risk, "durations": np.ascontiguousarray(tdg.durations.T), "slot_minutes": tdg.slot_minutes,
+    }
+    header = {
+        "format": FORMAT, "version": FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "num_nodes": G.num_nodes, "num_edges": G.num_edges,
+        "slots": [format_slot(int(m)) for m in tdg.slot_minutes],
+        "sources": list(sources),
+        "arrays": {k: {"dtype": str(np.asarray(v).dtype), "shape": list(np.shape(v))} for k, v in arrays.items()},
+    }
+
+    tmp = f"{path}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, arr in arrays.items():
+        np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(arr))
+    with open(os.path.join(tmp, "header.json"), "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return header
+
+
+def read_header(path):
+    with open(os.path.join(path, "header.json"), encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 형식: {header.get('format')} v{header.get('version')} ({path})")
+    return header
+
+
+# ✅ 스냅샷 열기: 모든 배열을 읽기 전용 mmap 으로 (파싱 없음, 프로세스 간 페이지 공유)
+def open_arrays(path):
+    read_header(path)
+    return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in ARRAYS}
+
+
+def _slot_index(slot_minutes, departure_time):
+    if departure_time is None:
+        return 0
+    hits = np.flatnonzero(slot_minutes == minute_of_day(departure_time))
+    return int(hits[0]) if len(hits) else None
+
+
+def _graph(a, duration):
+    return CSRGraph.from_arrays(
+        a["node_ids"], a["x"], a["y"], a["src"], a["dst"], duration,
+        a["fwd_ptr"], a["fwd_eid"], a["fwd_nbr"], a["rev_ptr"], a["rev_eid"], a["rev_nbr"], risk=a["risk"],
+    )
+
+
+# ✅ 특정 출발 시각 그래프 (스냅샷 슬롯이면 그대로, 아니면 보간)
+def load_graph_snapshot(path, departure_time=None):
+    a = open_arrays(path)
+    slot = _slot_index(a["slot_minutes"], departure_time)
+    if slot is None:
+        return open_time_dependent(path).at(departure_time)
+    G = _graph(a, a["durations"][slot])
+    G.snapshot_ref = (path, departure_time)
+    return G
+
+
+def open_time_dependent(path):
+    a = open_arrays(path)
+    G = _graph(a, a["durations"][0])
+    G.snapshot_ref = (path, None)
+    return TimeDependentGraph(G, a["slot_minutes"], a["durations"].T)
+
+
+if __name__ == "__main__":
+    from algorithm import load_risk_map
+    from config.config import config_algorithm
+
+    config = config_algorithm()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', type=str, default=config["graph_snapshot_path"])
+    args = parser.parse_args()
+
+    tdg = build_time_dependent_graph(config["snapshot_paths"])
+    tdg.G.set_risk(load_risk_map(config["risk_csv_path"]))
+    header = write_snapshot(args.output, tdg, config["snapshot_paths"] + [config["risk_csv_path"]])
+    print(f"✅ 스냅샷 저장 완료: {args.output} / 노드 {header['num_nodes']}개, 엣지 {header['num_edges']}개, "
+          f"슬롯 {header['slots']}")
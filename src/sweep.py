@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from algorithm import build_graph, load_risk_map, path_risk, path_times, trial_rng
+from config.config import config_algorithm
+from graph import DEFAULT_FACTOR, DURATION_BANDS, compute_weight
+from tables import SearchTrace, replay_meeting
+
+## 실행 방법 (파라미터 격자 민감도 분석, 탐색 결과 공유)
+#python sweep.py --weight_factors 0.6 0.692 0.8 --alphas 0.5 0.6 0.7 0.8 0.9 --max_time_diffs 30 60 120
+#python sweep.py --bands '[[[400,0.8],[300,0.1],[200,0.2],[100,0.3],[40,0.4]], [[300,0.5],[100,0.4]]]'
+
+METRICS = ['forward_time', 'backward_time', 'total_cost', 'total_risk', 'total_score', 'total_time_min',
+           'path_length']
+
+
+# ✅ 경로 단위 캐시: 경로 (정방향, 역방향) → 정방향 시간 / 역방향 시간 / 위험도 / 노드 수
+# 시간/위험도는 원래 가중치(구간 적용) 기준 (run_trial 의 path_times(G, ...) 와 동일), max_time_diff 가 달라도
+# 같은 경로를 고르면 다시 계산하지 않음 (weight_factor 별로 하나)
+class PathCache:
+    def __init__(self, G, weight_factor):
+        self.G, self.config = G, {"weight_factor": weight_factor}
+        self.routes = {}
+
+    def get(self, pf, pb):
+        key = (tuple(pf), tuple(pb))
+        route = self.routes.get(key)
+        if route is None:
+            ft, bt, total = path_times(self.G, pf, pb, self.config)
+            route = self.routes[key] = (ft, bt, total, path_risk(self.G, pf), len(pf) + len(pb) - 1)
+        return route
+
+
+# ✅ 탐색 파라미터 1조합 → 시행 × 소방서 지표 배열 (만남 없음 = NaN)
+# 정방향 기록(소방서) × 역방향 기록(사고 지점) 을 교대로 재생 → bidirectional_dijkstra_idx 와 같은 만남 노드/경로
+def evaluate_search(fwd, bwd, cache, goal_rows, max_time_diff):
+    S, T = len(fwd), len(goal_rows)
+    out = {k: np.full((T, S), np.nan) for k in ('forward_time', 'backward_time', 'total_cost', 'total_risk',
+                                                 'path_length')}
+    rows = np.asarray(goal_rows)
+    for i, tf in enumerate(fwd):
+        for j, tb in enumerate(bwd):
+            _, m, done_f, done_b = replay_meeting(tf, tb, max_time_diff)
+            if m is None:
+                continue
+            ft, bt, total, risk, length = cache.get(tf.path_at(m, done_f), tb.path_at(m, done_b))
+            hit = rows == j
+            out['forward_time'][hit, i] = ft
+            out['backward_time'][hit, i] = bt
+            out['total_cost'][hit, i] = total
+            out['total_risk'][hit, i] = risk
+            out['path_length'][hit, i] = length
+    return out
+
+
+# ✅ 점수 전용 파라미터(alpha) 전체를 배열 연산으로 평가 → 조합별 요약 행 + (선택) 시행별 행
+def evaluate_alphas(metrics, alphas, station_names, params, per_trial=False):
+    total, risk = metrics['total_cost'], metrics['total_risk']
+    alphas = np.asarray(alphas, dtype=np.float64)[:, None, None]
+    # run_trial 과 같이 반올림된 점수로 비교, 동점이면 앞 소방서 (만남 없음은 제외)
+    score = np.round(alphas * total + (1 - alphas) * risk, 2)
+    score = np.where(np.isnan(score), np.inf, score)
+    best = np.argmin(score, axis=2)
+    found = np.isfinite(np.take_along_axis(score, best[..., None], axis=2)[..., 0])
+
+    summary, detail = [], []
+    trials = np.arange(1, total.shape[0] + 1)
+    for a, alpha in enumerate(alphas[:, 0, 0]):
+        pick = best[a]
+        ok = found[a]
+        row_idx = trials - 1
+        values = {
+            'forward_time': np.round(metrics['forward_time'][row_idx, pick], 2),
+            'backward_time': np.round(metrics['backward_time'][row_idx, pick], 2),
+            'total_cost': np.round(total[row_idx, pick], 2),
+            'total_risk': np.round(risk[row_idx, pick], 2),
+            'total_score': score[a, row_idx, pick],
+            'total_time_min': np.round(total[row_idx, pick] / 60, 2),
+            'path_length': metrics['path_length'][row_idx, pick],
+        }
+        row = {**params, 'alpha': float(alpha), 'trials': int(ok.sum())}
+        for k in METRICS:
+            row[f'mean_{k}'] = float(np.mean(values[k][ok])) if ok.any() else np.nan
+        counts = pd.Series(np.asarray(station_names)[pick[ok]]).value_counts()
+        row['station_share'] = json.dumps({s: round(int(counts.get(s, 0)) / max(ok.sum(), 1), 4)
+                                           for s in station_names}, ensure_ascii=False)
+        summary.append(row)
+        if per_trial:
+            detail.append(pd.DataFrame({**params, 'alpha': float(alpha), 'trial': trials[ok],
+                                        'station': np.asarray(station_names)[pick[ok]],
+                                        **{k: v[ok] for k, v in values.items()}}))
+    return summary, detail
+
+
+def _bands_key(bands):
+    return json.dumps([list(b) for b in bands])
+
+
+# ✅ 격자 실행: simulate 와 같은 양방향 탐색 규칙을 탐색 기록 재생으로 평가
+# 역방향 기록(사고 지점, 시간)은 소요시간 구간 조합마다 1회 → weight_factor / max_time_diff / alpha 전체가 공유
+# 정방향 기록(소방서)은 (구간, weight_factor) 마다 (objective == "score" 이면 alpha 도 탐색 비용에 들어가므로 alpha 별로),
+# max_time_diff 는 두 기록의 재생만 다시 함 → 격자 결과는 같은 파라미터의 simulate 결과와 동일
+def run_sweep(config, G, weight_factors, alphas, max_time_diffs, band_sets, per_trial=False):
+    if config.get("heuristic"):
+        raise ValueError(f"heuristic={config['heuristic']!r} 탐색은 기록 재생으로 재현되지 않음 "
+                         f"→ sweep 은 heuristic=None 에서만 실행")
+    trials = range(1, config["num_trials"] + 1)
+    goals = [trial_rng(config["seed"], trial).choice(config["accident_candidates"]) for trial in trials]
+    distinct = list(dict.fromkeys(goals))
+    row_of = {g: k for k, g in enumerate(distinct)}
+    goal_rows = [row_of[g] for g in goals]
+    station_names = list(config["station_nodes"])
+    score_objective = config.get("objective", "time") == "score"
+    # alpha 가 탐색에 쓰이면 alpha 마다 정방향 기록, 아니면 한 번 기록하고 alpha 는 점수 계산에만
+    search_alphas = alphas if score_objective else [None]
+
+    summary, detail = [], []
+    for bands in band_sets:
+        base = G.with_weights(compute_weight(G.duration, bands, DEFAULT_FACTOR), G.duration)
+        starts = [base.index(node) for node in config["station_nodes"].values()]
+        goal_idx = [base.index(g) for g in distinct]
+        t0 = time.perf_counter()
+        bwd = [SearchTrace(base, g, True) for g in goal_idx]
+        print(f"[🌲 역방향 기록] bands={_bands_key(bands)} ({len(bwd)}개, {time.perf_counter() - t0:.2f}s)")
+
+        for wf in weight_factors:
+            cache = PathCache(base, wf)
+            for search_alpha in search_alphas:
+                fwd = [SearchTrace(base, s, False, wf, search_alpha) for s in starts]
+                for mtd in max_time_diffs:
+                    metrics = evaluate_search(fwd, bwd, cache, goal_rows, mtd)
+                    params = {'bands': _bands_key(bands), 'weight_factor': wf, 'max_time_diff': mtd}
+                    rows, frames = evaluate_alphas(metrics, alphas if search_alpha is None else [search_alpha],
+                                                   station_names, params, per_trial)
+                    summary += rows
+                    detail += frames
+            print(f"  weight_factor={wf}: 경로 캐시 {len(cache.routes)}개")
+
+    return pd.DataFrame(summary), (pd.concat(detail, ignore_index=True) if detail else None)
+
+
+def main():
+    config = config_algorithm()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--weight_factors', type=float, nargs='+', default=[config["weight_factor"]])
+    parser.add_argument('--alphas', type=float, nargs='+', default=[config["alpha"]])
+    parser.add_argument('--max_time_diffs', type=float, nargs='+', default=[config["max_time_diff"]])
+    parser.add_argument('--bands', type=str, help='소요시간 구간 목록 JSON: [[[하한, 계수], ...], ...]')
+    parser.add_argument('--num_trials', type=int, default=config["num_trials"])
+    parser.add_argument('--per_trial', action='store_true', help='시행별 결과도 저장')
+    parser.add_argument('--output', type=str, default=config["sweep_output_path"])
+    args = parser.parse_args()
+
+    config["num_trials"] = args.num_trials
+    band_sets = [tuple(map(tuple, b)) for b in json.loads(args.bands)] if args.bands else [DURATION_BANDS]
+
+    t0 = time.perf_counter()
+    G, df, _ = build_graph(config)
+    if df is not None:
+        G.set_risk(load_risk_map(config["risk_csv_path"]))
+
+    summary, detail = run_sweep(config, G, args.weight_factors, args.alphas, args.max_time_diffs, band_sets,
+                                args.per_trial)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    summary.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"\n✅ {len(summary)}개 조합 완료 ({time.perf_counter() - t0:.1f}s) → {args.output}")
+    if detail is not None:
+        path = os.path.splitext(args.output)[0] + "_trials.csv"
+        detail.to_csv(path, index=False, encoding="utf-8-sig")
+        print(f"📁 시행별 결과 → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import heapq
+import numpy as np
+
+
+# ✅ 단일 출발 전체 최단경로 트리 (reverse=True 이면 역방향 그래프 기준 = 목적지로의 거리)
+def dijkstra_tree(G, source, reverse=False, weight_factor=1.0):
+    fptr, fnbr, fw, rptr, rnbr, rw = G.adjacency()
+    ptr, nbr, w = (rptr, rnbr, rw) if reverse else (fptr, fnbr, fw)
+
+    inf = float('inf')
+    n = G.num_nodes
+    dist = [inf] * n
+    pred = [-1] * n
+    done = [False] * n
+    dist[source] = 0
+    pq = [(0, source)]
+
+    while pq:
+        du, u = heapq.heappop(pq)
+        if done[u]:
+            continue
+        done[u] = True
+        for k in range(ptr[u], ptr[u + 1]):
+            v = nbr[k]
+            nd = du + w[k] * weight_factor
+            if nd < dist[v]:
+                dist[v], pred[v] = nd, u
+                heapq.heappush(pq, (nd, v))
+
+    return np.array(dist, dtype=np.float64), np.array(pred, dtype=np.int32)
+
+
+def unwind(pred, node):
+    path = []
+    while node != -1:
+        path.append(node)
+        node = int(pred[node])
+    return path
+
+
+# ✅ 한쪽 방향 탐색 기록: bidirectional_dijkstra_idx 의 한쪽 큐와 같은 연산(같은 힙/같은 덧셈)을 끝까지 실행하며
+# 확정 순서, 확정 후 힙 최솟값, 임시 거리 갱신 이력을 남김 → 두 기록을 교대로 재생하면 양방향 탐색 결과와 동일
+# (한쪽 큐의 진행은 반대쪽과 무관하고, 반대쪽은 만남 검사/종료 조건에서만 참조되기 때문)
+# alpha 지정 시 정방향 기록은 score 탐색 (거리 = 점수, 라벨별 시간/위험도도 기록), 역방향은 항상 시간
+class SearchTrace:
+    def __init__(self, G, root, reverse=False, weight_factor=1.0, alpha=None):
+        self.root, self.reverse, self.weight_factor = root, reverse, weight_factor
+        self.alpha = None if reverse else alpha
+        self.record(G)
+
+    def record(self, G):
+        fptr, fnbr, fw, rptr, rnbr, rw = G.adjacency()
+        ptr, nbr, w, scale = (rptr, rnbr, rw, 1) if self.reverse else (fptr, fnbr, fw, self.weight_factor)
+        root, alpha = self.root, self.alpha
+        score = alpha is not None
+        if score:
+            frisk, beta = G.risk_list(), 1 - alpha
+
+        inf = float('inf')
+        dist, prev = {root: 0}, {root: -1}
+        time_, risk = {root: 0}, {root: 0}
+        pq = [(0, root)]
+        processed = set()
+        settled, settle_dist, heap_min = [], [], []
+        upd_node, upd_step, upd_dist, upd_pred = [root], [-1], [0.0], [-1]
+        upd_time, upd_risk = [0.0], [0.0]
+        step = 0
+        while pq:
+            _, u = heapq.heappop(pq)
+            if u in processed:
+                continue
+            processed.add(u)
+            du = dist[u]
+            settled.append(u)
+            settle_dist.append(du)
+            if score:
+                tu, ru = time_[u], risk[u]
+                for k in range(ptr[u], ptr[u + 1]):
+                    v = nbr[k]
+                    t_v, r_v = tu + w[k] * scale, ru + frisk[k]
+                    new_dist = alpha * t_v + beta * r_v
+                    if new_dist < dist.get(v, inf):
+                        dist[v], prev[v], time_[v], risk[v] = new_dist, u, t_v, r_v
+                        heapq.heappush(pq, (new_dist, v))
+                        upd_node.append(v)
+                        upd_step.append(step)
+                        upd_dist.append(new_dist)
+                        upd_pred.append(u)
+                        upd_time.append(t_v)
+                        upd_risk.append(r_v)
+            else:
+                for k in range(ptr[u], ptr[u + 1]):
+                    v = nbr[k]
+                    new_dist = du + w[k] * scale
+                    if new_dist < dist.get(v, inf):
+                        dist[v], prev[v] = new_dist, u
+                        heapq.heappush(pq, (new_dist, v))
+                        upd_node.append(v)
+                        upd_step.append(step)
+                        upd_dist.append(new_dist)
+                        upd_pred.append(u)
+            heap_min.append(pq[0][0] if pq else inf)
+            step += 1
+
+        n = G.num_nodes
+        self.settled = np.array(settled, dtype=np.int64)
+        self.settle_dist = np.array(settle_dist, dtype=np.float64)
+        self.heap_min = np.array(heap_min, dtype=np.float64)
+        # 마지막 확정 직후 큐가 비면 양방향 루프는 반대쪽 차례 전에 끝남
+        self.exhausted = bool(heap_min[-1] == inf)
+        self.position = np.full(n, len(settled), dtype=np.int64)
+        self.position[self.settled] = np.arange(len(settled))
+        self.dist = np.full(n, np.inf)
+        self.dist[self.settled] = self.settle_dist
+        self.pred = np.full(n, -1, dtype=np.int32)
+        self.pred[self.settled] = [prev[u] for u in settled]
+
+        # 갱신 이력: (노드, 갱신한 확정 단계) 순 정렬 → 키 이진 탐색으로 "k 단계 확정 후" 임시 거리/선행 노드 조회
+        nodes, steps = np.array(upd_node, dtype=np.int64), np.array(upd_step, dtype=np.int64)
+        order = np.lexsort((steps, nodes))
+        self._base = len(settled) + 1
+        self.upd_node = nodes[order]
+        self.upd_key = self.upd_node * self._base + steps[order] + 1
+        self.upd_dist = np.array(upd_dist, dtype=np.float64)[order]
+        self.upd_pred = np.array(upd_pred, dtype=np.int64)[order]
+        if score:
+            self.upd_time = np.array(upd_time, dtype=np.float64)[order]
+            self.upd_risk = np.array(upd_risk, dtype=np.float64)[order]
+            self.settle_time = np.array([time_[u] for u in settled], dtype=np.float64)
+            self.settle_risk = np.array([risk[u] for u in settled], dtype=np.float64)
+        # valid: 기록이 현재 가중치와 일치하는 확정 단계 수 (repair 가 줄이고, 다시 기록하면 전체)
+        self.valid = len(settled)
+        self.version = G.version
+
+    def __len__(self):
+        return len(self.settled)
+
+    # 노드별 "done 번째 확정까지 반영된" 마지막 갱신 위치와 발견 여부
+    def _lookup(self, nodes, done):
+        q = np.asarray(nodes, dtype=np.int64) * self._base + np.minimum(done, self._base - 1)
+        i = np.searchsorted(self.upd_key, q, side='right') - 1
+        return i, (i >= 0) & (self.upd_node[i] == nodes)
+
+    # 노드별 "done 번째 확정까지 반영된" 임시 (거리, 선행 노드), 아직 발견 전이면 (inf, -2)
+    def tentative(self, nodes, done):
+        i, found = self._lookup(nodes, done)
+        return np.where(found, self.upd_dist[i], np.inf), np.where(found, self.upd_pred[i], -2)
+
+    # score 기록의 임시 라벨 (시간, 위험도), 아직 발견 전이면 (inf, inf)
+    def tentative_score(self, nodes, done):
+        i, found = self._lookup(nodes, done)
+        return np.where(found, self.upd_time[i], np.inf), np.where(found, self.upd_risk[i], np.inf)
+
+    # 확정 단계 수 done 시점의 경로 (root → node), node 는 그 시점에 발견된 노드
+    def path_at(self, node, done):
+        p = int(self.tentative(np.array([node]), done)[1][0])
+        return unwind(self.pred, p)[::-1] + [node]
+
+    # ✅ 엣지 가중치 변경 반영: 변경 엣지의 완화가 (이전 또는 새 가중치로) 큐에 넣는 경우만 기록이 달라짐
+    # → 그런 엣지 중 tail 이 가장 먼저 확정된 단계부터 기록 무효 (넣지 않던 엣지가 여전히 못 넣으면 그대로)
+    def invalidate(self, G, eids):
+        tails, heads = (G.dst[eids], G.src[eids]) if self.reverse else (G.src[eids], G.dst[eids])
+        step = self.position[tails]
+        live = step < self.valid
+        if not live.any():
+            return
+        tails, heads, step = tails[live], heads[live], step[live]
+        scale = 1 if self.reverse else self.weight_factor
+        if self.alpha is None:
+            new_dist = self.settle_dist[step] + G.weight[eids[live]] * scale
+        else:
+            new_dist = (self.alpha * (self.settle_time[step] + G.weight[eids[live]] * scale)
+                        + (1 - self.alpha) * (self.settle_risk[step] + G.risk[eids[live]]))
+        before = self.tentative(heads, step)[0]
+        key = heads * self._base + step + 1
+        i = np.minimum(np.searchsorted(self.upd_key, key), len(self.upd_key) - 1)
+        pushed = (self.upd_key[i] == key) & (self.upd_pred[i] == tails)
+        hit = pushed | (new_dist < before)
+        if hit.any():
+            self.valid = min(self.valid, int(step[hit].min()))
+
+
+# ✅ 정방향 기록 tf × 역방향 기록 tb 를 정/역 교대로 재생해 bidirectional_dijkstra_idx 와 같은 만남 노드/비용 계산
+# 단계 t: 짝수 = 정방향 t//2 번째 확정, 홀수 = 역방향 t//2 번째 확정 (중복 pop 은 차례를 넘기지 않음)
+# 정방향이 score 기록(tf.alpha)이면 만남 비용/종료 조건도 score 탐색과 같은 식
+# 반환: (비용, 만남 노드, 종료 시 정방향 확정 수, 역방향 확정 수), 만남 없으면 만남 노드 None
+def replay_meeting(tf, tb, max_time_diff):
+    inf = float('inf')
+    if tf.root == tb.root:
+        return 0, tf.root, 0, 0
+    nF, nB = len(tf), len(tb)
+    # 한쪽 확정이 바닥나거나, 확정 직후 큐가 비면 다음 단계에서 루프 종료
+    T = min(2 * nF - tf.exhausted, 2 * nB + 1 - tb.exhausted)
+    kF, kB = (T + 1) // 2, T // 2
+
+    node = np.empty(T, dtype=np.int64)
+    dF, dB = np.empty(T), np.empty(T)
+    node[0::2], node[1::2] = tf.settled[:kF], tb.settled[:kB]
+    dF[0::2], dB[1::2] = tf.settle_dist[:kF], tb.settle_dist[:kB]
+    # 확정 시점 반대쪽 임시 거리: 정방향 k 번째 확정 때 역방향은 k 개, 역방향 k 번째 확정 때 정방향은 k+1 개 확정
+    dB[0::2] = tb.tentative(node[0::2], np.arange(kF))[0]
+    alpha = tf.alpha
+    if alpha is None:
+        dF[1::2] = tf.tentative(node[1::2], np.arange(1, kB + 1))[0]
+        with np.errstate(invalid='ignore'):
+            cost = np.where(np.abs(dF - dB) < max_time_diff, np.maximum(dF, dB), inf)
+        b_scale = 1
+    else:
+        # dF 자리에 정방향 라벨의 시간, 위험도는 따로
+        rF = np.empty(T)
+        dF[0::2], rF[0::2] = tf.settle_time[:kF], tf.settle_risk[:kF]
+        dF[1::2], rF[1::2] = tf.tentative_score(node[1::2], np.arange(1, kB + 1))
+        with np.errstate(invalid='ignore'):
+            cost = np.where(np.abs(dF - dB) < max_time_diff, alpha * np.maximum(dF, dB) + (1 - alpha) * rF, inf)
+        b_scale = alpha
+    best = np.minimum.accumulate(cost)
+    t = np.arange(T)
+    f_min = tf.heap_min[t // 2]
+    b_min = np.concatenate([[0.0], tb.heap_min])[(t + 1) // 2]
+    stop = np.flatnonzero((best < inf) & (f_min + b_scale * b_min >= best))
+    end = int(stop[0]) + 1 if len(stop) else T
+
+    # 비용이 처음 최솟값이 된 단계의 노드 (탐색은 더 작을 때만 갱신)
+    k = int(np.argmin(cost[:end]))
+    done = ((end + 1) // 2, end // 2)
+    if not cost[k] < inf:
+        return inf, None, *done
+    return float(cost[k]), int(node[k]), *done
+
+
+# ✅ 소방서(정방향) × 사고 후보(역방향) 탐색 기록 + 쌍별 만남 노드 (양방향 탐색과 같은 결과)
+class DistanceTables:
+    def __init__(self, G, station_nodes, candidates, max_time_diff=60, weight_factor=0.692, alpha=None):
+        self.G = G
+        self.max_time_diff = max_time_diff
+        self.weight_factor = weight_factor
+        self.alpha = alpha
+        self.stations = {name: G.index(node) for name, node in station_nodes.items()}
+        self.station_row = {name: i for i, name in enumerate(self.stations)}
+        self.candidates = list(dict.fromkeys(G.index(c) for c in candidates))
+        self.candidate_row = {c: i for i, c in enumerate(self.candidates)}
+        self.build()
+
+    def build(self):
+        G, wf = self.G, self.weight_factor
+        self.fwd = [SearchTrace(G, s, False, wf, self.alpha) for s in self.stations.values()]
+        self.bwd = [SearchTrace(G, c, True) for c in self.candidates]
+        S, C = len(self.fwd), len(self.bwd)
+        self.meeting = np.full((S, C), -1, dtype=np.int64)
+        self.cost = np.full((S, C), np.inf)
+        # 쌍별로 재생에 쓴 확정 단계 수 (repair 시 이 범위 안이 바뀐 기록만 다시 계산)
+        self.used_f = np.zeros((S, C), dtype=np.int64)
+        self.used_b = np.zeros((S, C), dtype=np.int64)
+        self.version = G.version
+        self._routes = {}
+        self.compute_meetings(range(S), range(C))
+
+    # (소방서, 후보) 쌍별 만남 노드/비용 (rows × cols 부분만)
+    def compute_meetings(self, rows, cols):
+        for i in rows:
+            for j in cols:
+                self._routes.pop((i, j), None)
+                cost, m, self.used_f[i, j], self.used_b[i, j] = replay_meeting(self.fwd[i], self.bwd[j],
+                                                                               self.max_time_diff)
+                self.meeting[i, j] = -1 if m is None else m
+                self.cost[i, j] = cost
+
+    # ✅ 엣지 가중치 변경(G.update_durations) 후 복구: 변경 엣지가 쌍별 재생 범위 안에서 완화되는 기록만 다시 기록
+    # 다시 기록한 쪽과 짝인 쌍을 재생하고, 재생 범위가 늘어 반대쪽 무효 구간에 닿으면 그 기록도 다시 기록
+    def repair(self, eids):
+        G = self.G
+        eids = np.asarray(eids, dtype=np.int64)
+        for t in self.fwd + self.bwd:
+            t.invalidate(G, eids)
+
+        rerecorded = 0
+        while True:
+            valid_f = np.array([t.valid for t in self.fwd])[:, None]
+            valid_b = np.array([t.valid for t in self.bwd])[None, :]
+            rows = np.flatnonzero((self.used_f > valid_f).any(axis=1))
+            cols = np.flatnonzero((self.used_b > valid_b).any(axis=0))
+            if len(rows) == 0 and len(cols) == 0:
+                break
+            for i in rows:
+                self.fwd[i].record(G)
+            for j in cols:
+                self.bwd[j].record(G)
+            rerecorded += len(rows) + len(cols)
+            self.compute_meetings(rows, range(len(self.bwd)))
+            self.compute_meetings(range(len(self.fwd)), cols)
+        self.version = G.version
+        return rerecorded
+
+    # 기존 bidirectional_dijkstra_idx 와 같은 형식 (path, cost, meeting, f_path, b_path)
+    # 쌍별 경로는 처음 조회할 때 풀어서 보관 (반환값은 공유되므로 호출 측에서 수정하지 말 것)
+    def route(self, station, goal):
+        if self.version != self.G.version:
+            raise ValueError(f"DistanceTables(version {self.version}) 가 그래프(version {self.G.version}) 와 다름 "
+                             f"→ 가중치 변경 후 repair(eids) 또는 다시 생성 필요")
+        key = (self.station_row[station], self.candidate_row[goal])
+        result = self._routes.get(key)
+        if result is None:
+            i, j = key
+            m = int(self.meeting[i, j])
+            if m < 0:
+                result = None, float('inf'), None, [], []
+            else:
+                f_path = self.fwd[i].path_at(m, self.used_f[i, j])
+                b_path = self.bwd[j].path_at(m, self.used_b[i, j])
+                result = f_path + b_path[1:], float(self.cost[i, j]), m, f_path, b_path
+            self._routes[key] = result
+        return result
+
+
+# objective == "score" 이면 탐색 비용의 시간 계수 alpha, 아니면 None (시간만 최소화)
+def score_alpha(config):
+    return config.get("alpha", 0.7) if config.get("objective", "time") == "score" else None
+
+
+# 경로 탐색 방식 이름 ("table" = 사전 기록 재생, "bidirectional" = 질의마다 탐색, 결과는 같음)
+def routing_rule(config):
+    return "table" if config.get("routing") == "table" else "bidirectional"
+
+
+# 기록 재생은 기본(휴리스틱 없는) 탐색 순서를 재현 → 목표지향 탐색(heuristic)과 함께 쓰면 결과가 섞이므로 거부
+def build_distance_tables(G, config):
+    if config.get("heuristic"):
+        raise ValueError(f"heuristic={config['heuristic']!r} 는 routing=\"bidirectional\" 에서만 사용 가능 "
+                         f"(routing=\"table\" 은 기본 양방향 탐색을 재생)")
+    return DistanceTables(G, config["station_nodes"], config["accident_candidates"],
+                          config["max_time_diff"], config["weight_factor"], score_alpha(config))
@@ -0,0 +1,248 @@
+import argparse
+import heapq
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from graph import CSRGraph
+from tables import dijkstra_tree, unwind
+
+## 실행 방법 (그래프 → 공간 타일 + 경계 오버레이 컴파일)
+#python tiles.py --output ../data/tiles --tile_m 1000
+
+FORMAT = "isecd-tiles"
+FORMAT_VERSION = 1
+M_PER_DEG_LAT = 111_320
+
+
+def _tile_keys(x, y, origin, step):
+    ix = np.floor((x - origin[0]) / step[0]).astype(np.int64)
+    iy = np.floor((y - origin[1]) / step[1]).astype(np.int64)
+    return ix, iy
+
+
+def tile_name(ix, iy):
+    return f"{ix}_{iy}"
+
+
+def _save_graph(path, ids, x, y, src, dst, duration, weight, risk, **extra):
+    np.savez(path, node_ids=np.asarray(ids, dtype=str), x=x, y=y, src=src, dst=dst,
+             duration=duration, weight=weight, risk=risk, **extra)
+
+
+def _load_graph(path):
+    a = np.load(path)
+    G = CSRGraph(a["node_ids"], a["x"], a["y"], a["src"], a["dst"], a["duration"])
+    G.set_weights(a["weight"])
+    G.risk = a["risk"]
+    return G, a
+
+
+# ✅ 타일 컴파일: 타일별 내부 엣지 + 경계 노드 오버레이 (절단 엣지 + 타일 내부 경계 간 최단거리 지름길)
+def build_tiles(G, out_dir, tile_m=1000):
+    lat0 = float(np.mean(G.y))
+    step = (tile_m / (M_PER_DEG_LAT * np.cos(np.radians(lat0))), tile_m / M_PER_DEG_LAT)
+    origin = (float(G.x.min()), float(G.y.min()))
+    ix, iy = _tile_keys(G.x, G.y, origin, step)
+    names = np.array([tile_name(a, b) for a, b in zip(ix.tolist(), iy.tolist())])
+
+    cut = names[G.src] != names[G.dst]
+    boundary = np.zeros(G.num_nodes, dtype=bool)
+    boundary[G.src[cut]] = True
+    boundary[G.dst[cut]] = True
+
+    tmp = f"{out_dir}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    # 경계 오버레이 노드 = 전체 경계 노드 (전역 인덱스 → 오버레이 인덱스)
+    ov_nodes = np.flatnonzero(boundary)
+    ov_index = np.full(G.num_nodes, -1, dtype=np.int64)
+    ov_index[ov_nodes] = np.arange(len(ov_nodes))
+    ov_src, ov_dst, ov_w, ov_tile = [G.src[cut]], [G.dst[cut]], [G.weight[cut]], [np.full(cut.sum(), "", dtype=object)]
+
+    tiles = {}
+    for name in np.unique(names):
+        members = np.flatnonzero(names == name)
+        local = np.full(G.num_nodes, -1, dtype=np.int64)
+        local[members] = np.arange(len(members))
+        inner = np.flatnonzero((names[G.src] == name) & (names[G.dst] == name))
+        src, dst = local[G.src[inner]], local[G.dst[inner]]
+        tile_boundary = np.flatnonzero(boundary[members])
+
+        _save_graph(os.path.join(tmp, f"tile_{name}.npz"), G.node_ids[members], G.x[members], G.y[members],
+                    src, dst, G.duration[inner], G.weight[inner], G.risk[inner], boundary=tile_boundary)
+        tiles[name] = {"nodes": int(len(members)), "edges": int(len(inner)), "boundary": int(len(tile_boundary))}
+
+        # 타일 내부 경계 노드 쌍 최단거리 → 지름길 엣지
+        if len(tile_boundary) > 1:
+            T = CSRGraph(G.node_ids[members], G.x[members], G.y[members], src, dst, G.duration[inner])
+            T.set_weights(G.weight[inner])
+            for b in tile_boundary:
+                dist, _ = dijkstra_tree(T, int(b))
+                reach = tile_boundary[np.isfinite(dist[tile_boundary]) & (tile_boundary != b)]
+                ov_src.append(np.full(len(reach), members[b]))
+                ov_dst.append(members[reach])
+                ov_w.append(dist[reach])
+                ov_tile.append(np.full(len(reach), name, dtype=object))
+
+    ov_src, ov_dst = ov_index[np.concatenate(ov_src)], ov_index[np.concatenate(ov_dst)]
+    ov_w, ov_tile = np.concatenate(ov_w), np.concatenate(ov_tile).astype(str)
+    # 같은 (u, v) 에 절단 엣지와 지름길이 겹치면 더 짧은 쪽만 유지 (경로 복원 시 엣지 종류가 하나로 결정되도록)
+    order = np.lexsort((ov_w, ov_dst, ov_src))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (np.diff(ov_src[order]) != 0) | (np.diff(ov_dst[order]) != 0)
+    keep = order[first]
+    ov_src, ov_dst, ov_w, ov_tile = ov_src[keep], ov_dst[keep], ov_w[keep], ov_tile[keep]
+    _save_graph(os.path.join(tmp, "overlay.npz"), G.node_ids[ov_nodes], G.x[ov_nodes], G.y[ov_nodes],
+                ov_src, ov_dst, np.zeros(len(ov_w)), ov_w, np.zeros(len(ov_w)), tile=ov_tile)
+
+    # 노드 id → 타일 조회용 정렬 인덱스 (전체 dict 없이 이진 탐색)
+    order = np.argsort(G.node_ids.astype(str))
+    np.savez(os.path.join(tmp, "node_tiles.npz"), node_ids=G.node_ids.astype(str)[order], tiles=names[order])
+
+    header = {
+        "format": FORMAT, "version": FORMAT_VERSION, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "tile_m": tile_m, "origin": origin, "step": step,
+        "num_nodes": G.num_nodes, "num_edges": G.num_edges,
+        "overlay_nodes": int(len(ov_nodes)), "overlay_edges": int(len(ov_w)), "tiles": tiles,
+    }
+    with open(os.path.join(tmp, "header.json"), "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp, out_dir)
+    return header
+
+
+# 다중 출발 다익스트라 (seeds: {노드: 초기거리}), 목표 집합이 모두 확정되면 중단
+def _multi_source(G, seeds, reverse=False, targets=None):
+    fptr, fnbr, fw, rptr, rnbr, rw = G.adjacency()
+    ptr, nbr, w = (rptr, rnbr, rw) if reverse else (fptr, fnbr, fw)
+    inf = float('inf')
+    dist, pred = dict(seeds), {s: -1 for s in seeds}
+    pq = [(d, s) for s, d in seeds.items()]
+    heapq.heapify(pq)
+    done = set()
+    remaining = set(targets) if targets is not None else None
+
+    while pq:
+        du, u = heapq.heappop(pq)
+        if u in done:
+            continue
+        done.add(u)
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+        for k in range(ptr[u], ptr[u + 1]):
+            v = nbr[k]
+            nd = du + w[k]
+            if nd < dist.get(v, inf):
+                dist[v], pred[v] = nd, u
+                heapq.heappush(pq, (nd, v))
+    return dist, pred
+
+
+# ✅ 타일 라우터: 질의가 닿는 타일만 로드 (LRU), 타일 간 질의는 경계 오버레이 위에서 탐색
+class TiledRouter:
+    def __init__(self, path, max_tiles=16):
+        with open(os.path.join(path, "header.json"), encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("format") != FORMAT or self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 타일 형식: {path}")
+        self.path = path
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        self.tile_loads = 0
+
+        index = np.load(os.path.join(path, "node_tiles.npz"))
+        self._ids, self._id_tiles = index["node_ids"], index["tiles"]
+        self.overlay, ov = _load_graph(os.path.join(path, "overlay.npz"))
+        self._ov_tile = ov["tile"]
+
+    def node_tile(self, node):
+        pos = int(np.searchsorted(self._ids, node))
+        if pos >= len(self._ids) or self._ids[pos] != node:
+            raise KeyError(node)
+        return str(self._id_tiles[pos])
+
+    def tile(self, name):
+        entry = self._tiles.get(name)
+        if entry is None:
+            T, a = _load_graph(os.path.join(self.path, f"tile_{name}.npz"))
+            entry = self._tiles[name] = (T, a["boundary"])
+            self.tile_loads += 1
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        self._tiles.move_to_end(name)
+        return entry
+
+    def _local_path(self, name, a, b):
+        T, _ = self.tile(name)
+        dist, pred = dijkstra_tree(T, T.index(a))
+        return T.ids(unwind(pred, T.index(b))[::-1])
+
+    # ✅ 최단경로 (path: OSM id 리스트, cost: weight_factor 반영 비용)
+    def shortest_path(self, source, target, weight_factor=1.0, unpack=True):
+        if source == target:
+            return [source], 0.0
+        ts, tt = self.node_tile(source), self.node_tile(target)
+        S, s_boundary = self.tile(ts)
+        T, t_boundary = self.tile(tt)
+        s, t = S.index(source), T.index(target)
+        distS, predS = dijkstra_tree(S, s)
+        distT, predT = dijkstra_tree(T, t, reverse=True)
+
+        best, best_route = float('inf'), None
+        if ts == tt and np.isfinite(distS[t]):
+            best, best_route = float(distS[t]), ("local", None)
+
+        ov = self.overlay
+        seeds = {ov.index(S.node_id(b)): float(distS[b]) for b in s_boundary if np.isfinite(distS[b])}
+        exits = {ov.index(T.node_id(b)): float(distT[b]) for b in t_boundary if np.isfinite(distT[b])}
+        if seeds and exits:
+            dist, pred = _multi_source(ov, seeds, targets=exits)
+            for e, d_exit in exits.items():
+                total = dist.get(e, float('inf')) + d_exit
+                if total < best:
+                    best, best_route = total, ("overlay", (e, pred))
+
+        if best_route is None:
+            return None, float('inf')
+        if best_route[0] == "local":
+            return S.ids(unwind(predS, t)[::-1]), best * weight_factor
+        if not unpack:
+            e, pred = best_route[1]
+            return [source] + ov.ids(unwind(pred, e)[::-1]) + [target], best * weight_factor
+
+        e, pred = best_route[1]
+        ov_path = unwind(pred, e)[::-1]
+        head = S.ids(unwind(predS, S.index(ov.node_id(ov_path[0])))[::-1])
+        tail = T.ids(unwind(predT, T.index(ov.node_id(ov_path[-1]))))
+        path = head
+        for a, b in zip(ov_path[:-1], ov_path[1:]):
+            eid = int(ov.edge_ids([a], [b])[0])
+            name = str(self._ov_tile[eid])
+            a_id, b_id = ov.node_id(a), ov.node_id(b)
+            path += self._local_path(name, a_id, b_id)[1:] if name else [b_id]
+        return path + tail[1:], best * weight_factor
+
+
+if __name__ == "__main__":
+    from algorithm import build_graph
+    from config.config import config_algorithm
+
+    config = config_algorithm()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', type=str, default=config["tiles_path"])
+    parser.add_argument('--tile_m', type=float, default=1000)
+    args = parser.parse_args()
+
+    G, _, _ = build_graph(config)
+    header = build_tiles(G, args.output, args.tile_m)
+    print(f"✅ 타일 저장 완료: {args.output} / 타일 {len(header['tiles'])}개, "
+          f"오버레이 노드 {header['overlay_nodes']}개, 엣지 {header['overlay_edges']}개")
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from graph import compute_weight, graph_from_edges, read_edge_csv
+
+DAY_MINUTES = 24 * 60
+
+
+# ✅ 출발 시각 → 하루 중 분 (202505280800 / "0800" / 480 모두 허용)
+def minute_of_day(departure_time):
+    if isinstance(departure_time, (int, np.integer)) and departure_time < DAY_MINUTES:
+        return int(departure_time)
+    hhmm = str(departure_time)[-4:]
+    return int(hhmm[:2]) * 60 + int(hhmm[2:])
+
+
+def format_slot(minute):
+    return f"{minute // 60:02d}{minute % 60:02d}"
+
+
+# ✅ 시간대별 소요시간 스냅샷 그래프 (위상 1회 공유 + 슬롯당 duration 열 1개)
+class TimeDependentGraph:
+    def __init__(self, G, slot_minutes, durations):
+        slot_minutes = np.asarray(slot_minutes, dtype=np.int32)
+        durations = np.asarray(durations, dtype=np.float32)
+        # 같은 분의 슬롯이 둘 이상이면 보간 구간 길이가 0 이 됨
+        minutes, counts = np.unique(slot_minutes % DAY_MINUTES, return_counts=True)
+        if np.any(counts > 1):
+            dup = ", ".join(format_slot(int(m)) for m in minutes[counts > 1])
+            raise ValueError(f"중복된 출발 시각 슬롯: {dup}")
+        order = np.argsort(slot_minutes, kind='stable')
+        # 이미 정렬된 경우(스냅샷 mmap 등) 복사하지 않음
+        if np.any(order != np.arange(len(order))):
+            slot_minutes, durations = slot_minutes[order], durations[:, order]
+        self.G = G
+        self.slot_minutes = slot_minutes
+        self.durations = durations
+
+    @property
+    def num_slots(self):
+        return len(self.slot_minutes)
+
+    # 24시간 순환 기준 선형 보간 (슬롯 사이 시각은 양쪽 스냅샷 가중 평균)
+    def durations_at(self, departure_time):
+        t = minute_of_day(departure_time)
+        slots = self.slot_minutes
+        if len(slots) == 1:
+            return self.durations[:, 0].astype(np.float64)
+
+        hi = int(np.searchsorted(slots, t, side='left'))
+        if hi < len(slots) and slots[hi] == t:
+            return self.durations[:, hi].astype(np.float64)
+        lo = hi - 1
+        hi = hi % len(slots)
+        t_lo, t_hi = slots[lo] % DAY_MINUTES, slots[hi]
+        span = (t_hi - t_lo) % DAY_MINUTES
+        frac = ((t - t_lo) % DAY_MINUTES) / span
+        d_lo = self.durations[:, lo].astype(np.float64)
+        d_hi = self.durations[:, hi].astype(np.float64)
+        return d_lo + (d_hi - d_lo) * frac
+
+    def weights_at(self, departure_time):
+        return compute_weight(self.durations_at(departure_time))
+
+    # 출발 시각 기준 그래프 뷰 (CSR 위상 공유, 가중치 배열만 새로 생성)
+    def at(self, departure_time):
+        duration = self.durations_at(departure_time)
+        return self.G.with_weights(compute_weight(duration), duration)
+
+
+def slot_range(step_minutes=15, start=0, end=DAY_MINUTES):
+    return list(range(start, end, step_minutes))
+
+
+# ✅ 스냅샷 CSV 여러 개 → TimeDependentGraph ((u, v) 기준 정렬, 누락 엣지는 다른 슬롯 평균)
+# 같은 출발 시각의 파일이 여럿이면 하나의 슬롯으로 합침 (엣지별로 뒤 파일 값 우선)
+def build_time_dependent_graph(csv_paths):
+    frames = [read_edge_csv(path) for path in csv_paths]
+    base = pd.concat(frames).drop_duplicates(['u', 'v'], keep='last')
+    G = graph_from_edges(base)
+    keys = pd.MultiIndex.from_arrays([G.node_ids[G.src], G.node_ids[G.dst]])
+
+    columns = {}
+    for df in frames:
+        df = df.drop_duplicates(['u', 'v'], keep='last')
+        series = pd.Series(df['duration'].to_numpy(), index=pd.MultiIndex.from_arrays([df['u'], df['v']]))
+        column = series.reindex(keys).to_numpy(dtype=np.float64)
+        minute = minute_of_day(df['departure_time'].iloc[0])
+        if minute in columns:
+            print(f"⚠️ 출발 시각 {format_slot(minute)} 스냅샷 중복 → 엣지별로 뒤 파일 값 사용")
+            column = np.where(np.isnan(column), columns[minute], column)
+        columns[minute] = column
+
+    minutes = list(columns)
+    durations = np.column_stack([columns[m] for m in minutes])
+    row_mean = np.nanmean(durations, axis=1, keepdims=True)
+    durations = np.where(np.isnan(durations), row_mean, durations)
+    return TimeDependentGraph(G, minutes, durations)
+
+
+# ✅ 여러 출발 시각에 대해 고정 횟수(num_trials) 시행을 한 번에 실행
+# 슬롯 간 공유: 시행별 사고 지점 추출(1회), 위험도 매핑(1회), CSR 위상/탐색 리스트의 ptr·nbr/엣지 키
+# 슬롯마다 새로 하는 것: 가중치 뷰 + 탐색 (가중치가 바뀌면 탐색 결과는 재사용 불가)
+# routing == "table" 이면 슬롯당 탐색 기록은 전체 후보가 아닌 실제로 추출된 사고 지점에 대해서만 생성
+def simulate_slots(config, tdg, risk_map, departure_times=None):
+    from algorithm import run_trial, trial_rng
+    from route_cache import route_cache
+    from tables import build_distance_tables
+
+    if departure_times is None:
+        departure_times = tdg.slot_minutes.tolist()
+    G = tdg.G
+    if risk_map is not None:
+        G.set_risk(risk_map)
+    node_pos = G.node_pos()
+    route_cache.resize(config.get("route_cache_size", 0))
+
+    trials = range(1, config["num_trials"] + 1)
+    goals = [trial_rng(config["seed"], trial).choice(config["accident_candidates"]) for trial in trials]
+    table_config = {**config, "accident_candidates": list(dict.fromkeys(goals))}
+
+    frames = []
+    for t in departure_times:
+        slot = format_slot(minute_of_day(t))
+        view = tdg.at(t)
+        tables = build_distance_tables(view, table_config) if config.get("routing") == "table" else None
+        rows = [run_trial(config, view, node_pos, None, trial, tables, goal)
+                for trial, goal in zip(trials, goals)]
+        df_slot = pd.DataFrame([row for row in rows if row])
+        if len(df_slot):
+            print(f"[{slot}] {len(df_slot)}회, 평균 시간(분): {df_slot['total_time_min'].mean():.2f}, "
+                  f"평균 score: {df_slot['total_score'].mean():.2f}")
+        df_slot.insert(0, 'departure_slot', slot)
+        frames.append(df_slot)
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import os
+    from algorithm import load_risk_map
+    from config.config import config_algorithm
+
+    config = config_algorithm()
+    tdg = build_time_dependent_graph(config["snapshot_paths"])
+    risk_map = load_risk_map(config["risk_csv_path"])
+
+    step = config.get("slot_step_minutes")
+    times = slot_range(step) if step else None
+    df_all = simulate_slots(config, tdg, risk_map, times)
+
+    os.makedirs(os.path.dirname(config["slots_output_path"]), exist_ok=True)
+    df_all.to_csv(config["slots_output_path"], index=False, encoding="utf-8-sig")
+    print(f"\n✅ 결과 저장 완료: {config['slots_output_path']}")
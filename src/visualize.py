@@ -1,21 +1,188 @@
+import argparse
+import json
+import os
+
+import numpy as np
 import pandas as pd
-import folium
 
-# 1. CSV 불러오기
-edges = pd.read_csv("data/edges.csv")
+from graph import read_edge_csv
+
+## 실행 방법
+## 도로망 (위험도 색상)
+#python visualize.py --color_by risk
+## 출발 시각 슬롯별 소요시간 색상 + 시뮬레이션 경로 (앞 20개 시행)
+#python visualize.py --color_by duration --durations ../data/duration_table --slot 0800 --results ../data/50times_gowork_bestonly.csv --max_trials 20
+## 확대 수준 12 기준 단순화 (도시 전체)
+#python visualize.py --zoom 12 --output seoul_map.html
+
+PALETTE = ['#ffffb2', '#fed976', '#feb24c', '#fd8d3c', '#fc4e2a', '#e31a1c', '#b10026']
+ROUTE_COLORS = ['#1f78b4', '#33a02c', '#6a3d9a', '#ff7f00', '#a6cee3', '#b2df8a', '#cab2d6', '#fdbf6f']
+EDGE_COLOR = '#3366cc'
+
+
+def node_positions(edges):
+    u = edges[['u', 'u_x', 'u_y']].set_axis(['node', 'x', 'y'], axis=1)
+    v = edges[['v', 'v_x', 'v_y']].set_axis(['node', 'x', 'y'], axis=1)
+    return pd.concat([u, v]).drop_duplicates('node').set_index('node')
+
+
+def segment_coords(edges):
+    return edges[['u_x', 'u_y', 'v_x', 'v_y']].to_numpy(dtype=np.float64).reshape(-1, 2, 2)
+
+
+# ✅ 확대 수준별 단순화: 화면 1픽셀(256px 타일 기준) 격자에 좌표를 맞추고, 길이 0 / 중복 선분 제거 (값은 평균)
+def simplify_segments(segs, values, zoom):
+    grid = 360 / (256 * 2 ** zoom)
+    snapped = np.round(segs / grid) * grid
+    keep = np.any(snapped[:, 0] != snapped[:, 1], axis=1)
+    snapped, values = snapped[keep], values[keep]
+    frame = pd.DataFrame(snapped.reshape(-1, 4)).assign(value=values)
+    merged = frame.groupby([0, 1, 2, 3], sort=False)['value'].mean().reset_index()
+    return merged[[0, 1, 2, 3]].to_numpy().reshape(-1, 2, 2), merged['value'].to_numpy()
+
+
+# 값 → 분위 구간 번호 (NaN 은 -1)
+def classify(values, num_classes=len(PALETTE)):
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        return np.full(len(values), -1), []
+    edges = np.unique(np.quantile(finite, np.linspace(0, 1, num_classes + 1)))
+    classes = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, max(len(edges) - 2, 0))
+    return np.where(np.isfinite(values), classes, -1), edges
+
+
+def _multiline(segs):
+    return {"type": "MultiLineString", "coordinates": np.round(segs, 7).tolist()}
+
+
+# ✅ 도로망 → 색상 구간별 MultiLineString 피처 (엣지 수와 무관하게 피처 수 ≤ 구간 수 + 1)
+def edges_geojson(edges, values=None, zoom=None, label="value"):
+    segs = segment_coords(edges)
+    values = np.full(len(segs), np.nan) if values is None else np.asarray(values, dtype=np.float64)
+    if zoom is not None:
+        segs, values = simplify_segments(segs, values, zoom)
+
+    classes, bounds = classify(values)
+    features = []
+    for c in np.unique(classes):
+        props = {"color": EDGE_COLOR if c < 0 else PALETTE[c], "edges": int((classes == c).sum()),
+                 label: "-" if c < 0 else f"{bounds[c]:.1f} – {bounds[min(c + 1, len(bounds) - 1)]:.1f}"}
+        features.append({"type": "Feature", "geometry": _multiline(segs[classes == c]), "properties": props})
+    return {"type": "FeatureCollection", "features": features}
+
+
+# ✅ 소요시간 값: 엣지 CSV(duration 열) 또는 batch_fetch 테이블 디렉터리의 특정 슬롯, (u, v) 로 결합
+def load_slot_durations(edges, path, slot=None):
+    if os.path.isdir(path):
+        from batch_fetch import read_duration_table
+        from timedep import minute_of_day
+
+        _, table_edges, durations, slot_minutes = read_duration_table(path)
+        col = 0 if slot is None else int(np.argmin(np.abs(slot_minutes - minute_of_day(slot))))
+        source = table_edges.assign(duration=np.asarray(durations[:, col]))
+    else:
+        source = read_edge_csv(path)
+    series = source.drop_duplicates(['u', 'v'], keep='last').set_index(['u', 'v'])['duration']
+    return series.reindex(pd.MultiIndex.from_arrays([edges['u'], edges['v']])).to_numpy(dtype=np.float64)
+
+
+# ✅ 시뮬레이션 경로 → (소방서, 방향) 별 MultiLineString (경로 문자열을 한 번에 분해해 좌표로 변환)
+def routes_geojson(results, positions, trials=None):
+    if trials is not None:
+        results = results[results['trial'].isin(trials)]
+    stations = {name: ROUTE_COLORS[i % len(ROUTE_COLORS)] for i, name in enumerate(sorted(results['station'].unique()))}
+    features = []
+    for column, dash in (('forward_path', None), ('backward_path', '6 6')):
+        nodes = results[column].fillna('').astype(str).str.split(' → ').explode()
+        xy = positions.reindex(nodes.to_numpy())[['x', 'y']].to_numpy()
+        route = nodes.index.to_numpy()
+        # 같은 경로 안의 연속 노드 쌍만 선분으로 사용 (좌표 없는 노드 포함 선분은 제외)
+        same = route[1:] == route[:-1]
+        segs = np.stack([xy[:-1], xy[1:]], axis=1)[same]
+        seg_route = route[1:][same]
+        valid = np.isfinite(segs).all(axis=(1, 2))
+        segs, seg_route = segs[valid], seg_route[valid]
+        seg_station = results['station'].reindex(seg_route).to_numpy()
+        for name, color in stations.items():
+            mask = seg_station == name
+            if not mask.any():
+                continue
+            props = {"station": name, "direction": column, "color": color,
+                     "routes": int((results['station'] == name).sum())}
+            if dash:
+                props["dashArray"] = dash
+            features.append({"type": "Feature", "geometry": _multiline(segs[mask]), "properties": props})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _style(feature, weight, opacity):
+    props = feature["properties"]
+    return {"color": props["color"], "weight": weight, "opacity": opacity, "dashArray": props.get("dashArray")}
+
+
+# ✅ folium 지도 (도로망/경로 각각 GeoJson 레이어 1개)
+def render(edges_fc, routes_fc=None, center=None, zoom_start=14, label=None):
+    import folium
+
+    m = folium.Map(location=center, zoom_start=zoom_start, prefer_canvas=True)
+    tooltip_fields = ["edges"] + ([label] if label else [])
+    folium.GeoJson(edges_fc, name="도로망", style_function=lambda f: _style(f, 2, 0.6),
+                   tooltip=folium.GeoJsonTooltip(fields=tooltip_fields)).add_to(m)
+    if routes_fc and routes_fc["features"]:
+        folium.GeoJson(routes_fc, name="출동 경로", style_function=lambda f: _style(f, 4, 0.8),
+                       tooltip=folium.GeoJsonTooltip(fields=["station", "direction", "routes"])).add_to(m)
+    folium.LayerControl().add_to(m)
+    return m
+
+
+def main():
+    from config.config import config_algorithm
+
+    config = config_algorithm()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--edges', type=str, default=config["risk_csv_path"], help='도로망 엣지 CSV')
+    parser.add_argument('--color_by', choices=['none', 'risk', 'duration'], default='none')
+    parser.add_argument('--durations', type=str, default=config["csv_path"],
+                        help='소요시간 출처: 엣지 CSV 또는 batch_fetch 테이블 디렉터리')
+    parser.add_argument('--slot', type=str, help='테이블 사용 시 출발 시각 슬롯 (예: 0800)')
+    parser.add_argument('--results', type=str, help='simulate 결과 CSV (forward_path / backward_path)')
+    parser.add_argument('--trials', type=int, nargs='+', help='표시할 시행 번호')
+    parser.add_argument('--max_trials', type=int, help='앞에서부터 표시할 시행 수')
+    parser.add_argument('--zoom', type=int, help='이 확대 수준 기준으로 단순화')
+    parser.add_argument('--output', type=str, default="edges_map.html")
+    parser.add_argument('--geojson', type=str, help='병합된 GeoJSON 도 함께 저장할 경로 접두어')
+    args = parser.parse_args()
+
+    edges = read_edge_csv(args.edges)
+    values, label = None, None
+    if args.color_by == 'risk':
+        values, label = edges['risk'].to_numpy(dtype=np.float64), 'risk'
+    elif args.color_by == 'duration':
+        values, label = load_slot_durations(edges, args.durations, args.slot), 'duration'
+    edges_fc = edges_geojson(edges, values, args.zoom, label or "value")
+
+    routes_fc = None
+    if args.results:
+        results = pd.read_csv(args.results, dtype={'u': str, 'v': str})
+        trials = args.trials
+        if trials is None and args.max_trials:
+            trials = sorted(results['trial'].unique())[:args.max_trials]
+        routes_fc = routes_geojson(results, node_positions(edges), trials)
 
-# 2. 지도 중심 좌표 계산
-center_lat = (edges['u_y'].mean() + edges['v_y'].mean()) / 2
-center_lon = (edges['u_x'].mean() + edges['v_x'].mean()) / 2
+    center = [float(np.mean([edges['u_y'].mean(), edges['v_y'].mean()])),
+              float(np.mean([edges['u_x'].mean(), edges['v_x'].mean()]))]
+    m = render(edges_fc, routes_fc, center, args.zoom or 14, label)
+    m.save(args.output)
+    route_count = len(routes_fc["features"]) if routes_fc else 0
+    print(f"✅ 지도 저장 완료 → {args.output} (도로망 피처 {len(edges_fc['features'])}개, 경로 피처 {route_count}개)")
 
-# 3. folium 지도 생성
-m = folium.Map(location=[center_lat, center_lon], zoom_start=14)
+    if args.geojson:
+        for name, fc in (("edges", edges_fc), ("routes", routes_fc)):
+            if fc:
+                with open(f"{args.geojson}_{name}.geojson", "w", encoding="utf-8") as f:
+                    json.dump(fc, f, ensure_ascii=False)
 
-# 4. 엣지를 folium PolyLine으로 시각화
-for _, row in edges.iterrows():
-    line = [(row['u_y'], row['u_x']), (row['v_y'], row['v_x'])]  # (위도, 경도)
-    folium.PolyLine(locations=line, color="blue", weight=2, opacity=0.6).add_to(m)
 
-# 5. HTML로 저장 또는 Jupyter에서 바로 출력
-m.save("edges_map.html")
-m  # Jupyter에서는 이 줄로 출력됨
+if __name__ == "__main__":
+    main()